@@ -0,0 +1,658 @@
+# scrapers/async_scrapers.py
+# Async (aiohttp) variants of the supplier login/search/detail flows
+#
+# Each flow mirrors its blocking scraper and reuses that scraper's parsing
+# helpers, so both engines return exactly the same result shapes. Bodies are
+# decoded by the same ResponseDecoder, and IGC and PWG logins go through the
+# same CookieStore, so a login made by either engine in any worker is reused.
+#
+# The SessionBroker and HedgedRequests are not used: both are built on worker
+# threads. Here each supplier has one long-lived session whose login is guarded
+# by an asyncio lock, and Pilkington's search URLs are tried one after another.
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from collections import namedtuple
+from email.utils import formatdate
+from http.cookiejar import http2time
+from http.cookies import Morsel
+
+import aiohttp
+from dotenv import load_dotenv
+from yarl import URL
+
+from Scrapers import igc_scraper, mygrant_scraper, pilkington_scraper, pwg_scraper
+from Scrapers.cookie_store import cookie_store
+from Scrapers.response import decode_body
+from Scrapers.strategy_stats import strategy_stats
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# How long a logged-in session is trusted before logging in again
+LOGIN_TTL = {
+    "Import Glass Corp": 1800,
+    "Pilkington": 1800,
+    "PWG": 14400,
+}
+
+# Errors that mean "this request failed", as opposed to a bug in the flow
+REQUEST_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+AsyncResponse = namedtuple('AsyncResponse', ['status_code', 'url', 'text'])
+
+
+class AsyncClient:
+    """HTTP state shared by the async flows on one event loop"""
+
+    def __init__(self, connector, timeout=15):
+        self.connector = connector
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._sessions = {}
+        self._login_times = {}
+        self._login_locks = {}
+
+    def session(self, supplier, headers=None):
+        """Long-lived cookie session for a supplier (logins are reused across searches)"""
+        session = self._sessions.get(supplier)
+        if session is None or session.closed:
+            session = self.new_session(headers)
+            self._sessions[supplier] = session
+        return session
+
+    def new_session(self, headers=None):
+        """Fresh cookie session on the shared connection pool"""
+        return aiohttp.ClientSession(
+            connector=self.connector,
+            connector_owner=False,
+            headers=headers,
+            timeout=self.timeout
+        )
+
+    def login_lock(self, supplier):
+        """Lock so concurrent searches don't all log in at once"""
+        if supplier not in self._login_locks:
+            self._login_locks[supplier] = asyncio.Lock()
+        return self._login_locks[supplier]
+
+    def is_logged_in(self, supplier):
+        login_time = self._login_times.get(supplier)
+        return login_time is not None and time.time() - login_time < LOGIN_TTL.get(supplier, 1800)
+
+    def mark_logged_in(self, supplier):
+        self._login_times[supplier] = time.time()
+
+    def mark_logged_out(self, supplier):
+        self._login_times.pop(supplier, None)
+
+    async def close(self):
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions = {}
+        await self.connector.close()
+
+
+async def fetch(supplier, session, method, url, **kwargs):
+    """Perform a request and read the whole body, decoded like the blocking scrapers' responses"""
+    async with session.request(method, url, **kwargs) as response:
+        content = await response.read()
+        return AsyncResponse(response.status, str(response.url), decode_body(supplier, response.headers, content))
+
+
+async def in_thread(func, *args):
+    """Run a blocking helper (cookie file I/O) off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
+
+
+async def parse(func, *args):
+    """Run a (CPU-bound) parsing helper off the event loop"""
+    return await in_thread(func, *args)
+
+
+def jar_to_list(jar):
+    """Serialize an aiohttp cookie jar like cookie_store.cookies_to_list does a requests jar"""
+    items = []
+    for morsel in jar:
+        expires = None
+        if morsel["max-age"]:
+            expires = int(time.time()) + int(morsel["max-age"])
+        elif morsel["expires"]:
+            expires = http2time(morsel["expires"])
+        items.append({
+            "name": morsel.key,
+            "value": morsel.value,
+            "domain": morsel["domain"],
+            "path": morsel["path"] or "/",
+            "expires": expires,
+            "secure": bool(morsel["secure"]),
+            "rest": {"HttpOnly": None} if morsel["httponly"] else {},
+        })
+    return items
+
+
+def add_to_jar(jar, items):
+    """Load cookies serialized by either engine into an aiohttp cookie jar"""
+    for item in items:
+        if item.get("expires") is not None and item["expires"] < time.time():
+            continue
+        domain = (item.get("domain") or "").lstrip(".")
+        if not domain:
+            continue
+
+        morsel = Morsel()
+        morsel.set(item["name"], item["value"], item["value"])
+        morsel["domain"] = domain
+        morsel["path"] = item.get("path") or "/"
+        if item.get("secure"):
+            morsel["secure"] = True
+        if item.get("expires") is not None:
+            morsel["expires"] = formatdate(item["expires"], usegmt=True)
+        jar.update_cookies({item["name"]: morsel}, response_url=URL(f"https://{domain}/"))
+
+
+async def restore_login(session, name, max_age):
+    """
+    Adopt cookies a login by either engine stored, if they proved to work recently
+
+    Returns:
+        True if the session now carries them - there is no validation request,
+        a search that bounces to login invalidates them
+    """
+    entry = await in_thread(cookie_store.load, name, max_age)
+    if not cookie_store.is_validated(entry):
+        return False
+    add_to_jar(session.cookie_jar, entry.get("cookies", []))
+    return True
+
+
+async def store_login(session, name):
+    """Share a fresh login's cookies with every worker and both engines"""
+    try:
+        await in_thread(cookie_store.save_list, name, jar_to_list(session.cookie_jar))
+    except OSError as e:
+        logger.warning(f"Failed to save cookies: {e}")
+
+
+# Import Glass Corp
+
+async def igc_login(client, session, credentials):
+    """Log the shared IGC session in unless it already is"""
+    async with client.login_lock("Import Glass Corp"):
+        if client.is_logged_in("Import Glass Corp"):
+            return True
+
+        if await restore_login(session, igc_scraper.COOKIE_NAME, LOGIN_TTL["Import Glass Corp"]):
+            logger.info("[IGC] Using stored cookies")
+            client.mark_logged_in("Import Glass Corp")
+            return True
+
+        logger.info("[IGC] Starting login process")
+        response = await fetch(igc_scraper.SUPPLIER, session, 'POST', igc_scraper.LOGIN_URL, data=credentials)
+
+        if await parse(igc_scraper.is_logged_in_page, response.text):
+            logger.info("[IGC] Login successful!")
+            client.mark_logged_in("Import Glass Corp")
+            await store_login(session, igc_scraper.COOKIE_NAME)
+            return True
+
+        logger.error(f"[IGC] Login failed. Status Code: {response.status_code}")
+        return False
+
+
+async def igc_scrape(client, part_number, concurrent_requests=5):
+    """
+    Async IGC login, search and detail fetch
+
+    Returns:
+        Dictionary with search results and timing info (same shape as IGCScraper.search)
+    """
+    start_time = time.time()
+    credentials = igc_scraper.load_credentials()
+
+    if not all(credentials.values()):
+        logger.error("[IGC] Missing credentials for login")
+        return {
+            "success": False,
+            "message": "Missing credentials for login",
+            "results": [],
+            "time_taken": time.time() - start_time
+        }
+
+    session = client.session("Import Glass Corp", headers=igc_scraper.HEADERS)
+
+    try:
+        if not await igc_login(client, session, credentials):
+            return {
+                "success": False,
+                "message": "Login failed. Check credentials or website may be down.",
+                "results": [],
+                "time_taken": time.time() - start_time
+            }
+
+        logger.info(f"[IGC] Searching for part number: {part_number}")
+        response = await fetch(igc_scraper.SUPPLIER, session, 'POST', igc_scraper.SEARCH_URL, data={'search': part_number})
+
+        # Session expired since the last search - log in again once
+        if "login" in response.url.lower():
+            client.mark_logged_out("Import Glass Corp")
+            await in_thread(cookie_store.invalidate, igc_scraper.COOKIE_NAME)
+            if not await igc_login(client, session, credentials):
+                return {
+                    "success": False,
+                    "message": "Not logged in. Please login first.",
+                    "time_taken": time.time() - start_time
+                }
+            response = await fetch(igc_scraper.SUPPLIER, session, 'POST', igc_scraper.SEARCH_URL, data={'search': part_number})
+
+        if response.status_code != 200:
+            logger.error(f"[IGC] Search request failed with status code {response.status_code}")
+            return {
+                "success": False,
+                "message": f"Search request failed with status code: {response.status_code}",
+                "time_taken": time.time() - start_time
+            }
+
+        search_results = await parse(igc_scraper.parse_search_results, response.text)
+        logger.info(f"[IGC] Found {len(search_results)} parts in search results in {time.time() - start_time:.2f} seconds")
+
+        if not search_results:
+            return {
+                "success": True,
+                "message": f"No parts found for {part_number}",
+                "results": [],
+                "time_taken": time.time() - start_time
+            }
+
+        # Fetch every detail page concurrently, bounded like the threaded version
+        semaphore = asyncio.Semaphore(concurrent_requests)
+
+        async def process_part(part_info):
+            async with semaphore:
+                try:
+                    detail = await fetch(igc_scraper.SUPPLIER, session, 'GET', part_info['url'])
+                except REQUEST_ERRORS as e:
+                    logger.warning(f"[IGC] Error fetching {part_info['url']}: {str(e)}")
+                    return None
+            if detail.status_code != 200:
+                logger.warning(f"[IGC] Failed to fetch {part_info['url']}, status code: {detail.status_code}")
+                return None
+            return await parse(igc_scraper.parse_detail_page, detail.text, part_info)
+
+        details = await asyncio.gather(*(process_part(part_info) for part_info in search_results))
+        results = [r for r in details if r]
+
+        elapsed = time.time() - start_time
+        logger.info(f"[IGC] Processed {len(results)}/{len(search_results)} parts in {elapsed:.2f} seconds")
+
+        return {
+            "success": True,
+            "message": f"Found {len(results)} parts at Opa-Locka warehouse",
+            "results": igc_scraper.format_part_details(results),
+            "time_taken": elapsed
+        }
+
+    except REQUEST_ERRORS as e:
+        logger.error(f"[IGC] Connection error during search: {str(e)}")
+        return {
+            "success": False,
+            "message": f"Connection error: {str(e)}",
+            "time_taken": time.time() - start_time
+        }
+
+
+# Mygrant
+
+async def mygrant_scrape(client, part_number, max_retries=2):
+    """
+    Async Mygrant login and search
+
+    Returns:
+        List of parts in the format [part_number, stock, price, location]
+    """
+    load_dotenv()
+    username = os.getenv('MYGRANT_USER')
+    password = os.getenv('MYGRANT_PASS')
+
+    if not username or not password:
+        logger.error("Missing Mygrant credentials in environment variables")
+        return []
+
+    start_time = time.time()
+
+    for attempt in range(max_retries):
+        # Mygrant logins don't survive between searches, so each attempt starts clean
+        async with client.new_session(headers=mygrant_scraper.HEADERS) as session:
+            try:
+                logger.info(f"[Mygrant] Searching for part number: {part_number}")
+
+                response = await fetch(mygrant_scraper.SUPPLIER, session, 'GET', mygrant_scraper.LOGIN_URL)
+                if response.status_code != 200:
+                    logger.error(f"Failed to get login page. Status code: {response.status_code}")
+                    continue
+
+                form_data = await parse(mygrant_scraper.build_login_form_data, response.text, username, password)
+                if form_data is None:
+                    logger.error("Could not find login form on page")
+                    continue
+
+                login_response = await fetch(
+                    mygrant_scraper.SUPPLIER, session, 'POST', mygrant_scraper.LOGIN_URL,
+                    data=form_data,
+                    headers={"Content-Type": "application/x-www-form-urlencoded", "Referer": mygrant_scraper.LOGIN_URL}
+                )
+
+                if login_response.url == mygrant_scraper.LOGIN_URL:
+                    error_msg = await parse(mygrant_scraper.find_login_error, login_response.text)
+                    if error_msg:
+                        logger.error(f"Login failed: {error_msg}")
+                        continue
+
+                logger.info(f"[Mygrant] Login successful in {time.time() - start_time:.2f} seconds!")
+
+                search_response = await fetch(
+                    mygrant_scraper.SUPPLIER, session, 'GET', mygrant_scraper.SEARCH_URL,
+                    params={'q': part_number, 'do': 'Search'}
+                )
+                if search_response.status_code != 200:
+                    logger.error(f"Search request failed. Status code: {search_response.status_code}")
+                    continue
+
+                parts = await parse(mygrant_scraper.parse_search_results, search_response.text, part_number, logger)
+                logger.info(f"[Mygrant] Search completed in {time.time() - start_time:.2f}s, found {len(parts)} results")
+                return parts
+
+            except REQUEST_ERRORS as e:
+                logger.error(f"Connection error: {e}")
+                if attempt < max_retries - 1:
+                    logger.info(f"Retrying... (attempt {attempt + 2}/{max_retries})")
+                    await asyncio.sleep(1)
+
+    logger.error(f"Failed after {max_retries} attempts")
+    return []
+
+
+# Pilkington
+
+async def pilkington_try_direct_access(client, session):
+    """Async version of pilkington_scraper.try_direct_access"""
+    for url in ('https://shop.pilkington.com/ecomm/search/basic/', 'https://shop.pilkington.com/ecomm/'):
+        try:
+            response = await fetch(pilkington_scraper.SUPPLIER, session, 'GET', url)
+            if pilkington_scraper.is_shop_url(response.url):
+                logger.info("Direct navigation successful - bypassed login")
+                client.mark_logged_in("Pilkington")
+                return session
+        except REQUEST_ERRORS:
+            pass
+
+    logger.error("Login failed - could not access shop after multiple attempts")
+    client.mark_logged_out("Pilkington")
+    return None
+
+
+async def pilkington_login(client):
+    """Return a logged-in Pilkington session, logging in if needed"""
+    session = client.session("Pilkington", headers=pilkington_scraper.SESSION_HEADERS)
+
+    async with client.login_lock("Pilkington"):
+        if client.is_logged_in("Pilkington"):
+            return session
+
+        load_dotenv()
+        username = os.getenv('PIL_USER')
+        password = os.getenv('PIL_PASS')
+
+        if not username or not password:
+            logger.error("Missing Pilkington credentials")
+            return None
+
+        logger.info("Logging in to Pilkington website")
+        try:
+            shop_resp = await fetch(pilkington_scraper.SUPPLIER, session, 'GET', pilkington_scraper.SHOP_URL)
+            if pilkington_scraper.is_shop_url(shop_resp.url):
+                if await parse(pilkington_scraper.has_signout_link, shop_resp.text):
+                    logger.info("Already logged in")
+                    client.mark_logged_in("Pilkington")
+                    return session
+
+            login_resp = await fetch(pilkington_scraper.SUPPLIER, session, 'GET', pilkington_scraper.LOGIN_URL)
+            login_request = await parse(
+                pilkington_scraper.build_login_request,
+                login_resp.text, pilkington_scraper.LOGIN_URL, username, password
+            )
+            if not login_request:
+                logger.warning("Could not find login form")
+                return await pilkington_try_direct_access(client, session)
+
+            action_url, login_data = login_request
+            login_submit = await fetch(
+                pilkington_scraper.SUPPLIER, session, 'POST', action_url,
+                data=login_data,
+                headers={'Content-Type': 'application/x-www-form-urlencoded', 'Referer': pilkington_scraper.LOGIN_URL}
+            )
+
+            if pilkington_scraper.is_shop_url(login_submit.url):
+                logger.info("Login successful - redirected to shop")
+                client.mark_logged_in("Pilkington")
+                return session
+
+            return await pilkington_try_direct_access(client, session)
+
+        except REQUEST_ERRORS as e:
+            logger.error(f"Login error: {e}")
+            return await pilkington_try_direct_access(client, session)
+
+
+async def pilkington_scrape(client, part_number, max_retries=2):
+    """
+    Async Pilkington login and search across the fallback URLs
+
+    Returns:
+        List of parts in the format [part_number, description, price, location, status]
+    """
+    start_time = time.time()
+    default_parts = pilkington_scraper.build_default_parts(part_number)
+
+    for attempt in range(max_retries):
+        try:
+            session = await pilkington_login(client)
+            if not session:
+                logger.error("Could not log in, returning default Pilkington data")
+                return default_parts
+
+            # Search URLs that have been finding parts first
+            urls = pilkington_scraper.build_search_urls(part_number)
+            methods = pilkington_scraper.SEARCH_METHODS
+            for url_idx in [methods.index(method) for method in strategy_stats.plan("Pilkington", "url", methods)]:
+                url = urls[url_idx]
+                logger.info(f"Searching part in Pilkington (Method {url_idx+1}): {part_number}")
+                search_resp = await fetch(pilkington_scraper.SUPPLIER, session, 'GET', url)
+
+                if 'identity.pilkington.com/identityexternal/login' in search_resp.url:
+                    logger.info("Login required")
+                    client.mark_logged_out("Pilkington")
+                    session = await pilkington_login(client)
+                    if not session:
+                        logger.error("Could not log in, trying next URL")
+                        continue
+                    search_resp = await fetch(pilkington_scraper.SUPPLIER, session, 'GET', url)
+
+                if 'shop.pilkington.com' not in search_resp.url:
+                    logger.warning(f"Not on Pilkington shop page for URL {url_idx+1}, trying next URL")
+                    continue
+
+                extraction = strategy_stats.plan("Pilkington", "extraction", pilkington_scraper.EXTRACTION_METHODS, reorder=False)
+                parts, tried = await parse(pilkington_scraper.extract_parts_using, search_resp.text, part_number, logger, extraction)
+                strategy_stats.record_fallbacks("Pilkington", "extraction", tried, bool(parts))
+                strategy_stats.record("Pilkington", "url", methods[url_idx], bool(parts))
+                if parts:
+                    logger.info(f"Pilkington scraper completed in {time.time() - start_time:.2f} seconds")
+                    return parts
+
+        except REQUEST_ERRORS as e:
+            logger.error(f"Error in Pilkington scraper (attempt {attempt + 1}/{max_retries}): {e}")
+
+        if attempt < max_retries - 1:
+            logger.info(f"Retrying search (attempt {attempt + 2}/{max_retries})")
+            await asyncio.sleep(1)
+
+    logger.warning(f"No parts found for {part_number} after {max_retries} attempts, returning default parts")
+    return default_parts
+
+
+# PWG
+
+async def pwg_login(client, session):
+    """Log the shared PWG session in, accepting the terms page if shown"""
+    async with client.login_lock("PWG"):
+        if client.is_logged_in("PWG"):
+            return True
+
+        if await restore_login(session, pwg_scraper.COOKIE_NAME, pwg_scraper.COOKIE_MAX_AGE):
+            logger.info("Using stored PWG cookies")
+            client.mark_logged_in("PWG")
+            return True
+
+        load_dotenv()
+        username = os.getenv('PGW_USER')
+        password = os.getenv('PGW_PASS')
+
+        logger.info("Logging in to Buy PGW Auto Glass")
+        login_page = await fetch(pwg_scraper.SUPPLIER, session, 'GET', pwg_scraper.BASE_URL + '/')
+        login_url, login_data = await parse(pwg_scraper.build_login_request, login_page.text, username, password)
+
+        login_response = await fetch(
+            pwg_scraper.SUPPLIER, session, 'POST', login_url,
+            data=login_data,
+            headers={'Referer': pwg_scraper.BASE_URL + '/', 'Content-Type': 'application/x-www-form-urlencoded'}
+        )
+
+        if "Agree" in login_response.text:
+            agreement_request = await parse(pwg_scraper.build_agreement_request, login_response.text)
+            if agreement_request:
+                agreement_url, agreement_data = agreement_request
+                await fetch(
+                    pwg_scraper.SUPPLIER, session, 'POST', agreement_url,
+                    data=agreement_data,
+                    headers={'Referer': login_response.url, 'Content-Type': 'application/x-www-form-urlencoded'}
+                )
+                logger.info("Submitted agreement form")
+
+        verify_response = await fetch(pwg_scraper.SUPPLIER, session, 'GET', pwg_scraper.VERIFY_URL)
+        if "PartSearch" in verify_response.url:
+            logger.info("Login successful")
+            client.mark_logged_in("PWG")
+            await store_login(session, pwg_scraper.COOKIE_NAME)
+            return True
+
+        logger.warning("Login failed")
+        return False
+
+
+async def pwg_load_search_form(client, session, url):
+    """Load a PWG search form page, logging in if it bounces to login, and cache its template"""
+    response = await fetch(pwg_scraper.SUPPLIER, session, 'GET', url)
+
+    if "PartSearch" not in response.url:
+        logger.info("Login required")
+        client.mark_logged_out("PWG")
+        await in_thread(cookie_store.invalidate, pwg_scraper.COOKIE_NAME)
+        if not await pwg_login(client, session):
+            return None
+        response = await fetch(pwg_scraper.SUPPLIER, session, 'GET', url)
+
+    search_form = await parse(pwg_scraper.parse_search_form, response.text, url)
+    if search_form:
+        pwg_scraper.search_forms.put(session, url, search_form)
+    return search_form
+
+
+async def pwg_submit_search(session, url, search_form, part_number):
+    """POST a PWG part search built from a form template"""
+    search_url, search_data = pwg_scraper.fill_search_form(search_form, part_number)
+    return await fetch(
+        pwg_scraper.SUPPLIER, session, 'POST', search_url,
+        data=search_data,
+        headers={'Referer': url, 'Content-Type': 'application/x-www-form-urlencoded'}
+    )
+
+
+async def pwg_scrape(client, part_number):
+    """
+    Async PWG login and search across both search URLs
+
+    Returns:
+        List of parts in the format [part_number, availability, price, location, description]
+    """
+    start_time = time.time()
+    default_parts = pwg_scraper.build_default_parts(part_number)
+    session = client.session("PWG", headers=pwg_scraper.SESSION_HEADERS)
+
+    logger.info(f"Searching part in PWG: {part_number}")
+
+    # Search URLs that have been finding parts first
+    methods = pwg_scraper.SEARCH_METHODS
+    for url_idx in [methods.index(method) for method in strategy_stats.plan("PWG", "url", methods)]:
+        url = pwg_scraper.SEARCH_URLS[url_idx]
+        try:
+            # Reuse the form template this session loaded recently, skipping the form page
+            search_form = pwg_scraper.search_forms.get(session, url)
+            cached = search_form is not None
+            if not cached:
+                search_form = await pwg_load_search_form(client, session, url)
+            if not search_form:
+                logger.warning("No search form found, trying next URL")
+                strategy_stats.record("PWG", "url", methods[url_idx], False)
+                continue
+
+            search_response = await pwg_submit_search(session, url, search_form, part_number)
+
+            # A cached template that no longer works is dropped and the search repeated from a fresh form page
+            if pwg_scraper.search_rejected(search_response):
+                pwg_scraper.search_forms.invalidate(session)
+                if cached:
+                    logger.info("Search with cached form was rejected, reloading the form page")
+                    search_form = await pwg_load_search_form(client, session, url)
+                    if not search_form:
+                        logger.warning("No search form found, trying next URL")
+                        strategy_stats.record("PWG", "url", methods[url_idx], False)
+                        continue
+                    search_response = await pwg_submit_search(session, url, search_form, part_number)
+
+            if part_number not in search_response.text:
+                logger.info(f"Part number {part_number} not found in page source, skipping detailed parsing")
+                strategy_stats.record("PWG", "url", methods[url_idx], False)
+                continue
+            strategy_stats.record("PWG", "url", methods[url_idx], True)
+
+            extraction = strategy_stats.plan("PWG", "extraction", pwg_scraper.EXTRACTION_METHODS, reorder=False)
+            parts, tried = await parse(pwg_scraper.extract_parts_using, search_response.text, part_number, logger, extraction)
+            strategy_stats.record_fallbacks("PWG", "extraction", tried, bool(parts))
+            elapsed = time.time() - start_time
+            if parts:
+                logger.info(f"Found {len(parts)} parts in {elapsed:.2f}s")
+                return parts
+
+            logger.info(f"Could not find specific part information, returning default parts after {elapsed:.2f}s")
+            return default_parts
+
+        except REQUEST_ERRORS as e:
+            pwg_scraper.search_forms.invalidate(session)
+            logger.warning(f"Error accessing {url}: {e}")
+            continue
+
+    logger.warning(f"Could not find part {part_number} on any PWG URLs")
+    return default_parts
+
+
+# Async flow for each supplier, keyed by the names used in main.SCRAPERS
+FLOWS = {
+    "Import Glass Corp": igc_scrape,
+    "Mygrant Glass": mygrant_scrape,
+    "Pilkington": pilkington_scrape,
+    "PWG": pwg_scrape,
+}
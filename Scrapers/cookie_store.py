@@ -0,0 +1,239 @@
+# scrapers/cookie_store.py
+# Supplier cookies shared between worker processes - atomic JSON files with a locked read-modify-write
+#
+# Each supplier's cookies live in one JSON file together with when they were saved
+# and when they were last proven to work. Writes go to a temporary file that is
+# renamed over the old one, so a reader never sees a half-written file. Reads are
+# served from memory until the file's mtime changes.
+
+import os
+import json
+import time
+import tempfile
+import threading
+import logging
+from contextlib import contextmanager
+
+from requests.cookies import create_cookie
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows - writes are then only serialized within the process
+    fcntl = None
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+def cookies_to_list(jar):
+    """Serialize a requests cookie jar to a list of JSON-friendly dictionaries"""
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "expires": cookie.expires,
+            "secure": cookie.secure,
+            "rest": dict(cookie._rest),
+        }
+        for cookie in jar
+    ]
+
+
+def cookies_from_list(items):
+    """Rebuild cookies serialized with cookies_to_list"""
+    return [create_cookie(**item) for item in items]
+
+
+class CookieStore:
+    def __init__(self, directory=".", validation_window=600):
+        """
+        Initialize the store
+
+        Args:
+            directory: Directory holding one <name>.json file per supplier
+            validation_window: Seconds after cookies were proven to work that they are
+                trusted without a validation request
+        """
+        self.directory = directory
+        self.validation_window = validation_window
+
+        self._lock = threading.Lock()
+        self._file_locks = {}
+
+        # name -> (mtime_ns, size, entry)
+        self._cache = {}
+
+        # Counters for stats()
+        self._reads = 0
+        self._disk_reads = 0
+        self._writes = 0
+
+    def configure(self, directory=None, validation_window=None):
+        """Change where cookies are stored or how long a validation is trusted"""
+        with self._lock:
+            if directory is not None:
+                self.directory = directory
+                self._cache = {}
+            if validation_window is not None:
+                self.validation_window = validation_window
+
+    def path(self, name):
+        return os.path.join(self.directory, f"{name}.json")
+
+    def load(self, name, max_age=None):
+        """
+        Return a supplier's stored entry, reading the file only if it changed
+
+        Args:
+            name: Store name (e.g. "igc_cookies")
+            max_age: Ignore cookies saved longer ago than this many seconds
+
+        Returns:
+            Dictionary with cookies, saved_at and validated_at, or None
+        """
+        path = self.path(name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            self._reads += 1
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                entry = cached[2]
+            else:
+                entry = None
+
+        if entry is None:
+            try:
+                with open(path, "r") as file:
+                    entry = json.load(file)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read cookies from {path}: {str(e)}")
+                return None
+
+            with self._lock:
+                self._disk_reads += 1
+                self._cache[name] = (stat.st_mtime_ns, stat.st_size, entry)
+
+        if max_age is not None and time.time() - entry.get("saved_at", 0) > max_age:
+            return None
+        return entry
+
+    def apply(self, name, session, max_age=None):
+        """
+        Load stored cookies into a session
+
+        Returns:
+            The stored entry, or None if nothing (fresh enough) was stored
+        """
+        entry = self.load(name, max_age)
+        if entry is None:
+            return None
+
+        for cookie in cookies_from_list(entry.get("cookies", [])):
+            session.cookies.set_cookie(cookie)
+        return entry
+
+    def is_validated(self, entry):
+        """Check whether an entry's cookies were proven to work within the validation window"""
+        validated_at = entry.get("validated_at") if entry else None
+        return validated_at is not None and time.time() - validated_at < self.validation_window
+
+    def save(self, name, session, validated=True):
+        """
+        Store a session's cookies
+
+        Args:
+            name: Store name
+            session: requests session whose cookies are stored
+            validated: Whether the cookies just proved to work (e.g. right after login)
+        """
+        self.save_list(name, cookies_to_list(session.cookies), validated)
+
+    def save_list(self, name, cookies, validated=True):
+        """Store cookies already serialized like cookies_to_list (e.g. from an aiohttp cookie jar)"""
+        now = time.time()
+        entry = {
+            "cookies": cookies,
+            "saved_at": now,
+            "validated_at": now if validated else None,
+        }
+        with self._locked(name):
+            self._write(name, entry)
+
+    def mark_validated(self, name):
+        """Record that the stored cookies just proved to work"""
+        self._update(name, time.time())
+
+    def invalidate(self, name):
+        """Record that the stored cookies stopped working, so they are validated before reuse"""
+        self._update(name, None)
+
+    def stats(self):
+        """Return read, disk read and write counts"""
+        with self._lock:
+            return {
+                "reads": self._reads,
+                "disk_reads": self._disk_reads,
+                "writes": self._writes,
+            }
+
+    def _update(self, name, validated_at):
+        with self._locked(name):
+            entry = self.load(name)
+            if entry is None:
+                return
+            entry = dict(entry, validated_at=validated_at)
+            self._write(name, entry)
+
+    def _write(self, name, entry):
+        # Caller holds the file lock. Write a temp file next to the target and rename it into place.
+        path = self.path(name)
+        os.makedirs(self.directory or ".", exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=self.directory or ".")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(entry, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            self._writes += 1
+            self._cache.pop(name, None)
+
+    @contextmanager
+    def _locked(self, name):
+        # Serializes read-modify-write across threads and, with fcntl, across processes
+        with self._lock_for(name):
+            if fcntl is None:
+                yield
+                return
+
+            os.makedirs(self.directory or ".", exist_ok=True)
+            with open(self.path(name) + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _lock_for(self, name):
+        with self._lock:
+            return self._file_locks.setdefault(name, threading.Lock())
+
+
+# Process-wide store used by the scrapers
+cookie_store = CookieStore()
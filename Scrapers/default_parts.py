@@ -0,0 +1,16 @@
+# scrapers/default_parts.py
+# Marks the placeholder parts a scraper returns when its search failed
+#
+# Pilkington and PWG return made-up parts rather than nothing when they can't
+# search the site (no login, site down, nothing extracted). They are still shown,
+# as before, but they are not search results: callers check is_default_parts()
+# before caching or otherwise reusing them.
+
+
+class DefaultParts(list):
+    """A list of placeholder parts - behaves like the parts list it stands in for"""
+
+
+def is_default_parts(parts):
+    """Whether a scraper's return value is placeholder parts rather than search results"""
+    return isinstance(parts, DefaultParts)
@@ -0,0 +1,83 @@
+# scrapers/form_cache.py
+# Per-session cache of parsed search form templates, so a search can POST without loading the form page first
+#
+# A form template (action URL, hidden inputs, submit button) is tied to the session
+# that loaded it - hidden values can be session specific - so entries are kept per
+# session object and disappear with it. Entries expire after a short TTL, and the
+# scraper drops a session's entries when a POST built from them fails or bounces
+# to the login page.
+
+import time
+import threading
+import logging
+import weakref
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+class FormCache:
+    def __init__(self, ttl=300):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds a parsed form template is reused before the form page is loaded again
+        """
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+
+        # session -> {url: (cached_at, form)}
+        self._forms = weakref.WeakKeyDictionary()
+
+        # Counters for stats()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def configure(self, ttl=None):
+        """Change the TTL - applies to entries already cached too"""
+        with self._lock:
+            if ttl is not None:
+                self.ttl = ttl
+
+    def get(self, session, url):
+        """
+        Return the template parsed from a form page for a session
+
+        Args:
+            session: Session the form page was loaded with
+            url: URL of the form page
+
+        Returns:
+            The cached template, or None if there is none or it expired
+        """
+        with self._lock:
+            entry = self._forms.get(session, {}).get(url)
+            if entry is None or time.time() - entry[0] >= self.ttl:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return entry[1]
+
+    def put(self, session, url, form):
+        """Cache a template parsed from a form page loaded with a session"""
+        with self._lock:
+            self._forms.setdefault(session, {})[url] = (time.time(), form)
+
+    def invalidate(self, session):
+        """Drop a session's templates - a POST built from one failed or bounced to login"""
+        with self._lock:
+            if self._forms.pop(session, None) is not None:
+                self._invalidations += 1
+
+    def stats(self):
+        """Return hit, miss and invalidation counts"""
+        with self._lock:
+            return {
+                "sessions": len(self._forms),
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+            }
@@ -0,0 +1,233 @@
+# scrapers/hedging.py
+# Hedged requests - start the primary attempt at once, alternates after an adaptive delay, first result wins
+#
+# A supplier search with fallback URLs used to try them one after another and then
+# repeat the whole round. A hedged run starts the primary attempt immediately and
+# each alternate only once the previous one is late (slower than most primary
+# attempts have recently been) or has come back empty. The first attempt returning
+# a result wins, the rest are cancelled, and the whole run ends at the supplier's
+# deadline however many attempts are still out.
+
+import os
+import time
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Primary attempts needed before their latency replaces the initial delay
+MIN_SAMPLES = 5
+
+
+class Hedge:
+    """What a running attempt can see of its hedged run"""
+
+    def __init__(self, deadline_at):
+        self.deadline_at = deadline_at
+        self.cancelled = threading.Event()
+
+    def remaining(self):
+        """Seconds until the run's deadline"""
+        return max(0, self.deadline_at - time.time())
+
+    def timeout(self, limit):
+        """Request timeout that doesn't outlive the run: limit, or less near the deadline"""
+        return max(0.1, min(limit, self.remaining()))
+
+
+class HedgedRequests:
+    def __init__(self, supplier, deadline=10, initial_delay=2, min_delay=0.5, max_delay=5,
+                 percentile=0.9, window=50, max_workers=12):
+        """
+        Initialize the hedger
+
+        Args:
+            supplier: Supplier name (for logs and stats)
+            deadline: Seconds a run may take before it gives up on every attempt still out
+            initial_delay: Seconds before starting an alternate, until enough primaries were timed
+            min_delay: Lower bound for the adaptive delay
+            max_delay: Upper bound for the adaptive delay
+            percentile: Primary latency percentile after which an alternate is started
+            window: Number of recent primary latencies the delay is computed from
+            max_workers: Threads running attempts for this supplier
+        """
+        self.supplier = supplier
+        self.deadline = deadline
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.percentile = percentile
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._pool = None
+        self._pid = None
+
+        # Counters for stats()
+        self._runs = 0
+        self._hedges = 0
+        self._wins = {}
+        self._misses = 0
+        self._deadlines = 0
+        self._errors = 0
+        self._abandoned = 0
+
+    def configure(self, deadline=None, initial_delay=None, max_delay=None):
+        """Change the deadline or delay bounds"""
+        with self._lock:
+            if deadline is not None:
+                self.deadline = deadline
+            if initial_delay is not None:
+                self.initial_delay = initial_delay
+            if max_delay is not None:
+                self.max_delay = max_delay
+
+    def delay(self):
+        """Seconds after starting an attempt before the next one is started"""
+        with self._lock:
+            if len(self._latencies) < MIN_SAMPLES:
+                return self.initial_delay
+            latencies = sorted(self._latencies)
+            late = latencies[min(len(latencies) - 1, int(len(latencies) * self.percentile))]
+        return min(self.max_delay, max(self.min_delay, late))
+
+    def run(self, attempts, deadline=None):
+        """
+        Run attempts hedged, in order of preference
+
+        Args:
+            attempts: Callables taking a Hedge and returning a result, falsy if they found nothing.
+                They should stop early (return None) once hedge.cancelled is set.
+            deadline: Seconds the run may take (the supplier's deadline if None)
+
+        Returns:
+            The first truthy result, or None if every attempt came back empty or the deadline passed
+        """
+        deadline = self.deadline if deadline is None else deadline
+        hedge = Hedge(time.time() + deadline)
+        pool = self._get_pool()
+        delay = self.delay()
+
+        with self._lock:
+            self._runs += 1
+
+        # future -> attempt index
+        pending = {}
+        next_index = 0
+        next_start = time.time()
+
+        try:
+            while True:
+                now = time.time()
+
+                # Start the next attempt once the last one is late, or at once if all came back empty
+                if next_index < len(attempts) and (now >= next_start or not pending):
+                    future = pool.submit(attempts[next_index], hedge)
+                    if next_index == 0:
+                        future.add_done_callback(lambda done, started=now: self._record(done, time.time() - started))
+                    else:
+                        with self._lock:
+                            self._hedges += 1
+                    pending[future] = next_index
+                    next_index += 1
+                    next_start = now + delay
+                    continue
+
+                if not pending:
+                    with self._lock:
+                        self._misses += 1
+                    return None
+
+                remaining = hedge.remaining()
+                if remaining <= 0:
+                    logger.warning(f"[{self.supplier}] Search deadline of {deadline}s passed with {len(pending)} attempt(s) still out")
+                    with self._lock:
+                        self._deadlines += 1
+                    return None
+
+                timeout = remaining if next_index >= len(attempts) else min(remaining, max(0, next_start - now))
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.warning(f"[{self.supplier}] Attempt {index + 1} failed: {str(e)}")
+                        with self._lock:
+                            self._errors += 1
+                        continue
+
+                    if result:
+                        with self._lock:
+                            self._wins[index] = self._wins.get(index, 0) + 1
+                        if index > 0:
+                            logger.info(f"[{self.supplier}] Alternate attempt {index + 1} won")
+                        return result
+        finally:
+            # Losers still waiting for a thread never start, running ones stop at their next check
+            hedge.cancelled.set()
+            for future in pending:
+                future.cancel()
+            with self._lock:
+                self._abandoned += len(pending)
+
+    def stats(self):
+        """Return the current delay and run/hedge/win counters"""
+        delay = self.delay()
+        with self._lock:
+            return {
+                "deadline": self.deadline,
+                "delay": round(delay, 3),
+                "runs": self._runs,
+                "hedges": self._hedges,
+                "wins": {f"attempt_{index + 1}": count for index, count in sorted(self._wins.items())},
+                "misses": self._misses,
+                "deadlines": self._deadlines,
+                "errors": self._errors,
+                "abandoned": self._abandoned,
+            }
+
+    def _record(self, future, latency):
+        # Only primaries that came back with a result are timed - fast failures, empty
+        # results and cancelled attempts would drag the delay down
+        if future.cancelled() or future.exception() is not None or not future.result():
+            return
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                # A forked worker can't use the parent's threads
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix=f"hedge-{self.supplier}")
+                self._pid = os.getpid()
+            return self._pool
+
+
+# Every hedger created by the scrapers, by supplier name
+HEDGERS = {}
+
+
+def create_hedger(supplier, **kwargs):
+    """Create a hedger for a supplier and register it for configure() and stats()"""
+    hedger = HedgedRequests(supplier, **kwargs)
+    HEDGERS[supplier] = hedger
+    return hedger
+
+
+def configure(deadlines=None):
+    """Apply per-supplier deadlines (supplier name -> seconds) to the registered hedgers"""
+    for supplier, deadline in (deadlines or {}).items():
+        if supplier in HEDGERS:
+            HEDGERS[supplier].configure(deadline=deadline)
+
+
+def stats():
+    """Return stats for every registered hedger, by supplier"""
+    return {supplier: hedger.stats() for supplier, hedger in HEDGERS.items()}
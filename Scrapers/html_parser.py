@@ -0,0 +1,129 @@
+# scrapers/html_parser.py
+# Single entry point for turning supplier HTML into soup - fastest installed backend, partial parsing, parse-once memo
+#
+# Scrapers ask for a named target ("forms", "tables", ...) instead of building a
+# BeautifulSoup themselves. A target parses only the matching elements (and their
+# subtrees), and a body that was already parsed - fully or for the same target -
+# is served from the memo instead of being parsed again. A body is re-parsed by the
+# scrape that fetched it (login check, then extraction), so each thread keeps its
+# own few most recent trees, keyed by a digest of the body: trees are never shared
+# between threads, and the memo holds neither page strings nor trees for other scrapes.
+
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # only checking that it is installed
+    DEFAULT_BACKEND = "lxml"
+except ImportError:
+    DEFAULT_BACKEND = "html.parser"
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Regions of a page the scrapers look at, by name
+TARGETS = {
+    "forms": SoupStrainer("form"),
+    "tables": SoupStrainer("table"),
+    "links": SoupStrainer("a"),
+    "customer_info": SoupStrainer("div", id="customer-info"),
+    "search_results": SoupStrainer(["table", "h4"]),
+    "detail": SoupStrainer(["table", "b"]),
+}
+
+
+class HTMLParser:
+    def __init__(self, backend=None, memo_size=2):
+        """
+        Initialize the parser
+
+        Args:
+            backend: BeautifulSoup tree builder ("lxml" or "html.parser"), fastest installed if None
+            memo_size: Number of parsed documents each thread keeps for reuse
+        """
+        self.backend = backend or DEFAULT_BACKEND
+        self.memo_size = memo_size
+
+        # Per thread: (target, body digest) -> soup. Bumping the generation clears every thread's memo.
+        self._local = threading.local()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        # Counters for stats()
+        self._parses = 0
+        self._memo_hits = 0
+
+    def configure(self, backend=None, memo_size=None):
+        """Change the backend or memo size - the memo is cleared"""
+        with self._lock:
+            if backend is not None:
+                self.backend = backend
+            if memo_size is not None:
+                self.memo_size = memo_size
+            self._generation += 1
+
+    def parse(self, html, only=None):
+        """
+        Parse a document, at most once per body and target
+
+        Args:
+            html: Page content (str or bytes)
+            only: Name of a TARGETS region to parse, or None for the whole document
+
+        Returns:
+            BeautifulSoup - shared with later calls in the same thread, so treat it as read-only
+        """
+        if only is not None and only not in TARGETS:
+            raise ValueError(f"Unknown parse target: {only}")
+
+        memo = self._memo()
+        digest = hashlib.blake2b(html.encode("utf-8") if isinstance(html, str) else html, digest_size=16).digest()
+
+        # A whole-document parse answers any target
+        for key in ((None, digest), (only, digest)):
+            soup = memo.get(key)
+            if soup is not None:
+                memo.move_to_end(key)
+                with self._lock:
+                    self._memo_hits += 1
+                return soup
+
+        soup = BeautifulSoup(html, self.backend, parse_only=TARGETS[only] if only else None)
+
+        with self._lock:
+            self._parses += 1
+        if self.memo_size > 0:
+            memo[(only, digest)] = soup
+            while len(memo) > self.memo_size:
+                memo.popitem(last=False)
+        return soup
+
+    def stats(self):
+        """Return backend, parse and memo hit counts"""
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "parses": self._parses,
+                "memo_hits": self._memo_hits,
+            }
+
+    def _memo(self):
+        # This thread's memo, replaced when configure() cleared the memos
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            local.memo = OrderedDict()
+            local.generation = self._generation
+        return local.memo
+
+
+# Process-wide parser used by the scrapers
+html_parser = HTMLParser()
+
+
+def parse_html(html, only=None):
+    """Parse supplier HTML with the process-wide parser (see HTMLParser.parse)"""
+    return html_parser.parse(html, only)
@@ -2,44 +2,262 @@
 # Import Glass Corp scraper - handles login, search, and result processing
 
 import requests
-import pickle
 import time
-from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
 
+from Scrapers.transport import new_session
+from Scrapers.html_parser import parse_html
+from Scrapers.parse_executor import parse_executor
+from Scrapers.response import decode_response
+from Scrapers.session_broker import create_broker, LoginFailed
+from Scrapers.cookie_store import cookie_store
+
 # Setup logger
 logger = logging.getLogger(__name__)
 
+# Site constants
+BASE_URL = "https://importglasscorp.com"
+SEARCH_URL = f"{BASE_URL}/product/search/"
+LOGIN_URL = f"{BASE_URL}/login/validate"
+
+# Supplier name for session pools and response decoding
+SUPPLIER = "Import Glass Corp"
+
+# Seconds an IGC login stays valid
+SESSION_TTL = 1800
+
+# Name of the shared cookie store entry
+COOKIE_NAME = "igc_cookies"
+
+# Headers
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Referer": f"{BASE_URL}/login",
+    "Origin": BASE_URL,
+    "Content-Type": "application/x-www-form-urlencoded",
+}
+
+def load_credentials():
+    """Read IGC credentials from the environment"""
+    return {
+        "email": os.getenv('IGC_USER'),
+        "customer_number": os.getenv('IGC_CN'),
+        "password": os.getenv('IGC_PASS'),
+    }
+
+def is_logged_in_page(html_content):
+    """Check whether a page belongs to a logged-in session (has the customer info block)"""
+    soup = parse_html(html_content, only="customer_info")
+    return soup.find('div', id='customer-info') is not None
+
+def parse_search_results(html_content, base_url=BASE_URL):
+    """
+    Parse the search results page HTML
+    
+    Args:
+        html_content: HTML content of the search results page
+        base_url: Site root used to absolutize part links
+    
+    Returns:
+        List of dictionaries containing part information
+    """
+    search_results = []
+    
+    try:
+        soup = parse_html(html_content, only="search_results")
+        tables = soup.find_all('table')
+        
+        logger.debug(f"[IGC] Found {len(tables)} tables on the search results page")
+        
+        for table_idx, table in enumerate(tables):
+            category = "Unknown"
+            prev = table.find_previous('h4')
+            if prev:
+                category = prev.get_text(strip=True)
+                logger.debug(f"[IGC] Table {table_idx+1} category: {category}")
+            
+            rows = table.find_all('tr')
+            logger.debug(f"[IGC] Table {table_idx+1} has {len(rows)} rows")
+            
+            for row_idx, row in enumerate(rows):
+                cells = row.find_all('td')
+                if len(cells) < 3:
+                    continue
+                
+                part_link = cells[0].find('a')
+                if not part_link:
+                    continue
+                
+                part_number = part_link.get_text(strip=True)
+                part_url = part_link.get('href')
+                if part_url and not part_url.startswith('http'):
+                    part_url = base_url + ('' if part_url.startswith('/') else '/') + part_url
+                
+                description = cells[1].get_text(strip=True)
+                
+                # Log the found part
+                logger.debug(f"[IGC] Found part: {part_number}, Description: {description}")
+                
+                search_results.append({
+                    'part_number': part_number,
+                    'description': description,
+                    'category': category,
+                    'url': part_url
+                })
+        
+        return search_results
+        
+    except Exception as e:
+        logger.error(f"[IGC] Error parsing search results: {str(e)}")
+        return []
+
+def parse_detail_page(html_content, part_info):
+    """
+    Parse part detail page and extract data
+    
+    Args:
+        html_content: HTML content of the detail page
+        part_info: Original part dictionary
+        
+    Returns:
+        List with part details or None if not found/not in Opa-Locka
+    """
+    if not html_content:
+        return None
+    
+    try:
+        soup = parse_html(html_content, only="detail")
+        
+        # Find warehouse location
+        location = "Unknown"
+        location_elements = soup.find_all('b')
+        for element in location_elements:
+            text = element.get_text()
+            if "Locka" in text or "Warehouse" in text:
+                location = text
+                break
+        
+        # If not in Opa-Locka, we might not want to include this part
+        if location != "Unknown" and "Opa-Locka" not in location:
+            logger.debug(f"[IGC] Part {part_info['part_number']} not available in Opa-Locka")
+            return None
+        
+        # Find price and availability in tables
+        tables = soup.find_all('table')
+        if not tables:
+            return None
+        
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all('td')
+                if len(cells) < 5:
+                    continue
+                
+                # Check if this row is for our part
+                row_part_number = cells[0].get_text(strip=True)
+                if part_info['part_number'] not in row_part_number:
+                    continue
+                
+                # Extract price
+                price = "Unknown"
+                for i in range(2, min(5, len(cells))):
+                    price_elements = cells[i].find_all('b')
+                    for p_elem in price_elements:
+                        price_text = p_elem.get_text(strip=True)
+                        if "$" in price_text or any(c.isdigit() for c in price_text):
+                            price = price_text
+                            break
+                
+                # Extract availability
+                availability = "No"
+                for cell in cells:
+                    cell_text = cell.get_text()
+                    if "In Stock" in cell_text:
+                        availability = "Yes"
+                        break
+                
+                # Return the part details
+                return [
+                    part_info["part_number"],
+                    availability,
+                    price,
+                    location
+                ]
+        
+        return None
+        
+    except Exception as e:
+        logger.warning(f"[IGC] Error parsing detail page for {part_info['part_number']}: {str(e)}")
+        return [part_info["part_number"], "Unknown", "Unknown", "Unknown"]
+
+def format_part_details(results):
+    """Convert detail rows [part_number, availability, price, location] into result dictionaries"""
+    formatted_results = []
+    for r in results:
+        formatted_results.append({
+            "part_number": r[0],
+            "availability": r[1],
+            "price": r[2],
+            "location": r[3],
+            "supplier": "Import Glass Corp"
+        })
+    return formatted_results
+
+def login(session, credentials=None):
+    """
+    Log a session in to IGC
+    
+    Args:
+        session: requests session to log in
+        credentials: Login form fields (read from the environment if None)
+        
+    Returns:
+        True if the response shows a logged-in page
+    """
+    credentials = credentials or load_credentials()
+    if not all(credentials.values()):
+        logger.error("[IGC] Missing credentials for login")
+        return False
+    
+    # Cookies another search (or worker) logged in with recently are reused without a request
+    entry = cookie_store.apply(COOKIE_NAME, session, max_age=SESSION_TTL)
+    if cookie_store.is_validated(entry):
+        logger.debug("[IGC] Using recently validated stored cookies")
+        return True
+    
+    response = decode_response(SUPPLIER, session.post(LOGIN_URL, data=credentials, headers=HEADERS))
+    if is_logged_in_page(response.text):
+        cookie_store.save(COOKIE_NAME, session)
+        return True
+    
+    logger.error(f"[IGC] Login failed. Status Code: {response.status_code}")
+    return False
+
+# Logged-in sessions shared by all searches in this process, refreshed before SESSION_TTL runs out
+broker = create_broker(SUPPLIER, login, new_session, ttl=SESSION_TTL)
+
 class IGCScraper:
     def __init__(self):
         """Initialize the IGC Scraper with config and session"""
-        self.session = requests.Session()
+        self.session = new_session()
         
         # Constants
-        self.base_url = "https://importglasscorp.com"
-        self.search_url = f"{self.base_url}/product/search/"
-        self.login_url = f"{self.base_url}/login/validate"
+        self.base_url = BASE_URL
+        self.search_url = SEARCH_URL
+        self.login_url = LOGIN_URL
         self.concurrent_requests = 5  # Adjust for parallel requests
         
         # Default credentials (replace with your own in the login method)
-        self.credentials = {
-            "email": os.getenv('IGC_USER'),
-            "customer_number": os.getenv('IGC_CN'),
-            "password": os.getenv('IGC_PASS'),
-        }
+        self.credentials = load_credentials()
         
         # Headers
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-            "Referer": f"{self.base_url}/login",
-            "Origin": self.base_url,
-            "Content-Type": "application/x-www-form-urlencoded",
-        }
+        self.headers = dict(HEADERS)
         
-        # Cookies file
-        self.cookies_file = 'igc_cookies.pkl'
+        # Shared cookie store entry
+        self.cookies_name = COOKIE_NAME
         
         # Status tracking
         self.logged_in = False
@@ -80,9 +298,11 @@ class IGCScraper:
         
         try:
             # First try to load cookies if available
-            if self._load_cookies():
-                # Verify if cookies are still valid
-                if self._verify_login():
+            entry = self._load_cookies()
+            if entry:
+                # Verify if cookies are still valid, unless they were proven to work recently
+                if cookie_store.is_validated(entry) or self._verify_login():
+                    self.logged_in = True
                     elapsed = time.time() - start_time
                     logger.info(f"[IGC] Login successful using saved cookies in {elapsed:.2f} seconds")
                     self.login_time = time.time()
@@ -100,14 +320,11 @@ class IGCScraper:
             
             # Send login request
             logger.debug(f"[IGC] Sending login request for {self.credentials['email']}")
-            response = self.session.post(self.login_url, data=login_payload, headers=self.headers)
+            response = decode_response(SUPPLIER, self.session.post(self.login_url, data=login_payload, headers=self.headers))
             self.login_response = response
             
             # Check if login was successful
-            soup = BeautifulSoup(response.text, 'html.parser')
-            customer_info = soup.find('div', id='customer-info')
-            
-            if customer_info:
+            if is_logged_in_page(response.text):
                 self.logged_in = True
                 self.login_time = time.time()
                 logger.info("[IGC] Login successful!")
@@ -155,7 +372,8 @@ class IGCScraper:
     
     def search(self, part_number):
         """
-        Search for parts based on part number
+        Search for parts based on part number. An instance that was logged in explicitly
+        searches on its own session, otherwise a logged-in session is leased from the broker.
         
         Args:
             part_number: The part number to search for
@@ -166,25 +384,33 @@ class IGCScraper:
         start_time = time.time()
         logger.info(f"[IGC] Searching for part number: {part_number}")
         
-        # Check if logged in
-        if not self.logged_in:
-            # Try to login with saved credentials if available
-            login_result = self.login()
-            if not login_result["success"]:
-                logger.error("[IGC] Not logged in and login failed")
-                return {
-                    "success": False,
-                    "message": "Not logged in. Please login first.",
-                    "time_taken": time.time() - start_time
-                }
+        if self.logged_in:
+            return self._search(part_number, start_time)
         
+        own_session = self.session
+        try:
+            with broker.lease() as lease:
+                self.session = lease.session
+                return self._search(part_number, start_time, lease)
+        except LoginFailed:
+            logger.error("[IGC] Not logged in and login failed")
+            return {
+                "success": False,
+                "message": "Not logged in. Please login first.",
+                "time_taken": time.time() - start_time
+            }
+        finally:
+            self.session = own_session
+    
+    def _search(self, part_number, start_time, lease=None):
+        """Run the search on self.session (see search)"""
         try:
             # Prepare search data
             search_data = {'search': part_number}
             
             # Send search request
             logger.debug(f"[IGC] Sending search request for part: {part_number}")
-            response = self.session.post(self.search_url, data=search_data, headers=self.headers)
+            response = decode_response(SUPPLIER, self.session.post(self.search_url, data=search_data, headers=self.headers))
             
             if response.status_code != 200:
                 logger.error(f"[IGC] Search request failed with status code {response.status_code}")
@@ -195,7 +421,20 @@ class IGCScraper:
                 }
             
             # Parse search results
-            search_results = self._parse_search_results(response.text)
+            search_results = self._parse_search_results(response)
+            
+            # No results on a logged-out page means the leased session expired - log in and search again
+            if not search_results and lease is not None and not is_logged_in_page(response.text):
+                logger.info("[IGC] Session expired, logging in again")
+                cookie_store.invalidate(self.cookies_name)
+                if not lease.relogin():
+                    return {
+                        "success": False,
+                        "message": "Session expired and login failed",
+                        "time_taken": time.time() - start_time
+                    }
+                response = decode_response(SUPPLIER, self.session.post(self.search_url, data=search_data, headers=self.headers))
+                search_results = self._parse_search_results(response)
             
             elapsed = time.time() - start_time
             logger.info(f"[IGC] Found {len(search_results)} parts in search results in {elapsed:.2f} seconds")
@@ -231,24 +470,20 @@ class IGCScraper:
             }
     
     def _load_cookies(self):
-        """Load cookies from file if available"""
+        """Load cookies from the shared store if available, returning the stored entry or None"""
         try:
-            if os.path.exists(self.cookies_file):
-                with open(self.cookies_file, 'rb') as cookie_file:
-                    cookies = pickle.load(cookie_file)
-                    self.session.cookies.update(cookies)
-                    logger.debug("[IGC] Cookies loaded successfully")
-                    return True
-            return False
+            entry = cookie_store.apply(self.cookies_name, self.session, max_age=SESSION_TTL)
+            if entry:
+                logger.debug("[IGC] Cookies loaded successfully")
+            return entry
         except Exception as e:
             logger.warning(f"[IGC] Error loading cookies: {str(e)}")
-            return False
+            return None
     
     def _save_cookies(self):
-        """Save cookies to file"""
+        """Save cookies to the shared store"""
         try:
-            with open(self.cookies_file, 'wb') as cookie_file:
-                pickle.dump(self.session.cookies, cookie_file)
+            cookie_store.save(self.cookies_name, self.session)
             logger.debug("[IGC] Cookies saved successfully")
             return True
         except Exception as e:
@@ -259,14 +494,13 @@ class IGCScraper:
         """Verify if current session is logged in"""
         try:
             # Try to access a page that requires login
-            response = self.session.get(f"{self.base_url}/account", headers=self.headers)
+            response = decode_response(SUPPLIER, self.session.get(f"{self.base_url}/account", headers=self.headers))
             
             # Check if we're still logged in
             if "login" not in response.url.lower() and response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                customer_info = soup.find('div', id='customer-info')
-                if customer_info:
+                if is_logged_in_page(response.text):
                     self.logged_in = True
+                    cookie_store.mark_validated(self.cookies_name)
                     logger.debug("[IGC] Session verified as logged in")
                     return True
             
@@ -279,64 +513,8 @@ class IGCScraper:
             return False
     
     def _parse_search_results(self, html_content):
-        """
-        Parse the search results page HTML
-        
-        Args:
-            html_content: HTML content of the search results page
-        
-        Returns:
-            List of dictionaries containing part information
-        """
-        search_results = []
-        
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            tables = soup.find_all('table')
-            
-            logger.debug(f"[IGC] Found {len(tables)} tables on the search results page")
-            
-            for table_idx, table in enumerate(tables):
-                category = "Unknown"
-                prev = table.find_previous('h4')
-                if prev:
-                    category = prev.get_text(strip=True)
-                    logger.debug(f"[IGC] Table {table_idx+1} category: {category}")
-                
-                rows = table.find_all('tr')
-                logger.debug(f"[IGC] Table {table_idx+1} has {len(rows)} rows")
-                
-                for row_idx, row in enumerate(rows):
-                    cells = row.find_all('td')
-                    if len(cells) < 3:
-                        continue
-                    
-                    part_link = cells[0].find('a')
-                    if not part_link:
-                        continue
-                    
-                    part_number = part_link.get_text(strip=True)
-                    part_url = part_link.get('href')
-                    if part_url and not part_url.startswith('http'):
-                        part_url = self.base_url + ('' if part_url.startswith('/') else '/') + part_url
-                    
-                    description = cells[1].get_text(strip=True)
-                    
-                    # Log the found part
-                    logger.debug(f"[IGC] Found part: {part_number}, Description: {description}")
-                    
-                    search_results.append({
-                        'part_number': part_number,
-                        'description': description,
-                        'category': category,
-                        'url': part_url
-                    })
-            
-            return search_results
-            
-        except Exception as e:
-            logger.error(f"[IGC] Error parsing search results: {str(e)}")
-            return []
+        """Parse the search results page HTML (see parse_search_results), in a parse worker for large pages"""
+        return parse_executor.run(parse_search_results, html_content, self.base_url)
     
     def _fetch_detail_page(self, url):
         """
@@ -349,7 +527,7 @@ class IGCScraper:
             HTML content of the page or None if failed
         """
         try:
-            response = self.session.get(url, headers=self.headers)
+            response = decode_response(SUPPLIER, self.session.get(url, headers=self.headers))
             if response.status_code == 200:
                 return response.text
             else:
@@ -360,84 +538,10 @@ class IGCScraper:
             return None
     
     def _parse_detail_page(self, html_content, part_info):
-        """
-        Parse part detail page and extract data
-        
-        Args:
-            html_content: HTML content of the detail page
-            part_info: Original part dictionary
-            
-        Returns:
-            List with part details or None if not found/not in Opa-Locka
-        """
+        """Parse part detail page and extract data (see parse_detail_page), in a parse worker for large pages"""
         if not html_content:
             return None
-        
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Find warehouse location
-            location = "Unknown"
-            location_elements = soup.find_all('b')
-            for element in location_elements:
-                text = element.get_text()
-                if "Locka" in text or "Warehouse" in text:
-                    location = text
-                    break
-            
-            # If not in Opa-Locka, we might not want to include this part
-            if location != "Unknown" and "Opa-Locka" not in location:
-                logger.debug(f"[IGC] Part {part_info['part_number']} not available in Opa-Locka")
-                return None
-            
-            # Find price and availability in tables
-            tables = soup.find_all('table')
-            if not tables:
-                return None
-            
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) < 5:
-                        continue
-                    
-                    # Check if this row is for our part
-                    row_part_number = cells[0].get_text(strip=True)
-                    if part_info['part_number'] not in row_part_number:
-                        continue
-                    
-                    # Extract price
-                    price = "Unknown"
-                    for i in range(2, min(5, len(cells))):
-                        price_elements = cells[i].find_all('b')
-                        for p_elem in price_elements:
-                            price_text = p_elem.get_text(strip=True)
-                            if "$" in price_text or any(c.isdigit() for c in price_text):
-                                price = price_text
-                                break
-                    
-                    # Extract availability
-                    availability = "No"
-                    for cell in cells:
-                        cell_text = cell.get_text()
-                        if "In Stock" in cell_text:
-                            availability = "Yes"
-                            break
-                    
-                    # Return the part details
-                    return [
-                        part_info["part_number"],
-                        availability,
-                        price,
-                        location
-                    ]
-            
-            return None
-            
-        except Exception as e:
-            logger.warning(f"[IGC] Error parsing detail page for {part_info['part_number']}: {str(e)}")
-            return [part_info["part_number"], "Unknown", "Unknown", "Unknown"]
+        return parse_executor.run(parse_detail_page, html_content, part_info)
     
     def _process_part_details(self, part_info):
         """
@@ -509,15 +613,7 @@ class IGCScraper:
             logger.info(f"[IGC] Processed {len(results)}/{len(search_results)} parts in {elapsed:.2f} seconds")
             
             # Format results for return
-            formatted_results = []
-            for r in results:
-                formatted_results.append({
-                    "part_number": r[0],
-                    "availability": r[1],
-                    "price": r[2],
-                    "location": r[3],
-                    "supplier": "Import Glass Corp"
-                })
+            formatted_results = format_part_details(results)
             
             return {
                 "success": True,
@@ -1,15 +1,213 @@
 # scrapers/mygrant_scraper.py
 import requests
-from bs4 import BeautifulSoup
 import time
 import re
 import logging
 import os
 from dotenv import load_dotenv
 
+from Scrapers.transport import new_session
+from Scrapers.html_parser import parse_html
+from Scrapers.parse_executor import parse_executor
+from Scrapers.response import decode_response
+from Scrapers.session_broker import create_broker, LoginFailed
+
 # Setup logger
 logger = logging.getLogger(__name__)
 
+# Site constants
+BASE_URL = "https://www.mygrantglass.com"
+LOGIN_URL = f"{BASE_URL}/pages/login.aspx"
+SEARCH_URL = f"{BASE_URL}/pages/search.aspx"
+
+# Headers for requests
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Connection": "keep-alive",
+    "Referer": "https://www.mygrantglass.com/"
+}
+
+# Supplier name for session pools and response decoding
+SUPPLIER = "Mygrant Glass"
+
+# Seconds a MyGrant login stays valid (ASP.NET session timeout)
+SESSION_TTL = 1200
+
+def build_login_form_data(html_content, username, password):
+    """
+    Build the login POST payload from the login page
+    
+    Args:
+        html_content: HTML content of the login page
+        username: Mygrant username
+        password: Mygrant password
+        
+    Returns:
+        Dictionary of form fields, or None if the login form is missing
+    """
+    soup = parse_html(html_content, only="forms")
+    form = soup.find('form')
+    
+    if not form:
+        return None
+        
+    # Extract form fields
+    form_data = {}
+    
+    # Add hidden fields
+    for hidden_input in form.find_all('input', type='hidden'):
+        if hidden_input.get('name') and hidden_input.get('value'):
+            form_data[hidden_input.get('name')] = hidden_input.get('value')
+    
+    # Find username field (using direct field names from your working code)
+    username_field = "clogin:TxtUsername"
+    password_field = "clogin:TxtPassword"
+    submit_button = "clogin:ButtonLogin"
+    
+    # Add credentials to form data
+    form_data[username_field] = username
+    form_data[password_field] = password
+    form_data[submit_button] = "Login"
+    
+    return form_data
+
+def find_login_error(html_content):
+    """Return the error message shown on a failed login page, or None"""
+    error_soup = parse_html(html_content)
+    error_elements = error_soup.find_all(class_=lambda x: x and ('error' in x or 'alert' in x))
+    
+    if error_elements:
+        return error_elements[0].get_text().strip()
+    return None
+
+def parse_search_results(html_content, partNo, logger=logger):
+    """
+    Extract parts from a search results page
+    
+    Args:
+        html_content: HTML content of the search results page
+        partNo: The part number that was searched
+        logger: Logger instance
+        
+    Returns:
+        List of parts in the format [part_number, stock, price, location]
+    """
+    soup = parse_html(html_content, only="tables")
+    parts = []
+    
+    # Look for partnumber cells - using your working code approach
+    partnumber_cells = soup.find_all(class_='partnumber')
+    
+    if partnumber_cells:
+        logger.info(f"Found {len(partnumber_cells)} part cells")
+        
+        for cell in partnumber_cells:
+            # Find parent row
+            parent_row = cell.find_parent('tr')
+            if parent_row:
+                cells = parent_row.find_all('td')
+                
+                if len(cells) >= 3:
+                    # Part number from the partnumber cell
+                    part_link = cell.find('a')
+                    part_num = part_link.get_text().strip() if part_link else cell.get_text().strip()
+                    
+                    # Stock status (cell 1)
+                    stock_span = cells[1].find('span', class_=lambda x: x and 'stock_' in x)
+                    stock = stock_span.get_text().strip() if stock_span else cells[1].get_text().strip()
+                    
+                    # Price (cell 3)
+                    price = cells[3].get_text().strip() if len(cells) > 3 else "Unknown"
+                    
+                    # Add to parts list
+                    parts.append([
+                        part_num,
+                        stock,
+                        price,
+                        "Unknown"  # Location placeholder
+                    ])
+                    logger.info(f"Extracted part: {part_num}")
+    
+    # If no parts found but part number is in page
+    if not parts and partNo.lower() in html_content.lower():
+        logger.info(f"Part {partNo} found in page but could not extract structured data, using fallback")
+        parts.append([
+            partNo,
+            "Available - Check Store",
+            "Contact for Price",
+            "Unknown"
+        ])
+    
+    return parts
+
+def is_login_url(url):
+    """Check whether a response ended up on the login page (session expired)"""
+    return LOGIN_URL.lower() in url.lower()
+
+def login(session, logger=logger):
+    """
+    Log a session in to MyGrant
+    
+    Args:
+        session: requests session to log in
+        logger: Logger instance
+        
+    Returns:
+        True if the login form was accepted
+    """
+    load_dotenv()
+    username = os.getenv('MYGRANT_USER')
+    password = os.getenv('MYGRANT_PASS')
+    
+    if not username or not password:
+        logger.error("Missing Mygrant credentials in environment variables")
+        return False
+    
+    logger.info("Logging in to MyGrant")
+    
+    # Get the login page to extract form tokens
+    response = decode_response(SUPPLIER, session.get(LOGIN_URL, headers=HEADERS))
+    
+    if response.status_code != 200:
+        logger.error(f"Failed to get login page. Status code: {response.status_code}")
+        return False
+        
+    # Parse the login page
+    form_data = build_login_form_data(response.text, username, password)
+    
+    if form_data is None:
+        logger.error("Could not find login form on page")
+        return False
+    
+    # Set headers for login POST
+    post_headers = HEADERS.copy()
+    post_headers["Content-Type"] = "application/x-www-form-urlencoded"
+    post_headers["Referer"] = LOGIN_URL
+    
+    # Submit login form
+    login_response = decode_response(SUPPLIER, session.post(
+        LOGIN_URL,
+        data=form_data,
+        headers=post_headers,
+        allow_redirects=True
+    ))
+    
+    # Check if login was successful
+    if login_response.url == LOGIN_URL:
+        # Check for error messages
+        error_msg = find_login_error(login_response.text)
+        
+        if error_msg:
+            logger.error(f"Login failed: {error_msg}")
+            return False
+    
+    return True
+
+# Logged-in sessions shared by all searches in this process, refreshed before SESSION_TTL runs out
+broker = create_broker(SUPPLIER, login, new_session, ttl=SESSION_TTL)
+
 def MyGrantScraper(partNo, driver=None, logger=logger):
     """
     Scrape part information from MyGrant website using requests
@@ -34,101 +232,38 @@ def MyGrantScraper(partNo, driver=None, logger=logger):
     start_time = time.time()
     max_retries = 2
     retry_count = 0
-    base_url = "https://www.mygrantglass.com"
-    login_url = f"{base_url}/pages/login.aspx"
-    search_url = f"{base_url}/pages/search.aspx"
-    
-    # Headers for requests
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Connection": "keep-alive",
-        "Referer": "https://www.mygrantglass.com/"
-    }
-    
-    # Create session to maintain cookies
-    session = requests.Session()
+    search_url = SEARCH_URL
+    headers = HEADERS
     
     while retry_count < max_retries:
         try:
             logger.info(f"[Mygrant] Searching for part number: {partNo}")
             
-            # Step 1: Login
-            logger.info("Logging in to MyGrant")
-            
-            # Get the login page to extract form tokens
-            response = session.get(login_url, headers=headers)
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to get login page. Status code: {response.status_code}")
-                retry_count += 1
-                continue
+            # Lease a logged-in session (connections come from the shared pool)
+            with broker.lease() as lease:
+                session = lease.session
                 
-            # Parse the login page
-            soup = BeautifulSoup(response.text, 'html.parser')
-            form = soup.find('form')
-            
-            if not form:
-                logger.error("Could not find login form on page")
-                retry_count += 1
-                continue
+                # Search for part - use direct GET query like your working code
+                search_url_with_query = f"{search_url}?q={partNo}&do=Search"
                 
-            # Extract form fields
-            form_data = {}
-            
-            # Add hidden fields
-            for hidden_input in form.find_all('input', type='hidden'):
-                if hidden_input.get('name') and hidden_input.get('value'):
-                    form_data[hidden_input.get('name')] = hidden_input.get('value')
-            
-            # Find username field (using direct field names from your working code)
-            username_field = "clogin:TxtUsername"
-            password_field = "clogin:TxtPassword"
-            submit_button = "clogin:ButtonLogin"
-            
-            # Add credentials to form data
-            form_data[username_field] = username
-            form_data[password_field] = password
-            form_data[submit_button] = "Login"
-            
-            # Set headers for login POST
-            post_headers = headers.copy()
-            post_headers["Content-Type"] = "application/x-www-form-urlencoded"
-            post_headers["Referer"] = login_url
-            
-            # Submit login form
-            login_response = session.post(
-                login_url,
-                data=form_data,
-                headers=post_headers,
-                allow_redirects=True
-            )
-            
-            # Check if login was successful
-            if login_response.url == login_url:
-                # Check for error messages
-                error_soup = BeautifulSoup(login_response.text, 'html.parser')
-                error_elements = error_soup.find_all(class_=lambda x: x and ('error' in x or 'alert' in x))
+                # Submit search request
+                search_response = decode_response(SUPPLIER, session.get(
+                    search_url_with_query,
+                    headers=headers,
+                    allow_redirects=True
+                ))
                 
-                if error_elements:
-                    error_msg = error_elements[0].get_text().strip()
-                    logger.error(f"Login failed: {error_msg}")
-                    retry_count += 1
-                    continue
-            
-            login_time = time.time() - start_time
-            logger.info(f"[Mygrant] Login successful in {login_time:.2f} seconds!")
-            
-            # Step 2: Search for part - use direct GET query like your working code
-            search_url_with_query = f"{search_url}?q={partNo}&do=Search"
-            
-            # Submit search request
-            search_response = session.get(
-                search_url_with_query,
-                headers=headers,
-                allow_redirects=True
-            )
+                # The session expired on the site - log it in again and repeat the search
+                if is_login_url(search_response.url):
+                    logger.info("[Mygrant] Session expired, logging in again")
+                    if not lease.relogin():
+                        retry_count += 1
+                        continue
+                    search_response = decode_response(SUPPLIER, session.get(
+                        search_url_with_query,
+                        headers=headers,
+                        allow_redirects=True
+                    ))
             
             # Check for HTTP errors
             if search_response.status_code != 200:
@@ -137,57 +272,17 @@ def MyGrantScraper(partNo, driver=None, logger=logger):
                 continue
             
             # Parse search results
-            soup = BeautifulSoup(search_response.text, 'html.parser')
-            parts = []
-            
-            # Look for partnumber cells - using your working code approach
-            partnumber_cells = soup.find_all(class_='partnumber')
-            
-            if partnumber_cells:
-                logger.info(f"Found {len(partnumber_cells)} part cells")
-                
-                for cell in partnumber_cells:
-                    # Find parent row
-                    parent_row = cell.find_parent('tr')
-                    if parent_row:
-                        cells = parent_row.find_all('td')
-                        
-                        if len(cells) >= 3:
-                            # Part number from the partnumber cell
-                            part_link = cell.find('a')
-                            part_num = part_link.get_text().strip() if part_link else cell.get_text().strip()
-                            
-                            # Stock status (cell 1)
-                            stock_span = cells[1].find('span', class_=lambda x: x and 'stock_' in x)
-                            stock = stock_span.get_text().strip() if stock_span else cells[1].get_text().strip()
-                            
-                            # Price (cell 3)
-                            price = cells[3].get_text().strip() if len(cells) > 3 else "Unknown"
-                            
-                            # Add to parts list
-                            parts.append([
-                                part_num,
-                                stock,
-                                price,
-                                "Unknown"  # Location placeholder
-                            ])
-                            logger.info(f"Extracted part: {part_num}")
-            
-            # If no parts found but part number is in page
-            if not parts and partNo.lower() in search_response.text.lower():
-                logger.info(f"Part {partNo} found in page but could not extract structured data, using fallback")
-                parts.append([
-                    partNo,
-                    "Available - Check Store",
-                    "Contact for Price",
-                    "Unknown"
-                ])
+            parts = parse_executor.run(parse_search_results, search_response, partNo, logger)
             
             # Return results
             elapsed = time.time() - start_time
             logger.info(f"[Mygrant] Search completed in {elapsed:.2f}s, found {len(parts)} results")
             return parts
             
+        except LoginFailed as e:
+            logger.error(f"Login failed: {e}")
+            retry_count += 1
+            
         except requests.RequestException as e:
             logger.error(f"Connection error: {e}")
             retry_count += 1
@@ -0,0 +1,163 @@
+# scrapers/parse_executor.py
+# Opt-in process pool for CPU-bound result extraction, so parsing doesn't hold the web workers' GIL
+#
+# The scrapers hand a response body and a module-level extraction function to
+# run(). Large bodies are shipped to a worker process as UTF-8 bytes, parsed
+# there, and only the extracted records (lists and dictionaries) come back.
+# Small bodies, or every body when the pool is disabled, are parsed inline.
+
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from Scrapers.response import SupplierResponse
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+def _init_worker(level):
+    # Spawned workers start without the app's logging setup
+    logging.basicConfig(level=level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def _run_in_worker(func, body, encoding, args):
+    return func(body.decode(encoding, errors='replace'), *args)
+
+
+class ParseExecutor:
+    def __init__(self, workers=0, inline_below=16384, timeout=30):
+        """
+        Initialize the executor
+
+        Args:
+            workers: Worker processes, 0 parses everything inline
+            inline_below: Bodies smaller than this many bytes are parsed inline (shipping costs more)
+            timeout: Seconds to wait for a worker before parsing inline instead
+        """
+        self.workers = workers
+        self.inline_below = inline_below
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+
+        # Counters for stats()
+        self._inline = 0
+        self._offloaded = 0
+        self._fallbacks = 0
+
+    def configure(self, workers=None, inline_below=None, timeout=None):
+        """Change pool settings - a running pool is shut down and restarted on next use"""
+        with self._lock:
+            if workers is not None:
+                self.workers = workers
+            if inline_below is not None:
+                self.inline_below = inline_below
+            if timeout is not None:
+                self.timeout = timeout
+            self._shutdown()
+
+    def run(self, func, body, *args, encoding=None):
+        """
+        Run an extraction function on a response body
+
+        Args:
+            func: Module-level function taking the page text followed by args
+            body: Page content as text, bytes in the given encoding, or a SupplierResponse
+            *args: Further arguments for func (must be picklable)
+            encoding: Encoding of a bytes body (UTF-8 if None)
+
+        Returns:
+            Whatever func returns
+        """
+        # A wrapped response goes to a worker as its raw body, which the worker decodes, and
+        # is parsed inline from its decoded text - either way the body is decoded once
+        response = body if isinstance(body, SupplierResponse) else None
+        size = len(response.content if response is not None else body)
+        pool = self._get_pool() if size >= self.inline_below else None
+
+        if pool is not None:
+            if response is not None:
+                payload, payload_encoding = response.content, response.charset
+            elif isinstance(body, str):
+                payload, payload_encoding = body.encode('utf-8'), 'utf-8'
+            else:
+                payload, payload_encoding = body, encoding or 'utf-8'
+
+            try:
+                future = pool.submit(_run_in_worker, func, payload, payload_encoding, args)
+                result = future.result(timeout=self.timeout)
+                with self._lock:
+                    self._offloaded += 1
+                return result
+            except TimeoutError:
+                future.cancel()
+                logger.warning(f"Parse worker took over {self.timeout}s for {func.__name__}, parsing inline")
+            except BrokenProcessPool:
+                logger.warning("Parse worker pool broke, restarting it on next use")
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+            except Exception as e:
+                logger.warning(f"Offloaded parse with {func.__name__} failed, parsing inline: {str(e)}")
+
+            with self._lock:
+                self._fallbacks += 1
+
+        with self._lock:
+            self._inline += 1
+        if response is not None:
+            body = response.text
+        elif not isinstance(body, str):
+            body = body.decode(encoding or 'utf-8', errors='replace')
+        return func(body, *args)
+
+    def stats(self):
+        """Return pool size and inline/offloaded counts"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "inline_below": self.inline_below,
+                "inline": self._inline,
+                "offloaded": self._offloaded,
+                "fallbacks": self._fallbacks,
+            }
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            self._shutdown()
+
+    def _get_pool(self):
+        if self.workers <= 0:
+            return None
+
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                # Spawned rather than forked: the pool starts lazily in a process that already runs
+                # scraper, writer and broker threads, and a forked child can inherit a lock one of them
+                # held (logging, SQLite, ...) and hang. Spawned children re-import the entry module as
+                # __mp_main__, so its startup work is guarded (see the end of main.py).
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(logging.getLogger().getEffectiveLevel(),)
+                )
+                self._pid = os.getpid()
+            return self._pool
+
+    def _shutdown(self):
+        # Caller holds the lock
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+
+# Process-wide executor used by the scrapers, disabled until configured with workers
+parse_executor = ParseExecutor()
@@ -2,58 +2,109 @@ import os
 import time
 import re
 import logging
+from bisect import bisect_right
+from functools import lru_cache
 from dotenv import load_dotenv
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
+from bs4 import NavigableString
 
-# Cache for login status to avoid unnecessary login attempts
-_pilkington_login_cache = {
-    'session': None,
-    'logged_in': False,
-    'timestamp': 0,
-    'expiry': 1800  # 30 minutes session validity
+from Scrapers.transport import new_session
+from Scrapers.html_parser import parse_html
+from Scrapers.parse_executor import parse_executor
+from Scrapers.response import decode_response
+from Scrapers.session_broker import create_broker, LoginFailed
+from Scrapers.hedging import create_hedger
+from Scrapers.strategy_stats import strategy_stats
+from Scrapers.default_parts import DefaultParts
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Supplier name for session pools and response decoding
+SUPPLIER = "Pilkington"
+
+# Seconds a Pilkington login stays valid
+SESSION_TTL = 1800
+
+# Seconds a search may take across all of its URL patterns
+SEARCH_DEADLINE = 10
+
+# Browser-like headers for every request
+SESSION_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Cache-Control': 'max-age=0',
 }
 
+SHOP_URL = 'https://shop.pilkington.com/'
+LOGIN_URL = 'https://identity.pilkington.com/identityexternal/login'
+
+def is_shop_url(url):
+    """Check whether a response landed on the shop rather than the identity login"""
+    return 'shop.pilkington.com' in url and 'login' not in url
+
+def has_signout_link(html_content):
+    """Check whether a shop page shows a Sign Out / Logout link"""
+    soup = parse_html(html_content, only="links")
+    signout_elements = soup.find_all('a', string=lambda s: s and ('Sign Out' in s or 'Logout' in s))
+    return bool(signout_elements)
+
+def build_login_request(html_content, login_url, username, password):
+    """
+    Build the identity login POST from the login page
+    
+    Returns:
+        Tuple of (action_url, login_data), or None if the page has no form
+    """
+    soup = parse_html(html_content, only="forms")
+    
+    # Extract form and any hidden fields
+    form = soup.find('form')
+    if not form:
+        return None
+    
+    # Get form action URL
+    action_url = form.get('action', login_url)
+    if not action_url.startswith('http'):
+        action_url = urljoin(login_url, action_url)
+    
+    # Prepare login data
+    login_data = {'username': username, 'password': password}
+    
+    # Add any hidden fields from the form
+    for hidden_field in form.find_all('input', type='hidden'):
+        field_name = hidden_field.get('name')
+        field_value = hidden_field.get('value', '')
+        if field_name:
+            login_data[field_name] = field_value
+    
+    # Check for terms checkbox
+    terms_checkbox = form.find('input', id='cbTerms')
+    if terms_checkbox:
+        login_data['cbTerms'] = 'on'
+    
+    return action_url, login_data
+
 def get_session():
-    """Get or create a requests session with proper headers"""
-    global _pilkington_login_cache
-    
-    # Return cached session if valid
-    current_time = time.time()
-    if (_pilkington_login_cache['session'] and 
-        _pilkington_login_cache['logged_in'] and 
-        current_time - _pilkington_login_cache['timestamp'] < _pilkington_login_cache['expiry']):
-        return _pilkington_login_cache['session']
-    
-    # Create new session with browser-like headers
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-        'Cache-Control': 'max-age=0',
-    })
-    
-    _pilkington_login_cache['session'] = session
-    return session
-
-def login(logger):
-    """Login to Pilkington website using requests with multiple approaches"""
-    global _pilkington_login_cache
-    
-    # Check if we already have a valid session
-    current_time = time.time()
-    if (_pilkington_login_cache['session'] and 
-        _pilkington_login_cache['logged_in'] and 
-        current_time - _pilkington_login_cache['timestamp'] < _pilkington_login_cache['expiry']):
-        logger.info("Using cached Pilkington login session")
-        return _pilkington_login_cache['session']
+    """Create a requests session with proper headers"""
+    # Browser-like headers on the shared connection pool
+    return new_session(SESSION_HEADERS)
+
+def login(session, logger=logger):
+    """
+    Log a session in to the Pilkington website, trying multiple approaches
     
+    Args:
+        session: requests session to log in
+        logger: Logger instance
+        
+    Returns:
+        True if the session can reach the shop
+    """
     logger.info("Logging in to Pilkington website")
-    session = get_session()
     
     # Load credentials
     load_dotenv()
@@ -62,59 +113,33 @@ def login(logger):
     
     if not username or not password:
         logger.error("Missing Pilkington credentials")
-        return None
+        return False
     
     try:
         # Approach 1: Check if we're already on shop page
         logger.info("Checking if already logged in")
-        shop_resp = session.get('https://shop.pilkington.com/', allow_redirects=True, timeout=10)
+        shop_resp = decode_response(SUPPLIER, session.get(SHOP_URL, allow_redirects=True, timeout=10))
         
         # If we're already on the shop page
-        if 'shop.pilkington.com' in shop_resp.url and 'login' not in shop_resp.url:
+        if is_shop_url(shop_resp.url):
             # Look for signout elements in the page
-            soup = BeautifulSoup(shop_resp.text, 'html.parser')
-            signout_elements = soup.find_all('a', string=lambda s: s and ('Sign Out' in s or 'Logout' in s))
-            
-            if signout_elements:
+            if has_signout_link(shop_resp.text):
                 logger.info("Already logged in")
-                _pilkington_login_cache['logged_in'] = True
-                _pilkington_login_cache['timestamp'] = current_time
-                return session
+                return True
         
         # Approach 2: Direct login
         logger.info("Proceeding with login")
-        login_url = 'https://identity.pilkington.com/identityexternal/login'
-        login_resp = session.get(login_url, timeout=10)
+        login_url = LOGIN_URL
+        login_resp = decode_response(SUPPLIER, session.get(login_url, timeout=10))
         
         # Parse the login page
-        soup = BeautifulSoup(login_resp.text, 'html.parser')
-        
-        # Extract form and any hidden fields
-        form = soup.find('form')
-        if not form:
+        login_request = build_login_request(login_resp.text, login_url, username, password)
+        if not login_request:
             logger.warning("Could not find login form")
             # Try direct access approaches
             return try_direct_access(session, logger)
         
-        # Get form action URL
-        action_url = form.get('action', login_url)
-        if not action_url.startswith('http'):
-            action_url = urljoin(login_url, action_url)
-        
-        # Prepare login data
-        login_data = {'username': username, 'password': password}
-        
-        # Add any hidden fields from the form
-        for hidden_field in form.find_all('input', type='hidden'):
-            field_name = hidden_field.get('name')
-            field_value = hidden_field.get('value', '')
-            if field_name:
-                login_data[field_name] = field_value
-        
-        # Check for terms checkbox
-        terms_checkbox = form.find('input', id='cbTerms')
-        if terms_checkbox:
-            login_data['cbTerms'] = 'on'
+        action_url, login_data = login_request
         
         # Submit login form
         logger.info("Submitting login form")
@@ -130,11 +155,9 @@ def login(logger):
         )
         
         # Check if login successful
-        if 'shop.pilkington.com' in login_submit.url and 'login' not in login_submit.url:
+        if is_shop_url(login_submit.url):
             logger.info("Login successful - redirected to shop")
-            _pilkington_login_cache['logged_in'] = True
-            _pilkington_login_cache['timestamp'] = current_time
-            return session
+            return True
         
         # Approach 3: Try direct access methods if login form didn't work
         return try_direct_access(session, logger)
@@ -144,10 +167,8 @@ def login(logger):
         # Try direct access as a last resort
         return try_direct_access(session, logger)
 
-def try_direct_access(session, logger):
+def try_direct_access(session, logger=logger):
     """Try various direct access approaches to bypass login"""
-    global _pilkington_login_cache
-    
     # Approach 1: Try direct navigation to search page
     try:
         logger.info("Trying direct navigation to bypass login")
@@ -157,9 +178,7 @@ def try_direct_access(session, logger):
         shop_check = session.get('https://shop.pilkington.com/ecomm/', timeout=10)
         if 'shop.pilkington.com' in shop_check.url and 'login' not in shop_check.url:
             logger.info("Direct navigation successful - bypassed login")
-            _pilkington_login_cache['logged_in'] = True
-            _pilkington_login_cache['timestamp'] = time.time()
-            return session
+            return True
     except:
         pass
     
@@ -169,16 +188,325 @@ def try_direct_access(session, logger):
         shop_check = session.get('https://shop.pilkington.com/ecomm/', timeout=10)
         if 'shop.pilkington.com' in shop_check.url and 'login' not in shop_check.url:
             logger.info("Final direct navigation successful")
-            _pilkington_login_cache['logged_in'] = True
-            _pilkington_login_cache['timestamp'] = time.time()
-            return session
+            return True
     except:
         pass
     
     # If all methods failed
     logger.error("Login failed - could not access shop after multiple attempts")
-    _pilkington_login_cache['logged_in'] = False
-    return None
+    return False
+
+# Logged-in sessions shared by all searches in this process, refreshed before SESSION_TTL runs out
+broker = create_broker(SUPPLIER, login, get_session, ttl=SESSION_TTL)
+
+# Search URLs are hedged, a search gives up after SEARCH_DEADLINE seconds
+hedger = create_hedger(SUPPLIER, deadline=SEARCH_DEADLINE)
+
+# Names of the search URL patterns and extraction methods, for strategy_stats
+SEARCH_METHODS = ["basic_search", "catalog_search", "results_search"]
+EXTRACTION_METHODS = ["specific", "table", "element", "best_guess"]
+
+def build_search_urls(partNo):
+    """Search URL patterns to try, in order (named by SEARCH_METHODS)"""
+    return [
+        f'https://shop.pilkington.com/ecomm/search/basic/?queryType=2&query={partNo}&inRange=true&page=1&pageSize=30&sort=PopularityRankAsc',
+        f'https://shop.pilkington.com/ecomm/catalog/search?term={partNo}',
+        f'https://shop.pilkington.com/ecomm/search/results?q={partNo}'
+    ]
+
+def build_default_parts(partNo):
+    """Default parts to return if all methods fail"""
+    return DefaultParts([
+        [f"P{partNo}", f"Pilkington OEM Equivalent - Part #{partNo}", "$225.99", "Newark, OH", "Not Found"],
+        [f"AFG{partNo}", f"Aftermarket Glass - Part #{partNo}", "$175.50", "Columbus, OH", "Not Found"],
+        [f"LOF{partNo}", f"LOF Premium Series - Part #{partNo}", "$189.75", "Toledo, OH", "Not Found"]
+    ])
+
+def extract_location(soup):
+    """Extract the branch location shown in the shop header"""
+    location = "Unknown"
+    location_elements = soup.select("span.b2btext")
+    for element in location_elements:
+        location_text = element.text.strip()
+        if "Miami, FL" in location_text or "Newark, OH" in location_text or any(state in location_text for state in ["FL", "OH", "PA", "CA", "TX"]):
+            location = location_text.split("for ")[-1].strip() if "for " in location_text else location_text
+            break
+    return location
+
+# Price as shown in search results, "123.45 USD" or "$123.45"
+PRICE_PATTERN = re.compile(r'(\d+\.\d+)\s*USD|\$(\d+\.\d+)')
+
+# Description following a part number - up to a price or the next tag in raw HTML,
+# up to a price or the end in element text
+HTML_DESCRIPTION_PATTERN = re.compile(r'(.*?)(?:\d+\.\d+\s*USD|\$\d+\.\d+|<)', re.DOTALL)
+TEXT_DESCRIPTION_PATTERN = re.compile(r'(.*?)(?:\d+\.\d+\s*USD|\$\d+\.\d+|$)', re.DOTALL)
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+class PartPatterns:
+    """Compiled patterns for one searched part number"""
+
+    def __init__(self, partNo):
+        # Parts like "DW02000 GTY" that appear in the data
+        self.specific = re.compile(rf'([DFB]W0*{partNo}\s+[A-Z]+)', re.IGNORECASE)
+        
+        # Part number within a table cell
+        self.table_cell = re.compile(rf'([DFB]W0*{partNo}\s*[A-Z]*)', re.IGNORECASE)
+        
+        # Potential part numbers anywhere in the page
+        self.potential = [
+            re.compile(rf'DW0*{partNo}\s*[A-Z]*', re.IGNORECASE),  # DW2000 GTY format
+            re.compile(rf'FW0*{partNo}\s*[A-Z]*', re.IGNORECASE),  # FW2000 format
+            re.compile(rf'BW0*{partNo}\s*[A-Z]*', re.IGNORECASE),  # BW2000 format
+            re.compile(rf'DB0*{partNo}\s*[A-Z]*', re.IGNORECASE),  # DB2000 format
+            re.compile(rf'FB0*{partNo}\s*[A-Z]*', re.IGNORECASE),  # FB2000 format
+            re.compile(rf'[A-Z]{{1,2}}0*{partNo}', re.IGNORECASE),  # General format
+        ]
+        
+        # Text containing any potential part number
+        self.any_potential = re.compile('|'.join(f'(?:{pattern.pattern})' for pattern in self.potential), re.IGNORECASE)
+
+@lru_cache(maxsize=256)
+def part_patterns(partNo):
+    """Patterns for a part number, compiled once and reused by every search for it"""
+    return PartPatterns(partNo)
+
+def format_price(price_match, default):
+    return f"${price_match.group(1) or price_match.group(2)}" if price_match else default
+
+def extract_specific_parts(page_text, patterns, location, logger):
+    """Method 1: parts like "DW02000 GTY" with the description and price that follow them in the HTML"""
+    matches = patterns.specific.findall(page_text)
+    if not matches:
+        return []
+    
+    logger.info(f"Found specific part matches: {matches}")
+    
+    # A part number matched more than once is described from its first occurrence each time
+    extracted = {}
+    parts = []
+    for part_num in matches:
+        if part_num not in extracted:
+            part_idx = page_text.find(part_num)
+            if part_idx < 0:
+                extracted[part_num] = None
+            else:
+                # Search the context around the part number in place instead of slicing it out
+                context_start = max(0, part_idx - 10)
+                context_end = min(len(page_text), part_idx + 500)
+                
+                desc_match = HTML_DESCRIPTION_PATTERN.match(page_text, part_idx + len(part_num), context_end)
+                description = desc_match.group(1).strip() if desc_match else "Auto Glass"
+                description = WHITESPACE_PATTERN.sub(' ', description)
+                
+                price = format_price(PRICE_PATTERN.search(page_text, context_start, context_end), "Call for Price")
+                extracted[part_num] = [part_num, description, price, location, "Found"]
+        
+        if extracted[part_num] is not None:
+            parts.append(list(extracted[part_num]))
+            logger.info(f"Extracted part: {part_num}")
+    
+    return parts
+
+def extract_table_parts(soup, partNo, patterns, location, logger):
+    """Method 2: product listings in table rows"""
+    parts = []
+    for row in soup.find_all("tr"):
+        # Check if this row contains our part number
+        row_text = row.text.strip()
+        if partNo not in row_text:
+            continue
+        
+        cells = row.find_all("td")
+        if len(cells) < 2:
+            continue
+        
+        part_cell = cells[0].text.strip()
+        desc_cell = cells[1].text.strip()
+        
+        part_match = patterns.table_cell.search(part_cell)
+        part_number = part_match.group(1) if part_match else part_cell
+        
+        # Price from the first cell showing one
+        price = "Call for Price"
+        for cell in cells:
+            price_match = PRICE_PATTERN.search(cell.text)
+            if price_match:
+                price = format_price(price_match, price)
+                break
+        
+        parts.append([part_number, desc_cell or "Auto Glass", price, location, "Found"])
+        logger.info(f"Found part in table: {part_number}")
+    
+    return parts
+
+def extract_element_parts(page_text, soup, patterns, location, logger):
+    """Method 3: potential part numbers in divs/spans, described from the surrounding element text"""
+    potential_part_numbers = []
+    for pattern in patterns.potential:
+        potential_part_numbers.extend(pattern.findall(page_text))
+    
+    if not potential_part_numbers:
+        return []
+    
+    logger.info(f"Found potential part numbers: {potential_part_numbers}")
+    
+    # Repeats of a part number can only produce parts already extracted for its first occurrence
+    candidates = {}
+    for part_num in potential_part_numbers:
+        if part_num not in candidates:
+            candidates[part_num] = re.compile(re.escape(part_num), re.IGNORECASE)
+    
+    # One pass over the text nodes keeps those containing a potential part number - any node
+    # containing a candidate does. They are joined with a separator no part number contains,
+    # so each candidate finds its elements in one scan of the joined text instead of a search
+    # of the whole soup.
+    nodes = [node for node in soup.descendants if isinstance(node, NavigableString) and patterns.any_potential.search(node)]
+    starts = []
+    offset = 0
+    for node in nodes:
+        starts.append(offset)
+        offset += len(node) + 1
+    joined = '\x00'.join(nodes)
+    
+    elements_by_part = {}
+    for part_num, pattern in candidates.items():
+        elements = elements_by_part[part_num] = []
+        last_idx = -1
+        for match in pattern.finditer(joined):
+            node_idx = bisect_right(starts, match.start()) - 1
+            if node_idx != last_idx:
+                elements.append(nodes[node_idx])
+                last_idx = node_idx
+    
+    parts = []
+    seen = set()
+    containers = {}
+    for part_num, elements in elements_by_part.items():
+        for element in elements:
+            # Get parent element for context
+            parent = element.parent
+            if not parent:
+                continue
+            
+            # Get container - go up to 3 levels
+            container = parent
+            for _ in range(3):
+                if container.parent:
+                    container = container.parent
+            
+            # Neighbouring elements usually share a container, get its text and price once
+            cached = containers.get(id(container))
+            if cached is None:
+                container_text = container.text.strip()
+                price = format_price(PRICE_PATTERN.search(container_text), "Call for Price")
+                cached = containers[id(container)] = (container_text, price)
+            container_text, price = cached
+            
+            part_idx = container_text.find(part_num)
+            if part_idx >= 0:
+                desc_match = TEXT_DESCRIPTION_PATTERN.match(container_text, part_idx + len(part_num))
+                description = WHITESPACE_PATTERN.sub(' ', desc_match.group(1).strip())
+            else:
+                description = "Auto Glass"
+            
+            # Add part to list - avoid duplicates
+            key = (part_num, description, price)
+            if key not in seen:
+                seen.add(key)
+                parts.append([part_num, description, price, location, "Found"])
+                logger.info(f"Extracted part from element: {part_num}")
+    
+    return parts
+
+def best_guess_parts(page_text, partNo, location, logger):
+    """Method 4: the part number is on the page but nothing structured was found"""
+    if partNo not in page_text:
+        return []
+    
+    logger.info(f"Part number {partNo} found in page but structured extraction failed, building best guess")
+    
+    # Try to find a full part number with prefix
+    parts = []
+    for prefix in ["DW", "FW", "BW"]:
+        full_part = f"{prefix}{partNo}"
+        part_idx = page_text.find(full_part)
+        if part_idx >= 0:
+            # Look for prices near this part
+            price = format_price(PRICE_PATTERN.search(page_text, part_idx, part_idx + 500), "$149.99")
+            
+            parts.append([
+                full_part,
+                f"Auto Glass Part #{full_part}",
+                price,
+                location,
+                "Found (partial data)"
+            ])
+            logger.info(f"Created best guess part: {full_part}")
+    
+    if parts:
+        return parts
+    
+    # If no specific parts found, return a generic entry
+    logger.info(f"Created generic part: PG{partNo}")
+    return [[
+        f"PG{partNo}",
+        f"Pilkington Auto Glass Part #{partNo}",
+        "$Call for Price",
+        location,
+        "Found (minimal data)"
+    ]]
+
+def extract_parts_using(page_text, partNo, logger, methods=EXTRACTION_METHODS):
+    """
+    Extract parts from a Pilkington search results page with the given methods
+    
+    Args:
+        page_text: HTML content of the search results page
+        partNo: The part number that was searched
+        logger: Logger instance
+        methods: Names from EXTRACTION_METHODS, tried in order until one finds parts
+        
+    Returns:
+        Tuple of (parts, names of the methods tried) - the last one tried found the parts, if any
+    """
+    patterns = part_patterns(partNo)
+    
+    # Parse the search results page
+    soup = parse_html(page_text)
+    location = extract_location(soup)
+    
+    extractors = {
+        "specific": lambda: extract_specific_parts(page_text, patterns, location, logger),
+        "table": lambda: extract_table_parts(soup, partNo, patterns, location, logger),
+        "element": lambda: extract_element_parts(page_text, soup, patterns, location, logger),
+        "best_guess": lambda: best_guess_parts(page_text, partNo, location, logger),
+    }
+    
+    tried = []
+    for method in methods:
+        tried.append(method)
+        parts = extractors[method]()
+        if parts:
+            return parts, tried
+    return [], tried
+
+def extract_parts(page_text, partNo, logger):
+    """
+    Extract parts from a Pilkington search results page
+    
+    Tries the extraction methods in order and returns the first non-empty result.
+    
+    Args:
+        page_text: HTML content of the search results page
+        partNo: The part number that was searched
+        logger: Logger instance
+        
+    Returns:
+        List of parts in the format [part_number, description, price, location, status],
+        empty if the part is not on the page
+    """
+    return extract_parts_using(page_text, partNo, logger)[0]
 
 def PilkingtonScraper(partNo, logger=None):
     """Request-based scraper for Pilkington with better structure parsing"""
@@ -191,272 +519,84 @@ def PilkingtonScraper(partNo, logger=None):
         handler.setFormatter(formatter)
         logger.addHandler(handler)
     
-    max_retries = 2
-    retry_count = 0
     start_time = time.time()
 
     # Default parts to return if all methods fail
-    default_parts = [
-        [f"P{partNo}", f"Pilkington OEM Equivalent - Part #{partNo}", "$225.99", "Newark, OH", "Not Found"],
-        [f"AFG{partNo}", f"Aftermarket Glass - Part #{partNo}", "$175.50", "Columbus, OH", "Not Found"],
-        [f"LOF{partNo}", f"LOF Premium Series - Part #{partNo}", "$189.75", "Toledo, OH", "Not Found"]
-    ]
+    default_parts = build_default_parts(partNo)
 
-    while retry_count < max_retries:
-        try:
-            # Get session with login
-            session = login(logger)
-            if not session:
-                logger.error("Could not log in, returning default Pilkington data")
-                return default_parts
+    def search_url(url_idx, url, primary):
+        """One hedged attempt: search one URL pattern, returning its parts (or None)"""
+        def attempt(hedge):
+            # Attempts run side by side and can outlive the hedged run, so each one leases its
+            # own session and hands it back when it is done. Alternates only take a free session,
+            # they don't log in an extra one just to hedge.
+            try:
+                with broker.lease(timeout=hedge.remaining(), overflow=primary) as lease:
+                    if hedge.cancelled.is_set():
+                        return None
+                    return search(lease, hedge)
+            except LoginFailed as e:
+                logger.error(f"No Pilkington session for URL {url_idx+1}: {e}")
+                return None
+        
+        def search(lease, hedge):
+            logger.info(f"Searching part in Pilkington (Method {url_idx+1}): {partNo}")
+            session = lease.session
             
-            # Try different search URL patterns
-            urls = [
-                f'https://shop.pilkington.com/ecomm/search/basic/?queryType=2&query={partNo}&inRange=true&page=1&pageSize=30&sort=PopularityRankAsc',
-                f'https://shop.pilkington.com/ecomm/catalog/search?term={partNo}',
-                f'https://shop.pilkington.com/ecomm/search/results?q={partNo}'
-            ]
+            # Make search request
+            search_resp = decode_response(SUPPLIER, session.get(url, timeout=hedge.timeout(15)))
+            if hedge.cancelled.is_set():
+                return None
             
-            for url_idx, url in enumerate(urls):
-                logger.info(f"Searching part in Pilkington (Method {url_idx+1}): {partNo}")
-                
-                # Make search request
-                search_resp = session.get(url, timeout=15)
-                
-                # Check if need to login again
-                if 'identity.pilkington.com/identityexternal/login' in search_resp.url:
-                    logger.info("Login required")
-                    session = login(logger)
-                    if not session:
-                        logger.error("Could not log in, trying next URL")
-                        continue
-                    
-                    # Try search again
-                    search_resp = session.get(url, timeout=15)
-                
-                # Quick check if we're on the correct page
-                if 'shop.pilkington.com' not in search_resp.url:
-                    logger.warning(f"Not on Pilkington shop page for URL {url_idx+1}, trying next URL")
-                    continue
-                
-                # Initialize parts array
-                parts = []
-                
-                # Parse the search results page
-                soup = BeautifulSoup(search_resp.text, 'html.parser')
-                
-                # Extract location
-                location = "Unknown"
-                location_elements = soup.select("span.b2btext")
-                for element in location_elements:
-                    location_text = element.text.strip()
-                    if "Miami, FL" in location_text or "Newark, OH" in location_text or any(state in location_text for state in ["FL", "OH", "PA", "CA", "TX"]):
-                        location = location_text.split("for ")[-1].strip() if "for " in location_text else location_text
-                        break
-                
-                # Special pattern for parts like "DW02000 GTY" that appear in the data
-                specific_part_pattern = re.compile(rf'([DFB]W0*{partNo}\s+[A-Z]+)', re.IGNORECASE)
-                matches = specific_part_pattern.findall(search_resp.text)
-                
-                if matches:
-                    logger.info(f"Found specific part matches: {matches}")
-                    
-                    # For each matched part number
-                    for part_num in matches:
-                        # Try to find the full part listing in the page
-                        part_idx = search_resp.text.find(part_num)
-                        if part_idx >= 0:
-                            # Extract some context after the part number for description and price
-                            context_start = max(0, part_idx - 10)
-                            context_end = min(len(search_resp.text), part_idx + 500)
-                            context = search_resp.text[context_start:context_end]
-                            
-                            # Look for description
-                            desc_match = re.search(rf'{re.escape(part_num)}(.*?)(?:\d+\.\d+\s*USD|\$\d+\.\d+|<)', context, re.DOTALL)
-                            description = desc_match.group(1).strip() if desc_match else "Auto Glass"
-                            
-                            # Clean up description
-                            description = re.sub(r'\s+', ' ', description)
-                            
-                            # Look for price
-                            price_match = re.search(r'(\d+\.\d+)\s*USD|\$(\d+\.\d+)', context)
-                            price = f"${price_match.group(1) or price_match.group(2)}" if price_match else "Call for Price"
-                            
-                            parts.append([
-                                part_num,
-                                description,
-                                price,
-                                location,
-                                "Found"
-                            ])
-                            logger.info(f"Extracted part: {part_num}")
-                    
-                    # If we found parts, return them
-                    if parts:
-                        logger.info(f"Pilkington scraper completed in {time.time() - start_time:.2f} seconds")
-                        return parts
-                
-                # Method 2: Look for product listings in a table format
-                rows = soup.select("tr")
-                for row in rows:
-                    # Check if this row contains our part number
-                    row_text = row.text.strip()
-                    if partNo in row_text:
-                        cells = row.find_all("td")
-                        if len(cells) >= 2:
-                            # Extract part info
-                            part_cell = cells[0].text.strip()
-                            desc_cell = cells[1].text.strip() if len(cells) > 1 else ""
-                            
-                            # Find the part number pattern within the cell
-                            part_match = re.search(rf'([DFB]W0*{partNo}\s*[A-Z]*)', part_cell, re.IGNORECASE)
-                            part_number = part_match.group(1) if part_match else part_cell
-                            
-                            # Extract price - look for price in any cell
-                            price = "Call for Price"
-                            for cell in cells:
-                                price_match = re.search(r'(\d+\.\d+)\s*USD|\$(\d+\.\d+)', cell.text)
-                                if price_match:
-                                    price = f"${price_match.group(1) or price_match.group(2)}"
-                                    break
-                            
-                            parts.append([
-                                part_number,
-                                desc_cell or "Auto Glass",
-                                price,
-                                location,
-                                "Found"
-                            ])
-                            logger.info(f"Found part in table: {part_number}")
+            # The session expired on the site - log it in again
+            if 'identity.pilkington.com/identityexternal/login' in search_resp.url:
+                logger.info("Login required")
+                if not lease.relogin():
+                    logger.error(f"Could not log in, giving up on URL {url_idx+1}")
+                    return None
                 
-                # If we found parts, return them
-                if parts:
-                    logger.info(f"Pilkington scraper completed in {time.time() - start_time:.2f} seconds")
-                    return parts
-                
-                # Method 3: Look for part data in divs/spans
-                # First, build a list of potential part numbers
-                potential_part_numbers = []
-                part_patterns = [
-                    rf'DW0*{partNo}\s*[A-Z]*',  # DW2000 GTY format
-                    rf'FW0*{partNo}\s*[A-Z]*',  # FW2000 format
-                    rf'BW0*{partNo}\s*[A-Z]*',  # BW2000 format
-                    rf'DB0*{partNo}\s*[A-Z]*',  # DB2000 format
-                    rf'FB0*{partNo}\s*[A-Z]*',  # FB2000 format
-                    rf'[A-Z]{{1,2}}0*{partNo}',  # General format
-                ]
-                
-                # Find all potential part numbers in the page
-                for pattern in part_patterns:
-                    matches = re.findall(pattern, search_resp.text, re.IGNORECASE)
-                    potential_part_numbers.extend(matches)
-                
-                if potential_part_numbers:
-                    logger.info(f"Found potential part numbers: {potential_part_numbers}")
-                    
-                    # For each potential part number, try to extract complete information
-                    for part_num in potential_part_numbers:
-                        # Look for elements containing this part number
-                        elements = soup.find_all(string=re.compile(re.escape(part_num), re.IGNORECASE))
-                        
-                        for element in elements:
-                            # Get parent element for context
-                            parent = element.parent
-                            if not parent:
-                                continue
-                            
-                            # Get container - go up a few levels
-                            container = parent
-                            for _ in range(3):  # Go up to 3 levels
-                                if container.parent:
-                                    container = container.parent
-                            
-                            # Extract container text
-                            container_text = container.text.strip()
-                            
-                            # Look for description
-                            desc_match = re.search(rf'{re.escape(str(part_num))}(.*?)(?:\d+\.\d+\s*USD|\$\d+\.\d+|$)', container_text, re.DOTALL)
-                            description = desc_match.group(1).strip() if desc_match else "Auto Glass"
-                            
-                            # Clean up description
-                            description = re.sub(r'\s+', ' ', description)
-                            
-                            # Look for price
-                            price_match = re.search(r'(\d+\.\d+)\s*USD|\$(\d+\.\d+)', container_text)
-                            price = f"${price_match.group(1) or price_match.group(2)}" if price_match else "Call for Price"
-                            
-                            # Add part to list - avoid duplicates
-                            part_data = [part_num, description, price, location, "Found"]
-                            if part_data not in parts:
-                                parts.append(part_data)
-                                logger.info(f"Extracted part from element: {part_num}")
-                    
-                    # If we found parts, return them
-                    if parts:
-                        logger.info(f"Pilkington scraper completed in {time.time() - start_time:.2f} seconds")
-                        return parts
-                
-                # Method 4: If all else fails but we see the part number, return a best guess
-                if partNo in search_resp.text:
-                    logger.info(f"Part number {partNo} found in page but structured extraction failed, building best guess")
-                    
-                    # Try to find a full part number with prefix
-                    for prefix in ["DW", "FW", "BW"]:
-                        full_part = f"{prefix}{partNo}"
-                        if full_part in search_resp.text:
-                            # Look for prices near this part
-                            price_context = search_resp.text[search_resp.text.find(full_part):search_resp.text.find(full_part) + 500]
-                            price_match = re.search(r'(\d+\.\d+)\s*USD|\$(\d+\.\d+)', price_context)
-                            price = f"${price_match.group(1) or price_match.group(2)}" if price_match else "$149.99"
-                            
-                            parts.append([
-                                full_part,
-                                f"Auto Glass Part #{full_part}",
-                                price,
-                                location,
-                                "Found (partial data)"
-                            ])
-                            logger.info(f"Created best guess part: {full_part}")
-                    
-                    # If we found any parts with prefixes, return them
-                    if parts:
-                        logger.info(f"Pilkington scraper completed in {time.time() - start_time:.2f} seconds")
-                        return parts
-                    
-                    # If no specific parts found, return a generic entry
-                    parts.append([
-                        f"PG{partNo}",
-                        f"Pilkington Auto Glass Part #{partNo}",
-                        "$Call for Price",
-                        location,
-                        "Found (minimal data)"
-                    ])
-                    logger.info(f"Created generic part: PG{partNo}")
-                    logger.info(f"Pilkington scraper completed in {time.time() - start_time:.2f} seconds")
-                    return parts
+                # Try search again
+                search_resp = decode_response(SUPPLIER, session.get(url, timeout=hedge.timeout(15)))
+                if hedge.cancelled.is_set():
+                    return None
             
-            # If we reach here, we couldn't find the part on any URL
-            retry_count += 1
+            # Quick check if we're on the correct page
+            if 'shop.pilkington.com' not in search_resp.url:
+                logger.warning(f"Not on Pilkington shop page for URL {url_idx+1}")
+                return None
             
-            if retry_count < max_retries:
-                logger.info(f"Retrying search (attempt {retry_count + 1}/{max_retries})")
-                time.sleep(1)  # Brief pause before retry
-            else:
-                logger.warning(f"No parts found for {partNo} after {max_retries} attempts, returning default parts")
-                logger.info(f"Pilkington scraper completed in {time.time() - start_time:.2f} seconds (default data)")
-                return default_parts
-                
-        except Exception as e:
-            logger.error(f"Error in Pilkington scraper (attempt {retry_count + 1}/{max_retries}): {e}")
-            retry_count += 1
+            # Parse the search results page, skipping extraction methods that stopped working
+            methods = strategy_stats.plan(SUPPLIER, "extraction", EXTRACTION_METHODS, reorder=False)
+            parts, tried = parse_executor.run(extract_parts_using, search_resp, partNo, logger, methods)
+            strategy_stats.record_fallbacks(SUPPLIER, "extraction", tried, bool(parts))
+            
+            # A cancelled attempt lost the race - that says nothing about its URL
+            if not hedge.cancelled.is_set():
+                strategy_stats.record(SUPPLIER, "url", SEARCH_METHODS[url_idx], bool(parts))
+            return parts
+        return attempt
+    
+    try:
+        # Best URL at once, the alternates when it runs late or comes back empty
+        urls = build_search_urls(partNo)
+        order = [SEARCH_METHODS.index(method)
+                 for method in strategy_stats.plan(SUPPLIER, "url", SEARCH_METHODS)]
+        parts = hedger.run([search_url(url_idx, urls[url_idx], primary=(position == 0))
+                            for position, url_idx in enumerate(order)])
+        
+        if parts:
+            logger.info(f"Pilkington scraper completed in {time.time() - start_time:.2f} seconds")
+            return parts
+        
+        logger.warning(f"No parts found for {partNo}, returning default parts")
+        logger.info(f"Pilkington scraper completed in {time.time() - start_time:.2f} seconds (default data)")
+        return default_parts
+    
+    except Exception as e:
+        logger.error(f"Error in Pilkington scraper: {e}")
+        logger.info(f"Pilkington scraper completed in {time.time() - start_time:.2f} seconds (default data)")
+        return default_parts
 
-            if retry_count < max_retries:
-                logger.info(f"Retrying... (attempt {retry_count + 1}/{max_retries})")
-                time.sleep(1)
-            else:
-                logger.error(f"Failed after {max_retries} attempts, returning default parts")
-                logger.info(f"Pilkington scraper completed in {time.time() - start_time:.2f} seconds (default data)")
-                return default_parts
 if __name__ == "__main__":
     # Set up logging
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -1,59 +1,447 @@
 import os
 import time
 import re
-import pickle
-import pathlib
-import requests
-from bs4 import BeautifulSoup
 import logging
 from dotenv import load_dotenv
 from requests.exceptions import RequestException
 
-# File path for storing cookies
-COOKIE_FILE = "pgw_cookies.pkl"
+from Scrapers.transport import new_session
+from Scrapers.html_parser import parse_html
+from Scrapers.parse_executor import parse_executor
+from Scrapers.response import decode_response
+from Scrapers.session_broker import create_broker, LoginFailed
+from Scrapers.cookie_store import cookie_store
+from Scrapers.form_cache import FormCache
+from Scrapers.strategy_stats import strategy_stats
+from Scrapers.default_parts import DefaultParts
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Name of the shared cookie store entry, and how old stored cookies may be (4 hours)
+COOKIE_NAME = "pgw_cookies"
+COOKIE_MAX_AGE = 14400
+
+# Site constants
+BASE_URL = 'https://buypgwautoglass.com'
+VERIFY_URL = 'https://buypgwautoglass.com/PartSearch/default.asp'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Supplier name for session pools and response decoding
+SUPPLIER = "PWG"
+
+# Seconds a PWG login stays valid
+SESSION_TTL = 14400
+
+# Seconds a parsed search form is reused before the form page is loaded again
+SEARCH_FORM_TTL = 300
+
+# Common headers for every request
+SESSION_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Try both search URLs to improve reliability
+SEARCH_URLS = [
+    'https://buypgwautoglass.com/PartSearch/search.asp?REG=&UserType=F&ShipToNo=85605&PB=544',
+    'https://buypgwautoglass.com/PartSearch/default.asp'
+]
+
+# Names of the search URLs and extraction methods, for strategy_stats
+SEARCH_METHODS = ["search_page", "default_page"]
+EXTRACTION_METHODS = ["tables", "elements", "regex"]
+
+def build_default_parts(partNo):
+    """Default parts to return if all else fails - this ensures we always return something"""
+    return DefaultParts([
+        [f"DW{partNo}", "In Stock", "$199.99", "Miami, FL", "Windshield - OEM Glass"],
+        [f"FW{partNo}", "In Stock", "$179.99", "Orlando, FL", "Windshield - Aftermarket Glass"],
+        [f"SD{partNo}", "Out of Stock", "$89.99", "Miami, FL", "Side Window - OEM Glass"],
+        [f"BD{partNo}", "Low Stock", "$119.99", "Tampa, FL", "Back Glass - OEM Equivalent"]
+    ])
+
+def build_login_request(html_content, username, password):
+    """
+    Build the login POST from the login page
+    
+    Returns:
+        Tuple of (login_url, login_data)
+    """
+    # Parse the login form to find any hidden fields or CSRF tokens
+    soup = parse_html(html_content, only="forms")
+    login_form = soup.find('form')
+    
+    # Prepare login data
+    login_data = {
+        'txtUsername': username,
+        'txtPassword': password,
+    }
+    
+    # Add any hidden fields from the form
+    if login_form:
+        for hidden_input in login_form.find_all('input', type='hidden'):
+            login_data[hidden_input.get('name')] = hidden_input.get('value')
+    
+    # Find the form action URL
+    form_action = login_form.get('action') if login_form else 'Default.asp'
+    login_url = 'https://buypgwautoglass.com/' + form_action.lstrip('/')
+    
+    return login_url, login_data
+
+def build_agreement_request(html_content):
+    """
+    Build the agreement POST from the terms page shown after login
+    
+    Returns:
+        Tuple of (agreement_url, agreement_data), or None if there is no agreement form
+    """
+    agreement_soup = parse_html(html_content, only="forms")
+    agreement_form = agreement_soup.find('form')
+    
+    if not agreement_form:
+        return None
+    
+    # Prepare agreement data
+    agreement_data = {}
+    
+    # Add any hidden fields from the form
+    for hidden_input in agreement_form.find_all('input', type='hidden'):
+        agreement_data[hidden_input.get('name')] = hidden_input.get('value')
+    
+    # Add the agreement button value
+    agreement_button = agreement_form.find('input', {'value': 'I Agree'})
+    if agreement_button:
+        agreement_data[agreement_button.get('name')] = agreement_button.get('value')
+    
+    # Find the form action URL
+    form_action = agreement_form.get('action')
+    agreement_url = 'https://buypgwautoglass.com/' + form_action.lstrip('/')
+    
+    return agreement_url, agreement_data
+
+def parse_search_form(html_content, url):
+    """
+    Parse the part search form into a template that can be reused for any part number
+    
+    Args:
+        html_content: HTML content of the search form page
+        url: URL the form page was loaded from
+        
+    Returns:
+        Tuple of (search_url, fields), or None if the page has no form. fields holds
+        every POST field in order, with None where the part number goes.
+    """
+    # Parse the search form
+    soup = parse_html(html_content, only="forms")
+    search_form = soup.find('form')
+    
+    if not search_form:
+        return None
+    
+    # Prepare search data
+    fields = {
+        'PartNo': None,
+        'PartTypeA': 'PartTypeA'  # Select Part Number radio button
+    }
+    
+    # Add any hidden fields from the form
+    for hidden_input in search_form.find_all('input', type='hidden'):
+        if hidden_input.get('name'):
+            fields[hidden_input.get('name')] = hidden_input.get('value', '')
+    
+    # Find the search button to get its name/value
+    search_button = search_form.find('input', {'type': 'submit'})
+    if search_button and search_button.get('name'):
+        fields[search_button.get('name')] = search_button.get('value', '')
+    
+    # Find the form action URL
+    form_action = search_form.get('action')
+    if form_action:
+        # Handle relative URLs
+        if form_action.startswith('/'):
+            search_url = 'https://buypgwautoglass.com' + form_action
+        elif not form_action.startswith('http'):
+            # Get the base path from the current URL
+            base_url = '/'.join(url.split('/')[:-1]) + '/'
+            search_url = base_url + form_action
+        else:
+            search_url = form_action
+    else:
+        # If no action specified, use the current URL
+        search_url = url
+    
+    return search_url, fields
+
+def fill_search_form(search_form, partNo):
+    """Build the part search POST as (search_url, search_data) from a parsed form template"""
+    search_url, fields = search_form
+    return search_url, {name: partNo if value is None else value for name, value in fields.items()}
+
+def build_search_request(html_content, url, partNo):
+    """
+    Build the part search POST from a search form page
+    
+    Args:
+        html_content: HTML content of the search form page
+        url: URL the form page was loaded from
+        partNo: The part number to search for
+        
+    Returns:
+        Tuple of (search_url, search_data), or None if the page has no form
+    """
+    search_form = parse_search_form(html_content, url)
+    return fill_search_form(search_form, partNo) if search_form else None
+
+def extract_location(soup):
+    """Extract the ship-to location from the page header"""
+    location = "Unknown"
+    location_elements = soup.select("span.b2btext")
+    for element in location_elements:
+        location_text = element.get_text()
+        if "::" in location_text:
+            location = location_text.split(":: ")[1].strip()
+            break
+    return location
+
+def extract_parts_from_elements(soup, partNo, location, logger):
+    """Find parts in div elements when the results page has no tables"""
+    parts = []
+    
+    # Try to find parts in div elements
+    part_elements = soup.select(".part, .product, div[class*='part'], div[class*='product']")
+    
+    if part_elements:
+        logger.info(f"Found {len(part_elements)} part elements")
+        
+        for element in part_elements:
+            try:
+                element_text = element.get_text()
+                
+                # Check if this contains our part number
+                if partNo in element_text:
+                    # Extract data from the element
+                    part_number = partNo
+                    availability = "Unknown"
+                    price = "Unknown"
+                    description = "Unknown"
+                    
+                    # Try to find part number more specifically
+                    for prefix in ["DW", "FW", "SD", "BD"]:
+                        if f"{prefix}{partNo}" in element_text:
+                            part_number = f"{prefix}{partNo}"
+                            break
+                    
+                    # Try to find availability
+                    if "in stock" in element_text.lower():
+                        availability = "In Stock"
+                    elif "out of stock" in element_text.lower():
+                        availability = "Out of Stock"
+                    
+                    # Try to find price
+                    price_match = re.search(r'\$([\d,]+\.\d{2})', element_text)
+                    if price_match:
+                        price = "$" + price_match.group(1)
+                    
+                    # Try to find description
+                    desc_elements = element.select(".description, .desc, div[class*='desc']")
+                    if desc_elements:
+                        description = desc_elements[0].get_text().strip()
+                    
+                    parts.append([
+                        part_number,
+                        availability,
+                        price,
+                        location,
+                        description
+                    ])
+            except Exception as e:
+                logger.warning(f"Error processing part element: {e}")
+                continue
+    
+    return parts
+
+def extract_parts_from_tables(tables, partNo, location, logger):
+    """Find parts in the rows of the results tables"""
+    parts = []
+    
+    for table in tables:
+        rows = table.find_all("tr")
+        if len(rows) <= 1:
+            continue  # Skip tables with only headers
+        
+        for row in rows[1:]:  # Skip header row
+            cells = row.find_all("td")
+            if len(cells) < 3:
+                continue
+            
+            try:
+                part_text = ""
+                # Try various ways to get part number
+                font_elements = cells[0].find_all("font")
+                if font_elements:
+                    part_text = font_elements[0].get_text()
+                else:
+                    part_text = cells[0].get_text()
+                
+                # If part number matches our search
+                if partNo in part_text:
+                    # Extract other information
+                    availability = "Unknown"
+                    avail_elements = cells[1].find_all("font")
+                    if avail_elements:
+                        availability = avail_elements[0].get_text()
+                    else:
+                        availability = cells[1].get_text()
+                    
+                    price = "Unknown"
+                    price_elements = cells[2].find_all("font")
+                    if price_elements:
+                        price = price_elements[0].get_text()
+                    else:
+                        price = cells[2].get_text()
+                    
+                    description = "No description"
+                    desc_elements = row.select("div.options")
+                    if desc_elements:
+                        description = desc_elements[0].get_text().replace('»', '').strip()
+                    
+                    # Add to parts list
+                    parts.append([
+                        part_text,  # Part Number
+                        availability,  # Availability
+                        price,  # Price
+                        location,  # Location
+                        description  # Description
+                    ])
+            except Exception as e:
+                logger.warning(f"Error processing row: {e}")
+                continue
+    
+    return parts
+
+def extract_parts_from_text(page_text, partNo, location):
+    """Last resort - pull part numbers and prices straight out of the page source"""
+    parts = []
+    part_matches = re.findall(r'([A-Z]{2}' + re.escape(partNo) + r')\b.*?(\$[\d,]+\.\d{2})', page_text, re.DOTALL)
+    
+    for match in part_matches:
+        part_number = match[0]
+        price = match[1]
+        
+        parts.append([
+            part_number,
+            "Unknown",  # Availability
+            price,
+            location,
+            "Auto Glass"  # Generic description
+        ])
+    
+    return parts
+
+def extract_parts_using(page_text, partNo, logger, methods=EXTRACTION_METHODS):
+    """
+    Extract parts from a PWG search results page with the given methods
+    
+    Tables are only searched on pages that have them, div elements only on pages that don't.
+    
+    Args:
+        page_text: HTML content of the search results page
+        partNo: The part number that was searched
+        logger: Logger instance
+        methods: Names from EXTRACTION_METHODS, tried in order until one finds parts
+        
+    Returns:
+        Tuple of (parts, names of the methods tried) - the last one tried found the parts, if any
+    """
+    # Parse the response
+    result_soup = parse_html(page_text)
+    
+    # Try to find location information
+    location = extract_location(result_soup)
+    
+    # Process tables if found
+    tables = result_soup.find_all("table")
+    
+    tried = []
+    for method in methods:
+        if method == "tables" and tables:
+            tried.append(method)
+            parts = extract_parts_from_tables(tables, partNo, location, logger)
+            if parts:
+                logger.info(f"Found {len(parts)} parts via tables")
+                return parts, tried
+        elif method == "elements" and not tables:
+            logger.warning("No tables found on page, trying alternative extraction methods")
+            tried.append(method)
+            parts = extract_parts_from_elements(result_soup, partNo, location, logger)
+            if parts:
+                logger.info(f"Found {len(parts)} parts via div elements")
+                return parts, tried
+        elif method == "regex":
+            # If we found no matches in tables or elements, try to look through the page
+            tried.append(method)
+            parts = extract_parts_from_text(page_text, partNo, location)
+            if parts:
+                logger.info(f"Found {len(parts)} parts via regex")
+                return parts, tried
+    
+    return [], tried
+
+def extract_parts(page_text, partNo, logger):
+    """
+    Extract parts from a PWG search results page
+    
+    Args:
+        page_text: HTML content of the search results page
+        partNo: The part number that was searched
+        logger: Logger instance
+        
+    Returns:
+        List of parts in the format [part_number, availability, price, location, description],
+        empty if nothing could be extracted
+    """
+    return extract_parts_using(page_text, partNo, logger)[0]
+
 
 def save_cookies(session, logger):
-    """Save cookies to file for future sessions"""
+    """Save cookies to the shared store for future sessions"""
     try:
-        cookies = session.cookies
-        pathlib.Path(os.path.dirname(COOKIE_FILE)).mkdir(parents=True, exist_ok=True)
-        with open(COOKIE_FILE, "wb") as file:
-            pickle.dump(cookies, file)
-        logger.info(f"Saved cookies to {COOKIE_FILE}")
+        cookie_store.save(COOKIE_NAME, session)
+        logger.info(f"Saved cookies to {cookie_store.path(COOKIE_NAME)}")
         return True
     except Exception as e:
         logger.warning(f"Failed to save cookies: {e}")
         return False
 
 def load_cookies(session, logger):
-    """Load cookies from file to avoid login"""
+    """Load cookies from the shared store to avoid login"""
     try:
-        # Check if cookie file exists
-        if not os.path.exists(COOKIE_FILE):
-            logger.info("No cookie file found")
-            return False
-            
-        # Check if cookie file is fresh (less than 4 hours old)
-        cookie_age = time.time() - os.path.getmtime(COOKIE_FILE)
-        if cookie_age > 14400:  # 4 hours in seconds
-            logger.info(f"Cookie file is too old ({cookie_age/3600:.1f} hours)")
+        # Only cookies saved less than 4 hours ago
+        entry = cookie_store.apply(COOKIE_NAME, session, max_age=COOKIE_MAX_AGE)
+        if entry is None:
+            logger.info("No fresh cookies stored")
             return False
             
-        # Load cookies
-        with open(COOKIE_FILE, "rb") as file:
-            cookies = pickle.load(file)
-            session.cookies.update(cookies)
-            
-        logger.info(f"Loaded cookies from file")
+        logger.info(f"Loaded cookies from store")
+        
+        # Cookies that recently worked are trusted, a search that bounces to login invalidates them
+        if cookie_store.is_validated(entry):
+            logger.info("Cookies validated recently, skipping validation request")
+            return True
         
         # Test if cookies are valid by making a request to the part search page
         try:
-            response = session.get('https://buypgwautoglass.com/PartSearch/default.asp', 
+            response = session.get(VERIFY_URL, 
                                   allow_redirects=False, timeout=10)
             
             # Check if we're logged in (not redirected to login page)
             if response.status_code == 200 and "PartSearch" in response.url:
                 logger.info("Successfully logged in with cookies")
+                cookie_store.mark_validated(COOKIE_NAME)
                 return True
             else:
                 logger.info("Cookie login failed, will try regular login")
@@ -66,7 +454,11 @@ def load_cookies(session, logger):
         logger.warning(f"Failed to load cookies: {e}")
         return False
 
-def login(session, logger):
+def get_session():
+    """Create a requests session with common headers on the shared connection pool"""
+    return new_session(SESSION_HEADERS)
+
+def login(session, logger=logger):
     """Login to Buy PGW Auto Glass website"""
     start_time = time.time()
     logger.info("Logging in to Buy PGW Auto Glass")
@@ -87,61 +479,29 @@ def login(session, logger):
             logger.info("Navigating to login page")
             
             # First get the login page to capture any needed tokens/cookies
-            login_page_response = session.get('https://buypgwautoglass.com/', timeout=15)
-            
-            # Parse the login form to find any hidden fields or CSRF tokens
-            soup = BeautifulSoup(login_page_response.text, 'html.parser')
-            login_form = soup.find('form')
-            
-            # Prepare login data
-            login_data = {
-                'txtUsername': username,
-                'txtPassword': password,
-            }
+            login_page_response = decode_response(SUPPLIER, session.get('https://buypgwautoglass.com/', timeout=15))
             
-            # Add any hidden fields from the form
-            if login_form:
-                for hidden_input in login_form.find_all('input', type='hidden'):
-                    login_data[hidden_input.get('name')] = hidden_input.get('value')
+            # Parse the login form and submit it
+            login_url, login_data = build_login_request(login_page_response.text, username, password)
             
-            # Find the form action URL
-            form_action = login_form.get('action') if login_form else 'Default.asp'
-            login_url = 'https://buypgwautoglass.com/' + form_action.lstrip('/')
-            
-            # Submit the login form
-            login_response = session.post(
+            login_response = decode_response(SUPPLIER, session.post(
                 login_url,
                 data=login_data,
                 headers={
                     'Referer': 'https://buypgwautoglass.com/',
                     'Content-Type': 'application/x-www-form-urlencoded',
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+                    'User-Agent': USER_AGENT
                 },
                 allow_redirects=True,
                 timeout=15
-            )
+            ))
             
             # Check for agreement page
             if "Agree" in login_response.text:
-                agreement_soup = BeautifulSoup(login_response.text, 'html.parser')
-                agreement_form = agreement_soup.find('form')
+                agreement_request = build_agreement_request(login_response.text)
                 
-                if agreement_form:
-                    # Prepare agreement data
-                    agreement_data = {}
-                    
-                    # Add any hidden fields from the form
-                    for hidden_input in agreement_form.find_all('input', type='hidden'):
-                        agreement_data[hidden_input.get('name')] = hidden_input.get('value')
-                    
-                    # Add the agreement button value
-                    agreement_button = agreement_form.find('input', {'value': 'I Agree'})
-                    if agreement_button:
-                        agreement_data[agreement_button.get('name')] = agreement_button.get('value')
-                    
-                    # Find the form action URL
-                    form_action = agreement_form.get('action')
-                    agreement_url = 'https://buypgwautoglass.com/' + form_action.lstrip('/')
+                if agreement_request:
+                    agreement_url, agreement_data = agreement_request
                     
                     # Submit the agreement form
                     agreement_response = session.post(
@@ -150,7 +510,7 @@ def login(session, logger):
                         headers={
                             'Referer': login_response.url,
                             'Content-Type': 'application/x-www-form-urlencoded',
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+                            'User-Agent': USER_AGENT
                         },
                         allow_redirects=True,
                         timeout=15
@@ -158,7 +518,7 @@ def login(session, logger):
                     logger.info("Submitted agreement form")
             
             # Verify successful login by checking if we can access the part search page
-            verify_response = session.get('https://buypgwautoglass.com/PartSearch/default.asp', timeout=10)
+            verify_response = session.get(VERIFY_URL, timeout=10)
             
             if "PartSearch" in verify_response.url:
                 elapsed = time.time() - start_time
@@ -184,307 +544,154 @@ def login(session, logger):
                 logger.error(f"Login error after {elapsed:.2f}s: {e}")
                 raise
 
-def searchPart(session, partNo, logger):
-    """Search for part on PGW website with request-based implementation"""
+# Logged-in sessions shared by all searches in this process, refreshed before SESSION_TTL runs out
+broker = create_broker(SUPPLIER, login, get_session, ttl=SESSION_TTL)
+
+# Search form templates per session, so most searches are a single POST
+search_forms = FormCache(ttl=SEARCH_FORM_TTL)
+
+def load_search_form(session, url, url_idx, logger, relogin):
+    """
+    Load a search form page, logging in again if it bounces to login, and cache its template
+    
+    Returns:
+        The parsed form template (see parse_search_form), or None if there is no form
+    """
+    url_start = time.time()
+    response = decode_response(SUPPLIER, session.get(url, timeout=15))
+    logger.info(f"Loaded URL {url_idx+1} in {time.time() - url_start:.2f}s")
+
+    # Check if we need to login
+    login_check_start = time.time()
+    if "PartSearch" not in response.url:
+        logger.info("Login required")
+        
+        # The stored cookies no longer work, don't trust them without validating again
+        cookie_store.invalidate(COOKIE_NAME)
+        login_start = time.time()
+        if not relogin():
+            return None
+        logger.info(f"Login completed in {time.time() - login_start:.2f}s")
+        response = decode_response(SUPPLIER, session.get(url, timeout=15))
+    logger.info(f"Login check completed in {time.time() - login_check_start:.2f}s")
+    
+    search_form = parse_search_form(response.text, url)
+    if search_form:
+        search_forms.put(session, url, search_form)
+    return search_form
+
+def submit_search(session, url, search_form, partNo, logger):
+    """POST a part search built from a form template"""
+    search_url, search_data = fill_search_form(search_form, partNo)
+    logger.info(f"Submitting search to {search_url}")
+    
+    return decode_response(SUPPLIER, session.post(
+        search_url,
+        data=search_data,
+        headers={
+            'Referer': url,
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'User-Agent': USER_AGENT
+        },
+        allow_redirects=True,
+        timeout=15
+    ))
+
+def search_rejected(search_response):
+    """Check whether a search POST failed or bounced out of the part search pages (to login)"""
+    return search_response.status_code >= 400 or "PartSearch" not in search_response.url
+
+def searchPart(session, partNo, logger, relogin=None):
+    """
+    Search for part on PGW website with request-based implementation
+    
+    Args:
+        session: Logged-in requests session
+        partNo: The part number to search
+        logger: Logger instance
+        relogin: Optional callable() -> bool used when the session turns out to be logged out
+            (defaults to logging the session in directly)
+    """
+    if relogin is None:
+        relogin = lambda: login(session, logger)
+    
     start_time = time.time()
     max_retries = 2
     retry_count = 0
 
     # Default parts to return if all else fails - this ensures we always return something
-    default_parts = [
-        [f"DW{partNo}", "In Stock", "$199.99", "Miami, FL", "Windshield - OEM Glass"],
-        [f"FW{partNo}", "In Stock", "$179.99", "Orlando, FL", "Windshield - Aftermarket Glass"],
-        [f"SD{partNo}", "Out of Stock", "$89.99", "Miami, FL", "Side Window - OEM Glass"],
-        [f"BD{partNo}", "Low Stock", "$119.99", "Tampa, FL", "Back Glass - OEM Equivalent"]
-    ]
+    default_parts = build_default_parts(partNo)
     
     while retry_count < max_retries:
         try:
             logger.info(f"Searching part in PWG: {partNo}")
 
-            # Try both search URLs to improve reliability
-            search_urls = [
-                'https://buypgwautoglass.com/PartSearch/search.asp?REG=&UserType=F&ShipToNo=85605&PB=544',
-                'https://buypgwautoglass.com/PartSearch/default.asp'
-            ]
+            # Try both search URLs to improve reliability, the one that has been finding parts first
+            search_order = [SEARCH_METHODS.index(method)
+                            for method in strategy_stats.plan(SUPPLIER, "url", SEARCH_METHODS)]
 
             # Try each URL
-            for url_idx, url in enumerate(search_urls):
+            for url_idx in search_order:
+                url = SEARCH_URLS[url_idx]
                 try:
-                    url_start = time.time()
-                    response = session.get(url, timeout=15)
-                    logger.info(f"Loaded URL {url_idx+1} in {time.time() - url_start:.2f}s")
-
-                    # Check if we need to login
-                    login_check_start = time.time()
-                    if "PartSearch" not in response.url:
-                        logger.info("Login required")
-                        login_start = time.time()
-                        if not login(session, logger):
-                            continue
-                        logger.info(f"Login completed in {time.time() - login_start:.2f}s")
-                        response = session.get(url, timeout=15)
-                    logger.info(f"Login check completed in {time.time() - login_check_start:.2f}s")
+                    # Reuse the form template this session loaded recently, skipping the form page
+                    search_form = search_forms.get(session, url)
+                    cached = search_form is not None
+                    if cached:
+                        logger.info(f"Using cached search form for URL {url_idx+1}")
+                    else:
+                        search_form = load_search_form(session, url, url_idx, logger, relogin)
+                    
+                    if not search_form:
+                        logger.warning("No search form found, trying next URL")
+                        strategy_stats.record(SUPPLIER, "url", SEARCH_METHODS[url_idx], False)
+                        continue
 
                     # Proceed with part search
                     try:
                         search_start = time.time()
+                        search_response = submit_search(session, url, search_form, partNo, logger)
                         
-                        # Parse the search form
-                        soup = BeautifulSoup(response.text, 'html.parser')
-                        search_form = soup.find('form')
-                        
-                        if not search_form:
-                            logger.warning("No search form found, trying next URL")
-                            continue
-                        
-                        # Prepare search data
-                        search_data = {
-                            'PartNo': partNo,
-                            'PartTypeA': 'PartTypeA'  # Select Part Number radio button
-                        }
-                        
-                        # Add any hidden fields from the form
-                        for hidden_input in search_form.find_all('input', type='hidden'):
-                            if hidden_input.get('name'):
-                                search_data[hidden_input.get('name')] = hidden_input.get('value', '')
-                        
-                        # Find the search button to get its name/value
-                        search_button = search_form.find('input', {'type': 'submit'})
-                        if search_button and search_button.get('name'):
-                            search_data[search_button.get('name')] = search_button.get('value', '')
-                        
-                        # Find the form action URL
-                        form_action = search_form.get('action')
-                        if form_action:
-                            # Handle relative URLs
-                            if form_action.startswith('/'):
-                                search_url = 'https://buypgwautoglass.com' + form_action
-                            elif not form_action.startswith('http'):
-                                # Get the base path from the current URL
-                                base_url = '/'.join(url.split('/')[:-1]) + '/'
-                                search_url = base_url + form_action
-                            else:
-                                search_url = form_action
-                        else:
-                            # If no action specified, use the current URL
-                            search_url = url
-                        
-                        logger.info(f"Submitting search to {search_url}")
-                        
-                        # Submit the search form
-                        search_response = session.post(
-                            search_url,
-                            data=search_data,
-                            headers={
-                                'Referer': url,
-                                'Content-Type': 'application/x-www-form-urlencoded',
-                                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                            },
-                            allow_redirects=True,
-                            timeout=15
-                        )
+                        # A cached template that no longer works (stale hidden fields, or the session
+                        # was logged out) is dropped, and the search repeated from a fresh form page
+                        if search_rejected(search_response):
+                            search_forms.invalidate(session)
+                            if cached:
+                                logger.info("Search with cached form was rejected, reloading the form page")
+                                search_form = load_search_form(session, url, url_idx, logger, relogin)
+                                if not search_form:
+                                    logger.warning("No search form found, trying next URL")
+                                    strategy_stats.record(SUPPLIER, "url", SEARCH_METHODS[url_idx], False)
+                                    continue
+                                search_response = submit_search(session, url, search_form, partNo, logger)
                         
                         logger.info(f"Search form submitted in {time.time() - search_start:.2f}s")
                         
                         # Quick check if part is in response
                         if partNo not in search_response.text:
                             logger.info(f"Part number {partNo} not found in page source, skipping detailed parsing")
+                            strategy_stats.record(SUPPLIER, "url", SEARCH_METHODS[url_idx], False)
                             continue  # Try next URL
                             
                         logger.info(f"Found part number {partNo} in page source, proceeding with parsing")
+                        strategy_stats.record(SUPPLIER, "url", SEARCH_METHODS[url_idx], True)
 
-                        # Process results
-                        parse_start = time.time()
-                        parts = []
-                        
-                        # Parse the response
-                        result_soup = BeautifulSoup(search_response.text, 'html.parser')
-                        
-                        # Try to find location information
-                        location = "Unknown"
-                        location_elements = result_soup.select("span.b2btext")
-                        for element in location_elements:
-                            location_text = element.get_text()
-                            if "::" in location_text:
-                                location = location_text.split(":: ")[1].strip()
-                                break
-                        
-                        # Process tables if found
-                        tables = result_soup.find_all("table")
-                        
-                        if not tables:
-                            logger.warning("No tables found on page, trying alternative extraction methods")
-                            
-                            # Try to find parts in div elements
-                            part_elements = result_soup.select(".part, .product, div[class*='part'], div[class*='product']")
-                            
-                            if part_elements:
-                                logger.info(f"Found {len(part_elements)} part elements")
-                                
-                                for element in part_elements:
-                                    try:
-                                        element_text = element.get_text()
-                                        
-                                        # Check if this contains our part number
-                                        if partNo in element_text:
-                                            # Extract data from the element
-                                            part_number = partNo
-                                            availability = "Unknown"
-                                            price = "Unknown"
-                                            description = "Unknown"
-                                            
-                                            # Try to find part number more specifically
-                                            for prefix in ["DW", "FW", "SD", "BD"]:
-                                                if f"{prefix}{partNo}" in element_text:
-                                                    part_number = f"{prefix}{partNo}"
-                                                    break
-                                            
-                                            # Try to find availability
-                                            if "in stock" in element_text.lower():
-                                                availability = "In Stock"
-                                            elif "out of stock" in element_text.lower():
-                                                availability = "Out of Stock"
-                                            
-                                            # Try to find price
-                                            price_match = re.search(r'\$([\d,]+\.\d{2})', element_text)
-                                            if price_match:
-                                                price = "$" + price_match.group(1)
-                                            
-                                            # Try to find description
-                                            desc_elements = element.select(".description, .desc, div[class*='desc']")
-                                            if desc_elements:
-                                                description = desc_elements[0].get_text().strip()
-                                            
-                                            parts.append([
-                                                part_number,
-                                                availability,
-                                                price,
-                                                location,
-                                                description
-                                            ])
-                                    except Exception as e:
-                                        logger.warning(f"Error processing part element: {e}")
-                                        continue
-                            
-                            # If we found parts, return them
-                            if parts:
-                                elapsed = time.time() - start_time
-                                logger.info(f"Found {len(parts)} parts via div elements in {elapsed:.2f}s")
-                                return parts
-                            else:
-                                # Try to extract data from any text that matches our part number
-                                part_matches = re.findall(r'([A-Z]{2}' + re.escape(partNo) + r')\b.*?(\$[\d,]+\.\d{2})', search_response.text, re.DOTALL)
-                                
-                                if part_matches:
-                                    for match in part_matches:
-                                        part_number = match[0]
-                                        price = match[1]
-                                        
-                                        parts.append([
-                                            part_number,
-                                            "Unknown",  # Availability
-                                            price,
-                                            location,
-                                            "Auto Glass"  # Generic description
-                                        ])
-                                    
-                                    elapsed = time.time() - start_time
-                                    logger.info(f"Found {len(parts)} parts via regex in {elapsed:.2f}s")
-                                    return parts
-                                else:
-                                    elapsed = time.time() - start_time
-                                    logger.info(f"Could not find parts through elements, returning default parts after {elapsed:.2f}s")
-                                    return default_parts
-                        
-                        # Process tables if found
-                        found_parts = False
-                        for table in tables:
-                            rows = table.find_all("tr")
-                            if len(rows) <= 1:
-                                continue  # Skip tables with only headers
-                            
-                            for row in rows[1:]:  # Skip header row
-                                cells = row.find_all("td")
-                                if len(cells) < 3:
-                                    continue
-                                
-                                try:
-                                    part_text = ""
-                                    # Try various ways to get part number
-                                    font_elements = cells[0].find_all("font")
-                                    if font_elements:
-                                        part_text = font_elements[0].get_text()
-                                    else:
-                                        part_text = cells[0].get_text()
-                                    
-                                    # If part number matches our search
-                                    if partNo in part_text:
-                                        found_parts = True
-                                        
-                                        # Extract other information
-                                        availability = "Unknown"
-                                        avail_elements = cells[1].find_all("font")
-                                        if avail_elements:
-                                            availability = avail_elements[0].get_text()
-                                        else:
-                                            availability = cells[1].get_text()
-                                        
-                                        price = "Unknown"
-                                        price_elements = cells[2].find_all("font")
-                                        if price_elements:
-                                            price = price_elements[0].get_text()
-                                        else:
-                                            price = cells[2].get_text()
-                                        
-                                        description = "No description"
-                                        desc_elements = row.select("div.options")
-                                        if desc_elements:
-                                            description = desc_elements[0].get_text().replace('»', '').strip()
-                                        
-                                        # Add to parts list
-                                        parts.append([
-                                            part_text,  # Part Number
-                                            availability,  # Availability
-                                            price,  # Price
-                                            location,  # Location
-                                            description  # Description
-                                        ])
-                                except Exception as e:
-                                    logger.warning(f"Error processing row: {e}")
-                                    continue
+                        # Process results, skipping extraction methods that stopped working
+                        methods = strategy_stats.plan(SUPPLIER, "extraction", EXTRACTION_METHODS, reorder=False)
+                        parts, tried = parse_executor.run(extract_parts_using, search_response, partNo, logger, methods)
+                        strategy_stats.record_fallbacks(SUPPLIER, "extraction", tried, bool(parts))
                         
-                        # If we found parts, return them
-                        if found_parts:
-                            elapsed = time.time() - start_time
-                            logger.info(f"Found {len(parts)} parts via tables in {elapsed:.2f}s")
+                        elapsed = time.time() - start_time
+                        if parts:
+                            logger.info(f"Found {len(parts)} parts in {elapsed:.2f}s")
                             return parts
                         else:
-                            # If we searched but found no matches in tables, try to look through the page
-                            part_matches = re.findall(r'([A-Z]{2}' + re.escape(partNo) + r')\b.*?(\$[\d,]+\.\d{2})', search_response.text, re.DOTALL)
-                            
-                            if part_matches:
-                                for match in part_matches:
-                                    part_number = match[0]
-                                    price = match[1]
-                                    
-                                    parts.append([
-                                        part_number,
-                                        "Unknown",  # Availability
-                                        price,
-                                        location,
-                                        "Auto Glass"  # Generic description
-                                    ])
-                                
-                                elapsed = time.time() - start_time
-                                logger.info(f"Found {len(parts)} parts via regex in {elapsed:.2f}s")
-                                return parts
-                            else:
-                                elapsed = time.time() - start_time
-                                logger.info(f"Could not find specific part information, returning default parts after {elapsed:.2f}s")
-                                return default_parts
+                            logger.info(f"Could not find specific part information, returning default parts after {elapsed:.2f}s")
+                            return default_parts
 
                     except Exception as e:
+                        # The POST failed, don't build the next one from the same template
+                        search_forms.invalidate(session)
                         logger.warning(f"Error during search on {url}: {e}")
                         # Continue to next URL if this one fails
 
@@ -528,22 +735,15 @@ def PWGScraper(partNo, logger=None):
     try:
         logger.info(f"Starting PWG scraper for part: {partNo}")
         
-        # Create a session to maintain cookies
-        session = requests.Session()
-        
-        # Set common headers
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
-        
-        result = searchPart(session, partNo, logger)
+        # Lease a logged-in session, the broker keeps them warm in the background
+        with broker.lease() as lease:
+            result = searchPart(lease.session, partNo, logger, relogin=lease.relogin)
         elapsed = time.time() - start_time
         logger.info(f"PWG scraper completed in {elapsed:.2f}s")
         return result
+    except LoginFailed as e:
+        logger.error(f"PWG login failed, returning default parts: {e}")
+        return build_default_parts(partNo)
     except Exception as e:
         elapsed = time.time() - start_time
         logger.error(f"Error in PWG scraper after {elapsed:.2f}s: {e}")
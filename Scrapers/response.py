@@ -0,0 +1,211 @@
+# scrapers/response.py
+# Supplier responses decoded exactly once - pinned charset per supplier, or one cached detection
+#
+# requests decodes response.content again on every .text access, and when the
+# server sends no charset it runs charset detection over the whole body each time.
+# The scrapers wrap responses with decode_response() instead: the body is decoded
+# on first .text access and kept. The charset comes from the Content-Type header
+# if it names one, otherwise from the supplier's pinned charset, otherwise from
+# requests' default for the content type (ISO-8859-1 for text/*), so unpinned
+# suppliers decode exactly as response.text did. Only responses requests would
+# have run detection on get it, once per supplier, reused for later responses.
+# The async engine passes its aiohttp bodies through decode_body(), so both
+# engines decode a page the same way.
+
+import re
+import codecs
+import threading
+import logging
+
+from requests.compat import chardet
+from requests.utils import get_encoding_from_headers
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+CHARSET_PATTERN = re.compile(r'charset\s*=\s*["\']?([^"\';\s]+)', re.IGNORECASE)
+
+# Bodies shorter than this are decoded but not trusted to detect a supplier's charset
+MIN_DETECTION_BYTES = 1024
+
+
+def header_charset(headers):
+    """Return the charset named in a Content-Type header, or None"""
+    match = CHARSET_PATTERN.search(headers.get('Content-Type', ''))
+    return match.group(1) if match else None
+
+
+def usable_charset(charset):
+    """Return the codec name for a charset, or None if Python doesn't know it"""
+    try:
+        return codecs.lookup(charset).name
+    except (LookupError, TypeError):
+        return None
+
+
+class SupplierResponse:
+    """A requests response whose body is decoded once - everything else is the wrapped response's"""
+
+    def __init__(self, response, decoder, supplier):
+        self._response = response
+        self._decoder = decoder
+        self._supplier = supplier
+        self._text = None
+        self.encoding = None
+
+    @property
+    def content(self):
+        return self._response.content
+
+    @property
+    def charset(self):
+        """Codec the body is decoded with, picked without decoding it"""
+        if self.encoding is None:
+            self.encoding = self._decoder.charset_for(self._supplier, self._response)
+        return self.encoding
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self._decoder.decode(self._response.content, self.charset)
+        return self._text
+
+    def __getattr__(self, name):
+        # url, status_code, headers, history, cookies, raise_for_status, ...
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._response, name)
+
+    def __repr__(self):
+        return f"<SupplierResponse [{self._response.status_code}] {self._supplier}>"
+
+
+class FetchedBody:
+    """Headers and body fetched by another HTTP client (the async engine's aiohttp), as charset_for reads a response"""
+
+    def __init__(self, headers, content):
+        self.headers = headers
+        self.content = content
+
+    @property
+    def apparent_encoding(self):
+        # The detection requests' Response.apparent_encoding runs
+        return chardet.detect(self.content)["encoding"] if chardet is not None else 'utf-8'
+
+
+class ResponseDecoder:
+    def __init__(self, charsets=None):
+        """
+        Initialize the decoder
+
+        Args:
+            charsets: Dictionary of supplier name -> charset used when a response names none.
+                Pinning changes the output for text/* pages without a charset, which requests
+                (and so an unpinned supplier) decodes as ISO-8859-1.
+        """
+        self._lock = threading.Lock()
+        self._pinned = {}
+        self._detected = {}
+
+        # Counters for stats()
+        self._decodes = 0
+        self._detections = 0
+
+        self.configure(charsets)
+
+    def configure(self, charsets=None):
+        """Pin charsets per supplier - detected charsets are forgotten"""
+        with self._lock:
+            for supplier, charset in (charsets or {}).items():
+                codec = usable_charset(charset)
+                if codec is None:
+                    logger.warning(f"Unknown charset {charset} for {supplier}, detecting it instead")
+                    continue
+                self._pinned[supplier] = codec
+            self._detected.clear()
+
+    def wrap(self, supplier, response):
+        """Wrap a supplier response so its body is decoded at most once"""
+        return SupplierResponse(response, self, supplier)
+
+    def decode_body(self, supplier, headers, content):
+        """Decode a body fetched without requests (e.g. by aiohttp) with the charset a wrapped response would get"""
+        return self.decode(content, self.charset_for(supplier, FetchedBody(headers, content)))
+
+    def charset_for(self, supplier, response):
+        """
+        Pick the charset for a response body
+
+        Args:
+            supplier: Supplier name the response came from
+            response: requests response
+
+        Returns:
+            Codec name - from the header, the pinned charset, requests' default for the
+            content type, a cached detection or a new one
+        """
+        codec = usable_charset(header_charset(response.headers))
+        if codec is not None:
+            return codec
+
+        with self._lock:
+            codec = self._pinned.get(supplier)
+        if codec is not None:
+            return codec
+
+        # What response.text would use (ISO-8859-1 for text/*, UTF-8 for JSON) - no detection
+        codec = usable_charset(get_encoding_from_headers(response.headers))
+        if codec is not None:
+            return codec
+
+        with self._lock:
+            codec = self._detected.get(supplier)
+        if codec is not None:
+            return codec
+
+        content = response.content
+        if content.isascii():
+            # Decodes the same in any ASCII-compatible charset, nothing to detect
+            return 'utf-8'
+
+        # requests' detection (charset_normalizer or chardet), the one .text would run
+        detected = usable_charset(response.apparent_encoding)
+        with self._lock:
+            self._detections += 1
+
+        if detected is None:
+            return 'utf-8'
+
+        if len(content) >= MIN_DETECTION_BYTES:
+            with self._lock:
+                self._detected[supplier] = detected
+            logger.info(f"Detected {detected} responses for {supplier}")
+        return detected
+
+    def decode(self, content, encoding):
+        with self._lock:
+            self._decodes += 1
+        return str(content, encoding, errors='replace')
+
+    def stats(self):
+        """Return decode and detection counts and the charset in use per supplier"""
+        with self._lock:
+            return {
+                "decodes": self._decodes,
+                "detections": self._detections,
+                "charsets": {**self._detected, **self._pinned},
+            }
+
+
+# Process-wide decoder used by the scrapers
+response_decoder = ResponseDecoder()
+
+
+def decode_response(supplier, response):
+    """Wrap a supplier response with the process-wide decoder (see ResponseDecoder.wrap)"""
+    return response_decoder.wrap(supplier, response)
+
+
+def decode_body(supplier, headers, content):
+    """Decode a body fetched without requests with the process-wide decoder (see ResponseDecoder.decode_body)"""
+    return response_decoder.decode_body(supplier, headers, content)
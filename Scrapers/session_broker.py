@@ -0,0 +1,365 @@
+# scrapers/session_broker.py
+# Pools of logged-in supplier sessions - logins happen in the background, searches lease a ready session
+#
+# A search takes an idle logged-in session, uses it exclusively and hands it back.
+# A background thread per supplier logs sessions in before they expire and tops the
+# pool back up, so login is off the search path once the pool is warm. Expiry is
+# detected from search responses (a bounce to the login page), never by a
+# separate verification request.
+
+import os
+import time
+import threading
+import logging
+from contextlib import contextmanager
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+class LoginFailed(Exception):
+    """Raised when no logged-in session can be provided for a supplier"""
+    pass
+
+
+class PooledSession:
+    """A logged-in session and when it was logged in"""
+
+    def __init__(self, session, pooled=True):
+        self.session = session
+        self.logged_in_at = time.time()
+        self.pooled = pooled
+
+
+class Lease:
+    """Exclusive use of one logged-in session for the duration of a search"""
+
+    def __init__(self, broker, entry):
+        self._broker = broker
+        self._entry = entry
+        self._lock = threading.Lock()
+        self.is_expired = False
+        self.released = False
+
+    @property
+    def session(self):
+        return self._entry.session
+
+    def expired(self):
+        """Report that a response showed the session is logged out - it won't go back in the pool"""
+        self.is_expired = True
+
+    def relogin(self):
+        """
+        Log the leased session in again after a response showed it was logged out
+
+        Returns:
+            True if the session is logged in again - always False once the lease was released,
+            the session may belong to another search by then
+        """
+        with self._lock:
+            if self.released:
+                logger.warning(f"[{self._broker.supplier}] Relogin requested on a released lease, ignoring it")
+                return False
+
+            if self._broker.relogin(self._entry):
+                self.is_expired = False
+                return True
+            self.is_expired = True
+            return False
+
+    def release(self):
+        """End the lease - returns whether the session expired, later relogin() calls are refused"""
+        with self._lock:
+            self.released = True
+            return self.is_expired
+
+
+class SessionBroker:
+    def __init__(self, supplier, login, session_factory, size=2, ttl=1800, refresh_margin=120, lease_timeout=30):
+        """
+        Initialize the broker
+
+        Args:
+            supplier: Supplier name (for logs and stats)
+            login: Callable(session) -> bool that logs a session in
+            session_factory: Callable() -> new requests session
+            size: Number of logged-in sessions kept per process
+            ttl: Seconds a login stays valid on the supplier site
+            refresh_margin: Seconds before expiry that an idle session is replaced with a fresh login
+            lease_timeout: Seconds a search waits for a free session before logging in an extra one
+        """
+        self.supplier = supplier
+        self.login = login
+        self.session_factory = session_factory
+        self.size = size
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.lease_timeout = lease_timeout
+
+        self._condition = threading.Condition()
+        self._idle = []
+        self._total = 0
+        self._thread = None
+        self._pid = None
+
+        # Counters for stats()
+        self._leases = 0
+        self._waits = 0
+        self._logins = 0
+        self._login_failures = 0
+        self._refreshes = 0
+        self._expired = 0
+        self._relogins = 0
+        self._overflow = 0
+
+    @contextmanager
+    def lease(self, timeout=None, overflow=True):
+        """
+        Lease a logged-in session for one search
+
+        Args:
+            timeout: Seconds to wait for a free session (lease_timeout if None)
+            overflow: Log in an extra, unpooled session if none was free in time
+
+        Yields:
+            Lease - call lease.expired() or lease.relogin() if a response shows a logged-out session
+
+        Raises:
+            LoginFailed: If no session was free and logging in a new one failed (or overflow is False)
+        """
+        entry = self._acquire(self.lease_timeout if timeout is None else timeout, overflow)
+        lease = Lease(self, entry)
+        try:
+            yield lease
+        finally:
+            self._release(entry, lease.release())
+
+    def relogin(self, entry):
+        """Log a leased session in again, inline"""
+        with self._condition:
+            self._relogins += 1
+
+        if not self._login(entry.session):
+            return False
+        entry.logged_in_at = time.time()
+        return True
+
+    def warm(self):
+        """Start filling the pool in the background without waiting for the first search"""
+        with self._condition:
+            self._ensure_thread()
+            self._condition.notify_all()
+
+    def configure(self, size=None, ttl=None, refresh_margin=None):
+        """Change pool settings - applied by the refresh thread on its next pass"""
+        with self._condition:
+            if size is not None:
+                self.size = size
+            if ttl is not None:
+                self.ttl = ttl
+            if refresh_margin is not None:
+                self.refresh_margin = refresh_margin
+            self._condition.notify_all()
+
+    def stats(self):
+        """Return pool size and lease/login counters"""
+        with self._condition:
+            return {
+                "size": self.size,
+                "sessions": self._total,
+                "idle": len(self._idle),
+                "leases": self._leases,
+                "waits": self._waits,
+                "logins": self._logins,
+                "login_failures": self._login_failures,
+                "refreshes": self._refreshes,
+                "expired": self._expired,
+                "relogins": self._relogins,
+                "overflow": self._overflow,
+            }
+
+    def _acquire(self, timeout, overflow=True):
+        deadline = time.time() + timeout
+        waited = False
+
+        with self._condition:
+            self._ensure_thread()
+            self._leases += 1
+
+            while True:
+                while self._idle:
+                    # Most recently used first, so rarely used sessions age out
+                    entry = self._idle.pop()
+                    if time.time() - entry.logged_in_at < self.ttl:
+                        return entry
+                    self._total -= 1
+                    self._expired += 1
+
+                if self._total < self.size:
+                    # Room in the pool - reserve the slot and log in below
+                    self._total += 1
+                    pooled = True
+                    break
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    if not overflow:
+                        raise LoginFailed(f"No free {self.supplier} session within {timeout:.1f}s")
+                    self._overflow += 1
+                    pooled = False
+                    break
+
+                if not waited:
+                    waited = True
+                    self._waits += 1
+                self._condition.wait(remaining)
+
+        # Cold pool (or every session busy past the timeout) - this search logs in itself
+        entry = self._new_entry(pooled)
+        if entry is None:
+            if pooled:
+                with self._condition:
+                    self._total -= 1
+                    self._condition.notify_all()
+            raise LoginFailed(f"Could not log in to {self.supplier}")
+        return entry
+
+    def _release(self, entry, expired):
+        with self._condition:
+            if not entry.pooled:
+                entry.session.close()
+                return
+
+            if expired:
+                # The refresh thread logs a replacement in
+                self._total -= 1
+                self._expired += 1
+            elif self._total > self.size:
+                # The pool was shrunk while this session was out
+                self._total -= 1
+                entry.session.close()
+            else:
+                self._idle.append(entry)
+            self._condition.notify_all()
+
+    def _new_entry(self, pooled=True):
+        session = self.session_factory()
+        if not self._login(session):
+            session.close()
+            return None
+        return PooledSession(session, pooled)
+
+    def _login(self, session):
+        started = time.time()
+        try:
+            success = bool(self.login(session))
+        except Exception as e:
+            logger.warning(f"[{self.supplier}] Login raised: {str(e)}")
+            success = False
+
+        with self._condition:
+            if success:
+                self._logins += 1
+            else:
+                self._login_failures += 1
+
+        if success:
+            logger.info(f"[{self.supplier}] Session logged in in {time.time() - started:.2f}s")
+        else:
+            logger.warning(f"[{self.supplier}] Session login failed after {time.time() - started:.2f}s")
+        return success
+
+    def _ensure_thread(self):
+        # Start the refresh thread on first use (and again after a fork). Caller holds the condition.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        if self._pid is not None:
+            # Sessions can't cross a fork, a gunicorn worker logs in its own
+            self._idle = []
+            self._total = 0
+
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name=f"session-broker-{self.supplier}")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                # Sleep until a session is due for refresh, or a lease hands back an expired one
+                self._condition.wait(self._next_check())
+
+                now = time.time()
+                due = [entry for entry in self._idle if now - entry.logged_in_at >= self.ttl - self.refresh_margin]
+                for entry in due:
+                    self._idle.remove(entry)
+                missing = max(0, self.size - self._total)
+                self._total += missing
+
+            for entry in due:
+                self._refresh(entry)
+
+            for _ in range(missing):
+                fresh = self._new_entry()
+                with self._condition:
+                    if fresh is not None:
+                        self._idle.append(fresh)
+                    else:
+                        self._total -= 1
+                    self._condition.notify_all()
+
+                if fresh is None:
+                    # Don't hammer a supplier that is refusing logins
+                    time.sleep(min(30, self.refresh_margin))
+                    break
+
+    def _refresh(self, entry):
+        # Log a new session in before the old one expires, keep the old one if that fails
+        fresh = self._new_entry()
+
+        with self._condition:
+            if fresh is not None:
+                self._refreshes += 1
+                self._idle.append(fresh)
+            elif time.time() - entry.logged_in_at < self.ttl:
+                self._idle.append(entry)
+            else:
+                self._total -= 1
+                self._expired += 1
+            self._condition.notify_all()
+
+        if fresh is not None:
+            entry.session.close()
+
+    def _next_check(self):
+        # Caller holds the condition
+        if self._total < self.size:
+            return 0
+        if not self._idle:
+            return self.refresh_margin
+        oldest = min(entry.logged_in_at for entry in self._idle)
+        return max(0, oldest + self.ttl - self.refresh_margin - time.time())
+
+
+# Every broker created by the scrapers, by supplier name
+BROKERS = {}
+
+
+def create_broker(supplier, login, session_factory, **kwargs):
+    """Create a broker for a supplier and register it for configure() and stats()"""
+    broker = SessionBroker(supplier, login, session_factory, **kwargs)
+    BROKERS[supplier] = broker
+    return broker
+
+
+def configure(size=None, refresh_margin=None):
+    """Apply pool settings to every registered broker"""
+    for broker in BROKERS.values():
+        broker.configure(size=size, refresh_margin=refresh_margin)
+
+
+def stats():
+    """Return stats for every registered broker, by supplier"""
+    return {supplier: broker.stats() for supplier, broker in BROKERS.items()}
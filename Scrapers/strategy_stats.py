@@ -0,0 +1,286 @@
+# scrapers/strategy_stats.py
+# Decayed success rates per supplier strategy (search URL, extraction method), used to reorder or skip them
+#
+# Scrapers with several ways to find a part record which of them produced results.
+# Each strategy keeps exponentially decayed success and trial counts, so its rate
+# follows what the supplier site does now rather than all-time history. plan()
+# turns the rates into the order to try strategies in: equivalent strategies (like
+# fallback URLs) are sorted best first, quality-ordered ones (like extraction
+# methods) keep their order. Either way, strategies that have all but stopped
+# working are skipped, apart from an occasional exploratory try so they can recover.
+# The counts are saved to a JSON file so a restart doesn't relearn them. Every worker
+# process adds the observations it made since its last save to the file under an
+# fcntl lock, then continues from the merged counts, so workers learn from each other.
+
+import os
+import json
+import time
+import random
+import atexit
+import tempfile
+import threading
+import logging
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows - saves are then only serialized within the process
+    fcntl = None
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+class StrategyStats:
+    def __init__(self, path=None, half_life=86400, min_trials=20, skip_below=0.02, explore=0.05, save_interval=30):
+        """
+        Initialize the stats
+
+        Args:
+            path: JSON file the counts are loaded from and saved to, None keeps them in memory
+            half_life: Seconds after which an observation counts half as much
+            min_trials: Decayed trials needed before a strategy can be skipped
+            skip_below: Success rate under which a strategy is skipped
+            explore: Chance that a skipped strategy is tried anyway
+            save_interval: Minimum seconds between saves
+        """
+        self.path = path
+        self.half_life = half_life
+        self.min_trials = min_trials
+        self.skip_below = skip_below
+        self.explore = explore
+        self.save_interval = save_interval
+
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._loaded = False
+        self._pid = None
+        self._last_save = 0
+
+        # supplier -> kind -> strategy -> [successes, trials, updated_at], as of the last save plus
+        # this process's observations since, and those observations alone (not yet in the file)
+        self._counts = {}
+        self._pending = {}
+
+        # Counters for stats(), (supplier, kind, strategy) -> count
+        self._skips = {}
+
+    def configure(self, path=None, half_life=None, min_trials=None, skip_below=None, explore=None):
+        """Change settings - a new path is loaded on next use"""
+        with self._lock:
+            if path is not None and path != self.path:
+                self.path = path
+                self._loaded = False
+            if half_life is not None:
+                self.half_life = half_life
+            if min_trials is not None:
+                self.min_trials = min_trials
+            if skip_below is not None:
+                self.skip_below = skip_below
+            if explore is not None:
+                self.explore = explore
+
+    def record(self, supplier, kind, strategy, success):
+        """Record whether a strategy produced results"""
+        now = time.time()
+        with self._lock:
+            self._ensure_loaded()
+            observation = {supplier: {kind: {strategy: [1 if success else 0, 1, now]}}}
+            self._merge(self._counts, observation, now)
+            self._merge(self._pending, observation, now)
+        self._maybe_save(now)
+
+    def record_fallbacks(self, supplier, kind, tried, succeeded):
+        """
+        Record a run of strategies tried one after another until one worked
+
+        Args:
+            supplier: Supplier name
+            kind: Strategy kind (e.g. "url", "extraction")
+            tried: Strategies in the order they were tried
+            succeeded: Whether the last one tried produced results
+        """
+        for index, strategy in enumerate(tried):
+            self.record(supplier, kind, strategy, succeeded and index == len(tried) - 1)
+
+    def rate(self, supplier, kind, strategy):
+        """Decayed success rate of a strategy (0.5 before anything was recorded)"""
+        with self._lock:
+            self._ensure_loaded()
+            return self._rate(self._counts.get(supplier, {}).get(kind, {}).get(strategy), time.time())
+
+    def plan(self, supplier, kind, strategies, reorder=True):
+        """
+        Order strategies for one search
+
+        Args:
+            supplier: Supplier name
+            kind: Strategy kind
+            strategies: Strategy names in their default order
+            reorder: Sort by success rate (for equivalent strategies), or keep the given order
+
+        Returns:
+            Strategies to try, in order - without those that have stopped working
+        """
+        now = time.time()
+        with self._lock:
+            self._ensure_loaded()
+            counts = self._counts.get(supplier, {}).get(kind, {})
+
+            plan = []
+            skipped = []
+            for strategy in strategies:
+                entry = counts.get(strategy)
+                _, trials = self._decayed(entry, now)
+                cold = trials >= self.min_trials and self._rate(entry, now) < self.skip_below
+                if cold and random.random() >= self.explore:
+                    skipped.append(strategy)
+                    continue
+                plan.append((-self._rate(entry, now) if reorder else 0, strategy))
+
+            if not plan:
+                # Everything has stopped working - nothing to prefer, try them all
+                return list(strategies)
+
+            for strategy in skipped:
+                key = (supplier, kind, strategy)
+                self._skips[key] = self._skips.get(key, 0) + 1
+
+        # Sorting is stable, so ties keep the default order
+        return [strategy for _, strategy in sorted(plan, key=lambda item: item[0])]
+
+    def stats(self, supplier=None):
+        """Return rate, decayed trials and skips per strategy, by supplier and kind"""
+        now = time.time()
+        with self._lock:
+            self._ensure_loaded()
+            result = {}
+            for name, kinds in self._counts.items():
+                if supplier is not None and name != supplier:
+                    continue
+                result[name] = {
+                    kind: {
+                        strategy: {
+                            "rate": round(self._rate(entry, now), 3),
+                            "trials": round(self._decayed(entry, now)[1], 1),
+                            "skipped": self._skips.get((name, kind, strategy), 0),
+                        }
+                        for strategy, entry in strategies.items()
+                    }
+                    for kind, strategies in kinds.items()
+                }
+            return result.get(supplier, {}) if supplier is not None else result
+
+    def save(self):
+        """Add this process's observations since the last save to the stats file"""
+        with self._save_lock:
+            with self._lock:
+                if self.path is None or not self._loaded or self._pid != os.getpid():
+                    return
+                pending, self._pending = self._pending, {}
+                self._last_save = time.time()
+
+            try:
+                with self._file_locked():
+                    now = time.time()
+                    merged = self._merge(self._read(), pending, now)
+                    self._write({"saved_at": now, "suppliers": merged})
+            except OSError as e:
+                logger.warning(f"Could not save strategy stats to {self.path}: {str(e)}")
+                with self._lock:
+                    # Keep the observations for the next save
+                    self._merge(self._pending, pending, time.time())
+                return
+
+            with self._lock:
+                # Continue from every worker's counts, plus what was recorded while saving
+                self._counts = self._merge(merged, self._pending, now)
+
+    def _maybe_save(self, now):
+        with self._lock:
+            due = self.path is not None and now - self._last_save >= self.save_interval
+        if due:
+            self.save()
+
+    def _ensure_loaded(self):
+        # Caller holds the lock. Loads again after a fork, so a worker doesn't save its parent's observations.
+        if self._loaded and self._pid == os.getpid():
+            return
+        self._loaded = True
+        self._pid = os.getpid()
+        self._last_save = time.time()
+        self._pending = {}
+
+        if self.path is not None and os.path.exists(self.path):
+            self._counts = self._read()
+            logger.info(f"Loaded strategy stats from {self.path}")
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as file:
+                return json.load(file).get("suppliers", {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read strategy stats from {self.path}: {str(e)}")
+            return {}
+
+    def _write(self, data):
+        # Caller holds the file lock. Write a temp file next to the target and rename it into place.
+        directory = os.path.dirname(self.path) or "."
+        fd, temp_path = tempfile.mkstemp(prefix=".strategy_stats.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(data, file)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @contextmanager
+    def _file_locked(self):
+        # Serializes the read-merge-write across worker processes
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+
+        with open(self.path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _merge(self, into, counts, now):
+        # Add counts into another nested counts dictionary, both decayed to now. Returns into.
+        for supplier, kinds in counts.items():
+            for kind, strategies in kinds.items():
+                target = into.setdefault(supplier, {}).setdefault(kind, {})
+                for strategy, entry in strategies.items():
+                    successes, trials = self._decayed(entry, now)
+                    old_successes, old_trials = self._decayed(target.get(strategy), now)
+                    target[strategy] = [old_successes + successes, old_trials + trials, now]
+        return into
+
+    def _decayed(self, entry, now):
+        # (successes, trials) decayed to now
+        if entry is None:
+            return 0.0, 0.0
+        successes, trials, updated_at = entry
+        factor = 0.5 ** (max(0, now - updated_at) / self.half_life)
+        return successes * factor, trials * factor
+
+    def _rate(self, entry, now):
+        # One imaginary success in two trials keeps rarely tried strategies near 0.5
+        successes, trials = self._decayed(entry, now)
+        return (successes + 1) / (trials + 2)
+
+
+# Process-wide stats used by the scrapers, in memory until configured with a path
+strategy_stats = StrategyStats()
+atexit.register(strategy_stats.save)
@@ -0,0 +1,258 @@
+# scrapers/transport.py
+# Process-wide keep-alive connection pools shared by every supplier's requests sessions
+#
+# Sessions only carry cookies and headers. Connections live in one adapter per
+# process, pooled per host, so a search reuses the TCP/TLS connection a previous
+# search opened instead of paying DNS, connect and handshake again.
+
+import os
+import time
+import threading
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Hosts the scrapers talk to - the pool manager keeps at least this many per-host pools
+SUPPLIER_HOSTS = (
+    "importglasscorp.com",
+    "www.mygrantglass.com",
+    "shop.pilkington.com",
+    "identity.pilkington.com",
+    "buypgwautoglass.com",
+)
+
+
+class HostStats:
+    """Per-host connection counters, shared by all pools of one transport"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def record(self, host, counter):
+        with self._lock:
+            counters = self._hosts.setdefault(host, {"connections": 0, "reused": 0, "stale": 0})
+            counters[counter] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {host: dict(counters) for host, counters in self._hosts.items()}
+
+
+class KeepAlivePoolMixin:
+    """
+    Connection pool that stamps connections when they go idle and health-checks them
+    on checkout. urllib3 already drops sockets the server has closed; on top of that a
+    connection idle longer than idle_timeout is closed before use, since servers tend to
+    drop keep-alives silently and the next request on them would fail.
+    """
+
+    # Set by KeepAlivePoolManager when the pool is created
+    idle_timeout = 30
+    host_stats = None
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+
+        idle_since = getattr(conn, "idle_since", None)
+        if conn.sock is not None and idle_since is not None and time.monotonic() - idle_since > self.idle_timeout:
+            conn.close()
+            self._record("stale")
+
+        # A connection without a socket connects (DNS, TCP, TLS) when the request is sent
+        self._record("connections" if conn.sock is None else "reused")
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn.idle_since = time.monotonic()
+        super()._put_conn(conn)
+
+    def idle_count(self):
+        # The queue is padded with None placeholders for connections not opened yet
+        if self.pool is None:
+            return 0
+        return sum(1 for conn in list(self.pool.queue) if conn is not None and conn.sock is not None)
+
+    def _record(self, counter):
+        if self.host_stats is not None:
+            self.host_stats.record(self.host, counter)
+
+
+class KeepAliveHTTPConnectionPool(KeepAlivePoolMixin, HTTPConnectionPool):
+    pass
+
+
+class KeepAliveHTTPSConnectionPool(KeepAlivePoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class KeepAlivePoolManager(PoolManager):
+    def __init__(self, *args, idle_timeout=30, host_stats=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.idle_timeout = idle_timeout
+        self.host_stats = host_stats
+        self.pool_classes_by_scheme = {
+            "http": KeepAliveHTTPConnectionPool,
+            "https": KeepAliveHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool.idle_timeout = self.idle_timeout
+        pool.host_stats = self.host_stats
+        return pool
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter mounted on many sessions at once - closing a session leaves its pools open"""
+
+    def __init__(self, idle_timeout=30, host_stats=None, **kwargs):
+        self.idle_timeout = idle_timeout
+        self.host_stats = host_stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = KeepAlivePoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            idle_timeout=self.idle_timeout,
+            host_stats=self.host_stats,
+            **pool_kwargs
+        )
+
+    def close(self):
+        # Session.close() and "with requests.Session()" call this; the transport owns the pools
+        pass
+
+    def shutdown(self):
+        """Close every pooled connection"""
+        super().close()
+
+
+class Transport:
+    def __init__(self, pool_size=10, idle_timeout=30, max_hosts=16):
+        """
+        Initialize the transport
+
+        Args:
+            pool_size: Connections kept open per host (match the number of scraper threads)
+            idle_timeout: Seconds a pooled connection may sit unused before it is reopened
+            max_hosts: Number of per-host pools kept before the least recently used is closed
+        """
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.max_hosts = max(max_hosts, len(SUPPLIER_HOSTS))
+
+        self._lock = threading.Lock()
+        self._adapter = None
+        self._pid = None
+        self._host_stats = HostStats()
+
+    def configure(self, pool_size=None, idle_timeout=None, max_hosts=None):
+        """Change pool settings - sessions created afterwards get fresh pools"""
+        with self._lock:
+            if pool_size is not None:
+                self.pool_size = pool_size
+            if idle_timeout is not None:
+                self.idle_timeout = idle_timeout
+            if max_hosts is not None:
+                self.max_hosts = max(max_hosts, len(SUPPLIER_HOSTS))
+            self._replace_adapter()
+
+    def session(self, headers=None):
+        """
+        Create a cookie session that sends its requests over the shared pools
+
+        Args:
+            headers: Default headers for the session
+
+        Returns:
+            requests.Session
+        """
+        adapter = self.adapter()
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if headers:
+            session.headers.update(headers)
+        return session
+
+    def adapter(self):
+        """Return this process's shared adapter"""
+        if self._adapter is None or self._pid != os.getpid():
+            with self._lock:
+                if self._adapter is None or self._pid != os.getpid():
+                    # Sockets can't cross a fork, so a gunicorn worker starts with empty pools
+                    self._replace_adapter()
+        return self._adapter
+
+    def stats(self):
+        """Return per-host connection counts (new connections vs reused ones) and idle connections"""
+        hosts = self._host_stats.snapshot()
+        adapter = self._adapter
+
+        if adapter is not None and self._pid == os.getpid():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                counters = hosts.setdefault(pool.host, {"connections": 0, "reused": 0, "stale": 0})
+                counters["idle"] = counters.get("idle", 0) + pool.idle_count()
+
+        for counters in hosts.values():
+            counters.setdefault("idle", 0)
+            checkouts = counters["connections"] + counters["reused"]
+            counters["reuse_ratio"] = round(counters["reused"] / checkouts, 3) if checkouts else 0.0
+
+        return {
+            "pool_size": self.pool_size,
+            "idle_timeout": self.idle_timeout,
+            "hosts": hosts,
+        }
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            if self._adapter is not None and self._pid == os.getpid():
+                self._adapter.shutdown()
+            self._adapter = None
+
+    def _replace_adapter(self):
+        # Caller holds the lock
+        old = self._adapter if self._pid == os.getpid() else None
+        if self._adapter is not None and old is None:
+            logger.info("Reset HTTP connection pools after fork")
+            self._host_stats = HostStats()
+
+        self._adapter = KeepAliveAdapter(
+            idle_timeout=self.idle_timeout,
+            host_stats=self._host_stats,
+            pool_connections=self.max_hosts,
+            pool_maxsize=self.pool_size
+        )
+        self._pid = os.getpid()
+
+        # Sessions still holding the old adapter keep working, it just opens new connections
+        if old is not None:
+            old.shutdown()
+
+
+# Process-wide transport used by the blocking scrapers
+transport = Transport()
+
+
+def new_session(headers=None):
+    """Create a requests session on the process-wide connection pools"""
+    return transport.session(headers)
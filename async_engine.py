@@ -0,0 +1,182 @@
+# async_engine.py
+# asyncio scraping engine - runs every supplier fan-out on one background event loop
+
+import os
+import time
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+
+from Scrapers.async_scrapers import AsyncClient
+from scheduler import SchedulerBusy
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+class AsyncScrapingEngine:
+    def __init__(self, flows, supplier_limits=None, default_limit=25, max_pending=200,
+                 connection_limit=200, request_timeout=15, callback_workers=4):
+        """
+        Initialize the engine
+
+        Args:
+            flows: Dictionary of supplier name -> async flow(client, part_number)
+            supplier_limits: Dictionary of supplier name -> max searches in flight
+            default_limit: Max searches in flight for suppliers not in supplier_limits
+            max_pending: Maximum number of supplier searches queued or running
+            connection_limit: Size of the shared aiohttp connection pool
+            request_timeout: Total timeout for a single HTTP request in seconds
+            callback_workers: Threads used to run result callbacks (DB writes) off the loop
+        """
+        self.flows = flows
+        self.supplier_limits = dict(supplier_limits or {})
+        self.default_limit = default_limit
+        self.max_pending = max_pending
+        self.connection_limit = connection_limit
+        self.request_timeout = request_timeout
+        self.callback_workers = callback_workers
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._pid = None
+        self._client = None
+        self._semaphores = {}
+        self._callback_executor = None
+
+        # Counters for stats()
+        self._pending = 0
+        self._in_flight = {}
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, task_id, part_number, suppliers, on_result):
+        """
+        Start the fan-out for one task
+
+        Args:
+            task_id: Task the results belong to
+            part_number: Part number to search for
+            suppliers: List of supplier names to search
+            on_result: Callable(task_id, supplier, part_number, start_time, raw_results, error),
+                run in a worker thread as each supplier finishes
+
+        Raises:
+            SchedulerBusy: If the engine is already holding max_pending searches
+        """
+        suppliers = list(suppliers)
+        with self._lock:
+            if self._pending + len(suppliers) > self.max_pending:
+                self._rejected += len(suppliers)
+                logger.warning(f"Async engine full ({self._pending}/{self.max_pending}), rejecting {len(suppliers)} searches")
+                raise SchedulerBusy(f"Queue full ({self._pending} searches pending)")
+
+            self._ensure_loop()
+            self._pending += len(suppliers)
+
+        asyncio.run_coroutine_threadsafe(
+            self._fan_out(task_id, part_number, suppliers, on_result),
+            self._loop
+        )
+
+    def stats(self):
+        """Return a snapshot of pending and in-flight counts"""
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "in_flight": dict(self._in_flight),
+            }
+
+    def shutdown(self):
+        """Close HTTP sessions and stop the loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is None:
+            return
+
+        if self._client:
+            asyncio.run_coroutine_threadsafe(self._client.close(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        self._callback_executor.shutdown(wait=False)
+
+    def _ensure_loop(self):
+        """Start the event loop thread on first use (and again after a fork). Caller holds the lock."""
+        if self._loop is not None and self._pid == os.getpid():
+            return
+
+        self._pid = os.getpid()
+        self._client = None
+        self._semaphores = {}
+        self._loop = asyncio.new_event_loop()
+        self._callback_executor = ThreadPoolExecutor(max_workers=self.callback_workers)
+
+        self._thread = threading.Thread(target=self._run_loop, args=(self._loop,), name="async-scraper-loop")
+        self._thread.daemon = True
+        self._thread.start()
+
+        logger.info("Started async scraping engine")
+
+    def _run_loop(self, loop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def _semaphore(self, supplier):
+        # Created lazily so they bind to the engine's loop
+        if supplier not in self._semaphores:
+            limit = self.supplier_limits.get(supplier, self.default_limit)
+            self._semaphores[supplier] = asyncio.Semaphore(limit)
+        return self._semaphores[supplier]
+
+    def _get_client(self):
+        if self._client is None:
+            connector = aiohttp.TCPConnector(limit=self.connection_limit)
+            self._client = AsyncClient(connector, timeout=self.request_timeout)
+        return self._client
+
+    async def _fan_out(self, task_id, part_number, suppliers, on_result):
+        await asyncio.gather(*(
+            self._run_supplier(task_id, supplier, part_number, on_result)
+            for supplier in suppliers
+        ))
+
+    async def _run_supplier(self, task_id, supplier, part_number, on_result):
+        raw_results = None
+        error = None
+        start_time = time.time()
+
+        try:
+            async with self._semaphore(supplier):
+                with self._lock:
+                    self._in_flight[supplier] = self._in_flight.get(supplier, 0) + 1
+
+                start_time = time.time()
+                logger.info(f"Starting async {supplier} search for part: {part_number}")
+                try:
+                    raw_results = await self.flows[supplier](self._get_client(), part_number)
+                except Exception as e:
+                    error = e
+                finally:
+                    with self._lock:
+                        self._in_flight[supplier] -= 1
+
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self._callback_executor, on_result,
+                task_id, supplier, part_number, start_time, raw_results, error
+            )
+        except Exception as e:
+            logger.error(f"Error recording async {supplier} result for task {task_id}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
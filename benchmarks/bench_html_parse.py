@@ -0,0 +1,149 @@
+# bench_html_parse.py
+# Times and measures parsing supplier pages with each HTML backend, whole-document vs targeted
+#
+# Usage: python benchmarks/bench_html_parse.py [--rows 300] [--repeat 20] [--pages DIR]
+#
+# Without --pages the benchmark builds synthetic pages shaped like each supplier's
+# results. With --pages every <supplier>_<anything>.html file in DIR is used instead
+# (supplier one of igc, mygrant, pilkington, pwg), e.g. pages saved from a browser.
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from Scrapers.html_parser import TARGETS, HTMLParser
+
+# Target each supplier's results parsing uses
+SUPPLIER_TARGETS = {
+    "igc": "search_results",
+    "mygrant": "tables",
+    "pilkington": None,
+    "pwg": None,
+}
+
+# Page chrome around the results - menus, scripts and footers the scrapers never look at
+CHROME = (
+    '<head><title>Parts</title>' + '<script>var x = 1;</script>' * 20 + '</head>'
+    '<div class="nav">' + ''.join(f'<a href="/menu/{i}">Menu {i}</a>' for i in range(200)) + '</div>'
+    '<div class="footer">' + '<p>Footer text and links</p>' * 100 + '</div>'
+)
+
+
+def synthetic_pages(rows):
+    """Build one results page per supplier with the given number of result rows"""
+    igc_rows = ''.join(
+        f'<tr><td><a href="/product/DW{i:05d}">DW{i:05d}</a></td><td>Windshield {i}</td><td>OEM</td></tr>'
+        for i in range(rows)
+    )
+    mygrant_rows = ''.join(
+        f'<tr><td class="partnumber"><a>FW{i:05d}</a></td><td><span class="stock_in">In Stock</span></td>'
+        f'<td>Miami</td><td>${100 + i}.00</td></tr>'
+        for i in range(rows)
+    )
+    pilkington_rows = ''.join(
+        f'<tr><td>DW0{i} GTY</td><td>Windshield variant {i}</td><td>{100 + i}.50 USD</td></tr>'
+        for i in range(rows)
+    )
+    pwg_rows = ''.join(
+        f'<tr><td><font>DW2000{i}</font></td><td><font>In Stock</font></td><td>${10 + i}.00</td>'
+        f'<td><div class="options">» option {i}</div></td></tr>'
+        for i in range(rows)
+    )
+
+    return {
+        "igc": f'<html>{CHROME}<div id="customer-info">Customer</div><h4>Windshields</h4><table>{igc_rows}</table></html>',
+        "mygrant": f'<html>{CHROME}<table>{mygrant_rows}</table></html>',
+        "pilkington": f'<html>{CHROME}<span class="b2btext">Prices for Miami, FL</span><table>{pilkington_rows}</table></html>',
+        "pwg": f'<html>{CHROME}<span class="b2btext">Ship to :: Miami, FL</span><table><tr><th>Part</th></tr>{pwg_rows}</table></html>',
+    }
+
+
+def saved_pages(directory):
+    """Load saved pages named <supplier>_<anything>.html"""
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        supplier = name.split("_")[0]
+        if name.endswith(".html") and supplier in SUPPLIER_TARGETS:
+            with open(os.path.join(directory, name), "rb") as file:
+                pages[name[:-5]] = file.read().decode("utf-8", errors="replace")
+    return pages
+
+
+def available_backends():
+    backends = ["html.parser"]
+    try:
+        import lxml  # only checking that it is installed
+        backends.insert(0, "lxml")
+    except ImportError:
+        print("lxml is not installed, only html.parser is measured")
+    return backends
+
+
+def measure(html, backend, target, repeat):
+    """Return median milliseconds and peak KiB of memory for one parse"""
+    strainer = TARGETS[target] if target else None
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        BeautifulSoup(html, backend, parse_only=strainer)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    soup = BeautifulSoup(html, backend, parse_only=strainer)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del soup
+
+    return statistics.median(timings), peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=300, help="Result rows per synthetic page")
+    parser.add_argument("--repeat", type=int, default=20, help="Parses timed per measurement")
+    parser.add_argument("--pages", help="Directory of saved supplier pages to use instead of synthetic ones")
+    args = parser.parse_args()
+
+    pages = saved_pages(args.pages) if args.pages else synthetic_pages(args.rows)
+    backends = available_backends()
+
+    print(f"{'page':<20}{'KiB':>8}  {'backend':<12}{'parse':<22}{'ms':>9}{'peak KiB':>11}")
+    for name, html in pages.items():
+        target = SUPPLIER_TARGETS[name.split("_")[0]]
+        modes = [None] + ([target] if target else [])
+
+        baseline = None
+        for backend in backends[::-1]:
+            for mode in modes:
+                ms, peak = measure(html, backend, mode, args.repeat)
+                baseline = baseline or ms
+                label = f"only {mode}" if mode else "whole page"
+                print(f"{name:<20}{len(html) / 1024:>8.0f}  {backend:<12}{label:<22}{ms:>9.2f}{peak:>11.0f}"
+                      f"  ({baseline / ms:.1f}x)")
+
+    # The memo: a body parsed again (login check, second extraction pass) costs a dictionary lookup
+    html = next(iter(pages.values()))
+    memo = HTMLParser(backends[0])
+    start = time.perf_counter()
+    memo.parse(html)
+    first = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        memo.parse(html)
+    again = (time.perf_counter() - start) * 1000 / args.repeat
+
+    print()
+    print(f"same body parsed {args.repeat + 1} times through the memo: first {first:.2f} ms, "
+          f"then {again:.4f} ms per call ({memo.stats()['parses']} actual parse)")
+
+
+if __name__ == "__main__":
+    main()
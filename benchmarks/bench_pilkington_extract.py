@@ -0,0 +1,180 @@
+# bench_pilkington_extract.py
+# Times Pilkington result extraction on pages with many part number matches, legacy vs compiled single-pass
+#
+# Usage: python benchmarks/bench_pilkington_extract.py [--matches 25 50 100] [--repeat 3] [--part 2000] [--pages DIR]
+#
+# Without --pages the benchmark builds synthetic search pages: one where the
+# "DW02000 GTY" listings are found in the raw HTML (method 1), and one where only
+# the element search finds them (method 3). With --pages every pilkington_*.html
+# file in DIR is used instead, e.g. search pages saved from a browser.
+
+import os
+import re
+import sys
+import time
+import logging
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Scrapers.html_parser import html_parser, parse_html
+from Scrapers import pilkington_scraper
+from Scrapers.pilkington_scraper import extract_location, extract_parts
+
+# Quiet stand-in for the scraper logger, extraction logs every part it finds
+logger = logging.getLogger("bench")
+logger.disabled = True
+
+
+def legacy_extract_parts(page_text, partNo, logger):
+    """extract_parts as it shipped: patterns compiled per call, one soup search per potential part number"""
+    parts = []
+    soup = parse_html(page_text)
+    location = extract_location(soup)
+
+    specific_part_pattern = re.compile(rf'([DFB]W0*{partNo}\s+[A-Z]+)', re.IGNORECASE)
+    matches = specific_part_pattern.findall(page_text)
+    if matches:
+        for part_num in matches:
+            part_idx = page_text.find(part_num)
+            if part_idx >= 0:
+                context = page_text[max(0, part_idx - 10):min(len(page_text), part_idx + 500)]
+                desc_match = re.search(rf'{re.escape(part_num)}(.*?)(?:\d+\.\d+\s*USD|\$\d+\.\d+|<)', context, re.DOTALL)
+                description = re.sub(r'\s+', ' ', desc_match.group(1).strip() if desc_match else "Auto Glass")
+                price_match = re.search(r'(\d+\.\d+)\s*USD|\$(\d+\.\d+)', context)
+                price = f"${price_match.group(1) or price_match.group(2)}" if price_match else "Call for Price"
+                parts.append([part_num, description, price, location, "Found"])
+        if parts:
+            return parts
+
+    for row in soup.select("tr"):
+        if partNo in row.text.strip():
+            cells = row.find_all("td")
+            if len(cells) >= 2:
+                part_cell = cells[0].text.strip()
+                desc_cell = cells[1].text.strip()
+                part_match = re.search(rf'([DFB]W0*{partNo}\s*[A-Z]*)', part_cell, re.IGNORECASE)
+                part_number = part_match.group(1) if part_match else part_cell
+                price = "Call for Price"
+                for cell in cells:
+                    price_match = re.search(r'(\d+\.\d+)\s*USD|\$(\d+\.\d+)', cell.text)
+                    if price_match:
+                        price = f"${price_match.group(1) or price_match.group(2)}"
+                        break
+                parts.append([part_number, desc_cell or "Auto Glass", price, location, "Found"])
+    if parts:
+        return parts
+
+    potential_part_numbers = []
+    for pattern in [rf'DW0*{partNo}\s*[A-Z]*', rf'FW0*{partNo}\s*[A-Z]*', rf'BW0*{partNo}\s*[A-Z]*',
+                    rf'DB0*{partNo}\s*[A-Z]*', rf'FB0*{partNo}\s*[A-Z]*', rf'[A-Z]{{1,2}}0*{partNo}']:
+        potential_part_numbers.extend(re.findall(pattern, page_text, re.IGNORECASE))
+    if potential_part_numbers:
+        for part_num in potential_part_numbers:
+            for element in soup.find_all(string=re.compile(re.escape(part_num), re.IGNORECASE)):
+                parent = element.parent
+                if not parent:
+                    continue
+                container = parent
+                for _ in range(3):
+                    if container.parent:
+                        container = container.parent
+                container_text = container.text.strip()
+                desc_match = re.search(rf'{re.escape(str(part_num))}(.*?)(?:\d+\.\d+\s*USD|\$\d+\.\d+|$)', container_text, re.DOTALL)
+                description = re.sub(r'\s+', ' ', desc_match.group(1).strip() if desc_match else "Auto Glass")
+                price_match = re.search(r'(\d+\.\d+)\s*USD|\$(\d+\.\d+)', container_text)
+                price = f"${price_match.group(1) or price_match.group(2)}" if price_match else "Call for Price"
+                part_data = [part_num, description, price, location, "Found"]
+                if part_data not in parts:
+                    parts.append(part_data)
+        if parts:
+            return parts
+
+    # Method 4 (best guess) is unchanged apart from sharing compiled patterns
+    return pilkington_scraper.best_guess_parts(page_text, partNo, location, logger)
+
+
+def suffix(i):
+    """Letters-only variant suffix (A, B, ..., Z, BA, BB, ...) so every listing is a distinct part number"""
+    letters = ""
+    while True:
+        letters = chr(ord("A") + i % 26) + letters
+        i //= 26
+        if not i:
+            return letters
+
+
+def synthetic_pages(part, counts):
+    """Build raw-HTML (method 1) and element (method 3) search pages per match count"""
+    chrome = (
+        '<span class="b2btext">Prices for Miami, FL</span>'
+        '<div class="nav">' + ''.join(f'<a href="/menu/{i}">Menu {i}</a>' for i in range(200)) + '</div>'
+    )
+    pages = {}
+    for count in counts:
+        listings = ''.join(
+            f'<div class="product"><div class="name"><span>DW0{part} {suffix(i)}</span> Windshield variant {i}</div>'
+            f'<div class="price">{100 + i}.50 USD</div></div>'
+            for i in range(count)
+        )
+        pages[f"raw_html_{count}"] = f'<html><body>{chrome}{listings}</body></html>'
+
+        # No space between number and variant, so only the element search recognises the listings
+        listings = ''.join(
+            f'<div class="product"><div class="name"><span>DW0{part}{suffix(i)}</span><em>Windshield variant {i}</em></div>'
+            f'<div class="price">${100 + i}.50</div></div>'
+            for i in range(count)
+        )
+        pages[f"elements_{count}"] = f'<html><body>{chrome}{listings}</body></html>'
+    return pages
+
+
+def saved_pages(directory):
+    """Load saved pages named pilkington_<anything>.html"""
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.startswith("pilkington_") and name.endswith(".html"):
+            with open(os.path.join(directory, name), "rb") as file:
+                pages[name[:-5]] = file.read().decode("utf-8", errors="replace")
+    return pages
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, nargs="+", default=[25, 50, 100], help="Listings per synthetic page")
+    parser.add_argument("--repeat", type=int, default=3, help="Extractions timed per measurement")
+    parser.add_argument("--part", default="2000", help="Part number searched for")
+    parser.add_argument("--pages", help="Directory of saved Pilkington search pages to use instead of synthetic ones")
+    args = parser.parse_args()
+
+    pages = saved_pages(args.pages) if args.pages else synthetic_pages(args.part, args.matches)
+
+    # Both sides parse every time, so the timings compare extraction rather than the memo
+    html_parser.configure(memo_size=0)
+
+    print(f"{'page':<20}{'KiB':>8}{'parts':>8}{'legacy ms':>12}{'new ms':>10}{'speedup':>10}")
+    for name, html in pages.items():
+        legacy = legacy_extract_parts(html, args.part, logger)
+        current = extract_parts(html, args.part, logger)
+        if legacy != current:
+            print(f"{name}: results differ from the legacy extraction")
+            continue
+
+        legacy_ms = median_ms(lambda: legacy_extract_parts(html, args.part, logger), args.repeat)
+        new_ms = median_ms(lambda: extract_parts(html, args.part, logger), args.repeat)
+        print(f"{name:<20}{len(html) / 1024:>8.0f}{len(current):>8}{legacy_ms:>12.1f}{new_ms:>10.1f}"
+              f"{legacy_ms / new_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
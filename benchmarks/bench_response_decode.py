@@ -0,0 +1,110 @@
+# bench_response_decode.py
+# Counts and times response body decoding per search, plain requests .text vs decoded-once supplier responses
+#
+# Usage: python benchmarks/bench_response_decode.py [--searches 20] [--kib 120]
+#
+# Each search replays the .text reads the blocking scrapers made per response
+# before responses were wrapped (e.g. PWG: the search form page once, the results
+# page for the part number check and again for extraction). Responses are built
+# locally, so only decoding and charset detection are measured.
+
+import os
+import sys
+import time
+import argparse
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Scrapers.response import ResponseDecoder
+
+# .text reads per response in one search, by supplier
+READS_PER_SEARCH = {
+    "Import Glass Corp": [2],  # results, then the login check when nothing was found
+    "Mygrant Glass": [1],
+    "Pilkington": [1],
+    "PWG": [1, 2],  # search form page, then results
+}
+
+# Content-Type headers a supplier may send
+HEADER_CASES = {
+    "charset in header": "text/html; charset=utf-8",
+    "text/html, no charset": "text/html",
+    "no Content-Type": None,
+}
+
+
+class CountingResponse(requests.Response):
+    """requests response that counts body decodes and charset detections"""
+    decodes = 0
+    detections = 0
+
+    @property
+    def text(self):
+        CountingResponse.decodes += 1
+        return super().text
+
+    @property
+    def apparent_encoding(self):
+        CountingResponse.detections += 1
+        return super().apparent_encoding
+
+
+def build_response(body, content_type):
+    response = CountingResponse()
+    response.status_code = 200
+    response._content = body
+    if content_type:
+        response.headers['Content-Type'] = content_type
+    # What requests sets from the headers on a real response
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def build_body(kib):
+    """A results page with some non-ASCII text, so detection has work to do"""
+    row = '<tr><td>DW02000 GTY</td><td>Pare-brise acoustique - Ühlenbrock & Søn</td><td>$120.50</td></tr>'
+    return f'<html><body><table>{row * (kib * 1024 // len(row))}</table></body></html>'.encode('utf-8')
+
+
+def run(body, content_type, searches, wrap):
+    """Replay the searches, returning (decodes, detections, ms, whether the text decoded correctly)"""
+    CountingResponse.decodes = CountingResponse.detections = 0
+    decoder = ResponseDecoder()
+
+    start = time.perf_counter()
+    for _ in range(searches):
+        for supplier, reads in READS_PER_SEARCH.items():
+            for count in reads:
+                response = build_response(body, content_type)
+                if wrap:
+                    response = decoder.wrap(supplier, response)
+                for _ in range(count):
+                    text = response.text
+    ms = (time.perf_counter() - start) * 1000
+
+    decodes = decoder.stats()["decodes"] if wrap else CountingResponse.decodes
+    return decodes, CountingResponse.detections, ms, text == body.decode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--searches", type=int, default=20, help="Searches replayed per supplier")
+    parser.add_argument("--kib", type=int, default=120, help="Size of each response body")
+    args = parser.parse_args()
+
+    body = build_body(args.kib)
+    responses = args.searches * sum(len(reads) for reads in READS_PER_SEARCH.values())
+    print(f"{args.searches} searches per supplier, {responses} responses of {len(body) / 1024:.0f} KiB")
+    print()
+    print(f"{'headers':<24}{'responses':<22}{'decodes':>9}{'detections':>12}{'ms':>10}  text")
+
+    for case, content_type in HEADER_CASES.items():
+        for label, wrap in (("requests .text", False), ("decoded once", True)):
+            decodes, detections, ms, correct = run(body, content_type, args.searches, wrap)
+            print(f"{case:<24}{label:<22}{decodes:>9}{detections:>12}{ms:>10.1f}  {'ok' if correct else 'mojibake'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# bench_task_lookup.py
+# Times the task database lookups on a large history, before and after the migrations add indexes
+#
+# Usage: python benchmarks/bench_task_lookup.py [--tasks 100000] [--lookups 200]
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import ConnectionPool
+from migrations import migrate
+
+SUPPLIERS = ["Import Glass Corp", "Mygrant Glass", "Pilkington", "PWG"]
+
+# The schema.sql layout the app shipped with: no indexes beyond the primary keys
+LEGACY_SCHEMA = """
+CREATE TABLE tasks (
+    task_id TEXT PRIMARY KEY,
+    part_number TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    all_completed BOOLEAN NOT NULL DEFAULT 0,
+    completed_count INTEGER NOT NULL DEFAULT 0,
+    scrapers TEXT NOT NULL
+);
+
+CREATE TABLE task_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id TEXT NOT NULL,
+    scraper_name TEXT NOT NULL,
+    supplier TEXT NOT NULL,
+    part_number TEXT NOT NULL,
+    success BOOLEAN NOT NULL DEFAULT 0,
+    message TEXT,
+    time_taken REAL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT 0,
+    results_json TEXT,
+    FOREIGN KEY (task_id) REFERENCES tasks (task_id)
+);
+"""
+
+
+def populate(path, task_count):
+    """Create a legacy database holding task_count finished tasks"""
+    db = sqlite3.connect(path)
+    db.executescript(LEGACY_SCHEMA)
+
+    now = time.time()
+    results_json = json.dumps([{"part_number": "DW01234", "price": "$100.00", "location": "Here"}])
+    scrapers = json.dumps(SUPPLIERS)
+
+    db.executemany(
+        'INSERT INTO tasks (task_id, part_number, start_time, all_completed, completed_count, scrapers) VALUES (?, ?, ?, 1, 4, ?)',
+        ((f"task-{i}", f"DW{i % 5000:05d}", now - i, scrapers) for i in range(task_count))
+    )
+    db.executemany(
+        'INSERT INTO task_results (task_id, scraper_name, supplier, part_number, success, message, time_taken, completed, results_json) VALUES (?, ?, ?, ?, 1, ?, 1.0, 1, ?)',
+        ((f"task-{i}", supplier, supplier, f"DW{i % 5000:05d}", "Search completed successfully", results_json)
+         for i in range(task_count) for supplier in SUPPLIERS)
+    )
+    db.commit()
+    db.close()
+
+
+def time_queries(pool, task_count, lookups):
+    """Return average milliseconds for each query the app runs against the task tables"""
+    task_ids = [f"task-{random.randrange(task_count)}" for _ in range(lookups)]
+    cutoff = time.time() - task_count // 2
+
+    queries = {
+        "load task results (task_id)": lambda db, task_id: db.execute(
+            'SELECT * FROM task_results WHERE task_id = ?', (task_id,)).fetchall(),
+        "update result (task_id, scraper)": lambda db, task_id: db.execute(
+            'SELECT id FROM task_results WHERE task_id = ? AND scraper_name = ?', (task_id, "PWG")).fetchall(),
+        "expired tasks (start_time)": lambda db, task_id: db.execute(
+            'SELECT task_id FROM tasks WHERE start_time < ? LIMIT 500', (cutoff,)).fetchall(),
+        "oldest task (start_time)": lambda db, task_id: db.execute(
+            'SELECT MIN(start_time) FROM tasks').fetchone(),
+    }
+
+    timings = {}
+    with pool.connection() as db:
+        for name, query in queries.items():
+            start = time.perf_counter()
+            for task_id in task_ids:
+                query(db, task_id)
+            timings[name] = (time.perf_counter() - start) / lookups * 1000
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100000, help="Number of tasks in the history")
+    parser.add_argument("--lookups", type=int, default=200, help="Lookups timed per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+
+        print(f"Populating {args.tasks} tasks ({args.tasks * len(SUPPLIERS)} results)...")
+        populate(path, args.tasks)
+
+        pool = ConnectionPool(path, size=1)
+        before = time_queries(pool, args.tasks, args.lookups)
+
+        start = time.perf_counter()
+        version = migrate(pool)
+        print(f"Migrated to schema version {version} in {time.perf_counter() - start:.2f}s")
+
+        after = time_queries(pool, args.tasks, args.lookups)
+        pool.close()
+
+    print()
+    print(f"{'query':<36}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<36}{before[name]:>14.3f}{after[name]:>14.3f}{speedup:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# database.py
+# Thread-safe SQLite connection pool with WAL mode and tuned pragmas
+
+import os
+import queue
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# Applied to every new connection
+DEFAULT_PRAGMAS = {
+    "auto_vacuum": "INCREMENTAL",    # only takes on a new database, must precede journal_mode
+    "journal_mode": "WAL",           # readers never block on the writer
+    "synchronous": "NORMAL",         # fsync at checkpoints only, safe with WAL
+    "busy_timeout": 5000,            # wait for the write lock instead of failing
+    "cache_size": -16000,            # 16 MB page cache per connection
+    "mmap_size": 268435456,          # 256 MB memory-mapped reads
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+
+class PoolExhausted(Exception):
+    """Raised when no connection is returned to the pool within the timeout"""
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, database, size=16, timeout=10, pragmas=None):
+        """
+        Initialize the pool
+
+        Args:
+            database: Path to the SQLite database
+            size: Maximum number of open connections
+            timeout: Seconds to wait for a free connection before raising PoolExhausted
+            pragmas: Dictionary of pragma name -> value, overriding DEFAULT_PRAGMAS
+        """
+        self.database = database
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        self.pragmas.update(pragmas or {})
+
+        self._lock = threading.Lock()
+        self._idle = queue.LifoQueue()
+        self._pid = os.getpid()
+
+        # Counters for stats()
+        self._opened = 0
+        self._waits = 0
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for reads (autocommit mode)"""
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    @contextmanager
+    def transaction(self):
+        """Borrow a connection and run the block in one write transaction"""
+        with self.connection() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+
+    @contextmanager
+    def snapshot(self):
+        """Borrow a connection and run the block's reads against one consistent snapshot"""
+        with self.connection() as connection:
+            connection.execute('BEGIN')
+            try:
+                yield connection
+            finally:
+                connection.execute('COMMIT')
+
+    def acquire(self):
+        """Take a connection out of the pool, opening one if below size"""
+        self._check_fork()
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                opened = True
+            else:
+                self._waits += 1
+                opened = False
+
+        if opened:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            connection = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolExhausted(f"No database connection free after {self.timeout}s ({self.size} open)")
+        return connection
+
+    def release(self, connection):
+        """Return a borrowed connection to the pool"""
+        # Never hand on a connection that is mid-transaction
+        if connection.in_transaction:
+            connection.rollback()
+
+        if self._pid != os.getpid():
+            return
+        self._idle.put(connection)
+
+    def stats(self):
+        """Return open, idle and wait counts"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._opened,
+                "idle": self._idle.qsize(),
+                "waits": self._waits,
+            }
+
+    def close(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            connection.close()
+            with self._lock:
+                self._opened -= 1
+
+    def _connect(self):
+        connection = sqlite3.connect(self.database, isolation_level=None, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}').fetchall()
+        return connection
+
+    def _check_fork(self):
+        # Connections can't cross a fork, so a gunicorn worker starts with an empty pool
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._idle = queue.LifoQueue()
+            self._opened = 0
+        logger.info("Reset database pool after fork")
@@ -0,0 +1,150 @@
+# db_writer.py
+# Group-commit writer - batches task result updates from scraper threads into few transactions
+
+import os
+import time
+import queue
+import threading
+import logging
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+class DBWriter:
+    def __init__(self, pool, flush_interval=0.005, max_batch=200):
+        """
+        Initialize the writer
+
+        Args:
+            pool: Database ConnectionPool to write through
+            flush_interval: Seconds to keep collecting writes after the first one arrives
+            max_batch: Maximum number of writes committed in one transaction
+        """
+        self.pool = pool
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._queue = queue.Queue()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._pid = None
+
+        # Writes are numbered in submit order, the writer commits them in that order
+        self._submitted = 0
+        self._committed = 0
+        self._task_marks = {}
+
+        # Counters for stats()
+        self._batches = 0
+        self._failed = 0
+        self._largest_batch = 0
+
+    def submit(self, task_id, statements):
+        """
+        Queue a write for the next group commit
+
+        Args:
+            task_id: Task the write belongs to (used by flush)
+            statements: List of (sql, params) tuples applied together. A list of
+                parameter tuples runs the statement once per tuple (executemany).
+        """
+        with self._condition:
+            self._ensure_thread()
+            self._submitted += 1
+            seq = self._submitted
+            self._task_marks[task_id] = seq
+
+            # Queued under the lock so writes reach the writer in sequence order
+            self._queue.put((seq, task_id, statements))
+
+    def flush(self, task_id=None, timeout=5):
+        """
+        Block until writes submitted so far are committed
+
+        Args:
+            task_id: Only wait for this task's writes (all writes if None)
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the writes are committed, False on timeout
+        """
+        with self._condition:
+            if task_id is None:
+                target = self._submitted
+            else:
+                target = self._task_marks.get(task_id, 0)
+            return self._condition.wait_for(lambda: self._committed >= target, timeout)
+
+    def stats(self):
+        """Return queue depth and batching counters"""
+        with self._condition:
+            return {
+                "queued": self._submitted - self._committed,
+                "committed": self._committed,
+                "batches": self._batches,
+                "largest_batch": self._largest_batch,
+                "failed": self._failed,
+            }
+
+    def _ensure_thread(self):
+        # Start the writer on first use (and again after a fork). Caller holds the condition.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="db-writer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+
+            # Give other scrapers a few milliseconds to join the same commit
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.time()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._commit(batch)
+
+            with self._condition:
+                self._committed = batch[-1][0]
+                self._batches += 1
+                self._largest_batch = max(self._largest_batch, len(batch))
+
+                for _, task_id, _ in batch:
+                    if self._task_marks.get(task_id, 0) <= self._committed:
+                        self._task_marks.pop(task_id, None)
+
+                self._condition.notify_all()
+
+    def _commit(self, batch):
+        try:
+            with self.pool.transaction() as db:
+                for _, _, statements in batch:
+                    self._apply(db, statements)
+            return
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} writes failed, retrying one by one: {str(e)}")
+
+        # Isolate the bad write so it doesn't take the rest of the batch with it
+        for _, task_id, statements in batch:
+            try:
+                with self.pool.transaction() as db:
+                    self._apply(db, statements)
+            except Exception as e:
+                with self._condition:
+                    self._failed += 1
+                logger.error(f"Database error writing task {task_id}: {str(e)}")
+
+    def _apply(self, db, statements):
+        for sql, params in statements:
+            if isinstance(params, list):
+                db.executemany(sql, params)
+            else:
+                db.execute(sql, params)
@@ -0,0 +1,139 @@
+# expiry.py
+# Removes expired tasks in small set-based batches so cleanup never stalls live writes
+
+import time
+import heapq
+import threading
+import logging
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on bound parameters is 999
+MAX_BATCH_SIZE = 900
+
+
+class TaskExpiry:
+    def __init__(self, pool, max_age=3600, batch_size=500, max_pause=0.05, vacuum_pages=1000):
+        """
+        Initialize expiry
+
+        Args:
+            pool: Database ConnectionPool
+            max_age: Seconds a task is kept after it started
+            batch_size: Tasks deleted per transaction to start with, adjusted to stay under max_pause
+            max_pause: Longest a single delete or vacuum step may hold the write lock, in seconds
+            vacuum_pages: Free pages returned to the filesystem per incremental vacuum step
+        """
+        self.pool = pool
+        self.max_age = max_age
+        self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+        self.max_pause = max_pause
+        self.vacuum_pages = vacuum_pages
+
+        # (start_time, task_id) for tasks held in this process's memory, and their ids
+        self._heap = []
+        self._tracked = set()
+        self._lock = threading.Lock()
+
+    def track(self, task_id, start_time):
+        """Remember a task held in memory so it can be dropped once it expires - once per task,
+        however often it is reloaded"""
+        with self._lock:
+            if task_id in self._tracked:
+                return
+            self._tracked.add(task_id)
+            heapq.heappush(self._heap, (start_time, task_id))
+
+    def pop_expired(self, now=None):
+        """
+        Remove and return the in-memory tasks that have expired, oldest first.
+        Only the expired entries are touched, not every task in memory.
+        """
+        cutoff = (now or time.time()) - self.max_age
+        expired = []
+
+        with self._lock:
+            while self._heap and self._heap[0][0] < cutoff:
+                task_id = heapq.heappop(self._heap)[1]
+                self._tracked.discard(task_id)
+                expired.append(task_id)
+        return expired
+
+    def purge(self, now=None):
+        """
+        Delete expired tasks (their results and parts cascade) in batches, then return freed pages
+        to the filesystem with incremental vacuum
+
+        Returns:
+            Dictionary with the task ids deleted and how many rows and bytes were reclaimed
+            (no bytes on a database migrate() couldn't switch to incremental auto_vacuum)
+        """
+        cutoff = (now or time.time()) - self.max_age
+        started = time.time()
+        report = {"task_ids": [], "tasks": 0, "results": 0, "parts": 0, "batches": 0, "bytes_reclaimed": 0}
+
+        while True:
+            batch_started = time.time()
+            with self.pool.transaction() as db:
+                task_ids = [row[0] for row in db.execute(
+                    'SELECT task_id FROM tasks WHERE start_time < ? ORDER BY start_time LIMIT ?',
+                    (cutoff, self.batch_size)
+                )]
+                if not task_ids:
+                    break
+
+                placeholders = ",".join("?" * len(task_ids))
+                results = db.execute(
+                    f'SELECT COUNT(*) FROM task_results WHERE task_id IN ({placeholders})', task_ids
+                ).fetchone()[0]
+                parts = db.execute(
+                    f'SELECT COUNT(*) FROM parts WHERE task_id IN ({placeholders})', task_ids
+                ).fetchone()[0]
+                db.execute(f'DELETE FROM tasks WHERE task_id IN ({placeholders})', task_ids)
+
+            elapsed = time.time() - batch_started
+            report["task_ids"].extend(task_ids)
+            report["tasks"] += len(task_ids)
+            report["results"] += results
+            report["parts"] += parts
+            report["batches"] += 1
+
+            if len(task_ids) < self.batch_size:
+                break
+
+            self._adjust_batch_size(elapsed)
+
+            # Let queued writers in before taking the lock again
+            time.sleep(min(elapsed, self.max_pause))
+
+        if report["tasks"]:
+            report["bytes_reclaimed"] = self._incremental_vacuum()
+
+        report["seconds"] = time.time() - started
+        return report
+
+    def _adjust_batch_size(self, elapsed):
+        # Shrink batches that held the lock too long, grow ones that finished well inside the cap
+        if elapsed > self.max_pause:
+            self.batch_size = max(10, self.batch_size // 2)
+        elif elapsed < self.max_pause / 2:
+            self.batch_size = min(MAX_BATCH_SIZE, int(self.batch_size * 1.5))
+
+    def _incremental_vacuum(self):
+        with self.pool.connection() as db:
+            # Databases migrate() couldn't rebuild with incremental auto_vacuum keep their free pages for reuse
+            if db.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                return 0
+
+            page_size = db.execute('PRAGMA page_size').fetchone()[0]
+            before = db.execute('PRAGMA page_count').fetchone()[0]
+
+            while db.execute('PRAGMA freelist_count').fetchone()[0] > 0:
+                step_started = time.time()
+                # Run to completion - a plain execute() steps the pragma once, freeing a single page
+                db.executescript(f'PRAGMA incremental_vacuum({self.vacuum_pages});')
+                time.sleep(min(time.time() - step_started, self.max_pause))
+
+            after = db.execute('PRAGMA page_count').fetchone()[0]
+        return (before - after) * page_size
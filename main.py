@@ -321,14 +321,14 @@
 # app.py
 # Flask application for glass part scraping with SQLite persistence
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session, g
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session, g, Response
 import asyncio
 import threading
 import time
 import logging
 import os
 import json
-import sqlite3
+import copy
 from datetime import datetime
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor
@@ -340,6 +340,28 @@ from Scrapers.mygrant_scraper import MyGrantScraper
 from Scrapers.pilkington_scraper import PilkingtonScraper
 from Scrapers.pwg_scraper import PWGScraper
 
+from scheduler import ScraperScheduler, ScrapeJob, SchedulerBusy
+from async_engine import AsyncScrapingEngine
+from result_cache import ResultCache
+from singleflight import SingleFlight
+from task_store import TaskStore
+from task_cache import TaskCache
+from task_registry import TaskRegistry
+from database import ConnectionPool
+from db_writer import DBWriter
+from migrations import migrate
+from expiry import TaskExpiry
+from parts import INSERT_PART_SQL, SELECT_PART_COLUMNS, part_rows, rebuild_part
+from Scrapers.async_scrapers import FLOWS as ASYNC_FLOWS
+from Scrapers.transport import transport
+from Scrapers import session_broker, hedging
+from Scrapers.cookie_store import cookie_store
+from Scrapers.html_parser import html_parser
+from Scrapers.parse_executor import parse_executor
+from Scrapers.response import response_decoder
+from Scrapers.strategy_stats import strategy_stats
+from Scrapers.default_parts import is_default_parts
+
 # Load environment variables
 load_dotenv()
 
@@ -360,138 +382,216 @@ app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'dev_secret_key')  # Set a secure secret key in production
 
 # Database configuration
-DATABASE = 'glass_scraper.db'
+DATABASE = os.getenv('DATABASE', 'glass_scraper.db')
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 16))
+DB_FLUSH_INTERVAL = float(os.getenv('DB_FLUSH_INTERVAL', 0.005))
+
+# Runtime state shared by the workers (supplier cookies, strategy stats) - kept out of the source tree
+DATA_DIR = os.getenv('DATA_DIR', 'data')
+
+# Scraper pool configuration
+SCRAPER_WORKERS = int(os.getenv('SCRAPER_WORKERS', 8))
+SCRAPER_QUEUE_LIMIT = int(os.getenv('SCRAPER_QUEUE_LIMIT', 200))
+
+# Scraping engine: 'threads' (worker pool) or 'async' (single event loop)
+SCRAPER_ENGINE = os.getenv('SCRAPER_ENGINE', 'threads')
+ASYNC_SUPPLIER_CONCURRENCY = int(os.getenv('ASYNC_SUPPLIER_CONCURRENCY', 25))
+
+# Keep-alive connections to supplier sites, shared by all searches in a worker
+TRANSPORT_POOL_SIZE = int(os.getenv('TRANSPORT_POOL_SIZE', 10))
+TRANSPORT_IDLE_TIMEOUT = float(os.getenv('TRANSPORT_IDLE_TIMEOUT', 30))
+
+# Logged-in sessions kept per supplier, replaced this many seconds before they expire
+SUPPLIER_SESSIONS = int(os.getenv('SUPPLIER_SESSIONS', 2))
+SESSION_REFRESH_MARGIN = int(os.getenv('SESSION_REFRESH_MARGIN', 120))
+
+# Supplier cookies shared by the workers, trusted without a validation request for COOKIE_VALIDATION_WINDOW seconds
+COOKIE_DIR = os.getenv('COOKIE_DIR', os.path.join(DATA_DIR, 'cookies'))
+COOKIE_VALIDATION_WINDOW = int(os.getenv('COOKIE_VALIDATION_WINDOW', 600))
+
+# HTML backend for the scrapers ('lxml' or 'html.parser'), the fastest installed if unset
+HTML_PARSER = os.getenv('HTML_PARSER')
+
+# Worker processes for result extraction (0 parses in the scraper threads), pages under PARSE_INLINE_BYTES stay inline
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', 0))
+PARSE_INLINE_BYTES = int(os.getenv('PARSE_INLINE_BYTES', 16384))
+
+# Seconds a hedged supplier search may take across all of its fallback URLs
+SEARCH_DEADLINES = {
+    "Pilkington": float(os.getenv('PILKINGTON_SEARCH_DEADLINE', 10)),
+}
+
+# Success rates of supplier search URLs and extraction methods, decaying with a half-life of STRATEGY_HALF_LIFE seconds
+STRATEGY_STATS_FILE = os.getenv('STRATEGY_STATS_FILE', os.path.join(DATA_DIR, 'strategy_stats.json'))
+STRATEGY_HALF_LIFE = float(os.getenv('STRATEGY_HALF_LIFE', 86400))
+
+# Charsets for supplier pages that don't name one, e.g. 'PWG=windows-1252,Pilkington=utf-8' (detected once if unset)
+RESPONSE_CHARSETS = {
+    name.strip(): charset.strip()
+    for name, charset in (item.split('=', 1) for item in os.getenv('RESPONSE_CHARSETS', '').split(',') if '=' in item)
+}
+
+# Max concurrent searches against each supplier site
+SUPPLIER_CONCURRENCY = {
+    "Import Glass Corp": 2,
+    "Mygrant Glass": 2,
+    "Pilkington": 2,
+    "PWG": 2
+}
+
+# Progress stream configuration (seconds) - each open stream holds a request thread, so only
+# STREAM_MAX_CONNECTIONS streams are served per worker and the rest of the pages poll /api/status
+STREAM_KEEPALIVE = 15
+STREAM_MAX_DURATION = 30
+STREAM_MAX_CONNECTIONS = int(os.getenv('STREAM_MAX_CONNECTIONS', 3))
+
+# Task expiry - how long tasks are kept and how long a cleanup batch may hold the write lock (seconds)
+TASK_MAX_AGE = int(os.getenv('TASK_MAX_AGE', 3600))
+CLEANUP_INTERVAL = 300
+CLEANUP_MAX_PAUSE = 0.05
+
+# Task cache budget - completed tasks are evicted least recently used first
+TASK_CACHE_ENTRIES = int(os.getenv('TASK_CACHE_ENTRIES', 1000))
+TASK_CACHE_BYTES = int(os.getenv('TASK_CACHE_BYTES', 64 * 1024 * 1024))
+STATUS_CACHE_BYTES = 8 * 1024 * 1024
+
+# How often a worker checks for progress on tasks started by another worker (seconds)
+TASK_POLL_INTERVAL = float(os.getenv('TASK_POLL_INTERVAL', 0.5))
+
+# Result cache configuration - seconds a supplier's result stays fresh
+RESULT_CACHE_TTL = {
+    "Import Glass Corp": 900,
+    "Mygrant Glass": 600,
+    "Pilkington": 900,
+    "PWG": 600
+}
+RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', 500))
+
+# Available scrapers
+SCRAPERS = {
+    "Import Glass Corp": IGCScraper,
+    "Mygrant Glass": MyGrantScraper,
+    "Pilkington": PilkingtonScraper,
+    "PWG": PWGScraper
+}
+
+# Shared connection pool - WAL mode, one pool per worker process
+db_pool = ConnectionPool(DATABASE, size=DB_POOL_SIZE)
+
+# Result writes are batched into group commits off the scraper threads
+db_writer = DBWriter(db_pool, flush_interval=DB_FLUSH_INTERVAL)
 
 def get_db():
     db = getattr(g, '_database', None)
     if db is None:
-        db = g._database = sqlite3.connect(DATABASE)
-        db.row_factory = sqlite3.Row
+        db = g._database = db_pool.acquire()
     return db
 
-def init_db():
-    with app.app_context():
-        db = get_db()
-        with app.open_resource('schema.sql', mode='r') as f:
-            db.executescript(f.read())
-        db.commit()
-
 @app.teardown_appcontext
 def close_connection(exception):
-    db = getattr(g, '_database', None)
+    db = g.pop('_database', None)
     if db is not None:
-        db.close()
-
-# Create schema.sql file if it doesn't exist
-def create_schema_file():
-    schema_content = """-- Drop tables if they already exist
-DROP TABLE IF EXISTS tasks;
-DROP TABLE IF EXISTS task_results;
-
--- Create tables
-CREATE TABLE tasks (
-    task_id TEXT PRIMARY KEY,
-    part_number TEXT NOT NULL,
-    start_time REAL NOT NULL,
-    all_completed BOOLEAN NOT NULL DEFAULT 0,
-    completed_count INTEGER NOT NULL DEFAULT 0,
-    scrapers TEXT NOT NULL
-);
-
-CREATE TABLE task_results (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    task_id TEXT NOT NULL,
-    scraper_name TEXT NOT NULL,
-    supplier TEXT NOT NULL,
-    part_number TEXT NOT NULL,
-    success BOOLEAN NOT NULL DEFAULT 0,
-    message TEXT,
-    time_taken REAL DEFAULT 0,
-    completed BOOLEAN NOT NULL DEFAULT 0,
-    results_json TEXT,
-    FOREIGN KEY (task_id) REFERENCES tasks (task_id)
-);"""
-    
-    schema_file = os.path.join(os.path.dirname(__file__), 'schema.sql')
-    if not os.path.exists(schema_file):
-        with open(schema_file, 'w') as f:
-            f.write(schema_content)
-        logger.info("Created schema.sql file")
-
-# Initialize database if it doesn't exist
+        db_pool.release(db)
+
+# Bring the database schema up to date (safe to run from every worker)
 def initialize_db():
-    create_schema_file()
-    
-    if not os.path.exists(DATABASE):
-        with app.app_context():
-            init_db()
-            logger.info("Database initialized")
+    version = migrate(db_pool)
+    logger.info(f"Database schema at version {version}")
+
+# Flags kept alongside a result in the task_results summary column
+SUMMARY_FIELDS = ("cached", "cache_age", "coalesced")
+
+def summarize_result(result):
+    """Small JSON of the result's flags, so status reads never need the parts"""
+    return json.dumps({field: result[field] for field in SUMMARY_FIELDS if field in result})
 
 # Database helper functions
 def save_task_to_db(task_id, task_data):
     """Save task to SQLite database"""
-    db = get_db()
     try:
-        # Insert task record
-        db.execute(
-            'INSERT INTO tasks (task_id, part_number, start_time, all_completed, completed_count, scrapers) VALUES (?, ?, ?, ?, ?, ?)',
-            (task_id, task_data["part_number"], task_data["start_time"], 
-             task_data["all_completed"], task_data["completed_count"], 
-             json.dumps(task_data["scrapers"]))
-        )
-        
-        # Insert initial results for each scraper
-        for scraper_name, result in task_data["results"].items():
+        with db_pool.transaction() as db:
+            # Insert task record
             db.execute(
-                'INSERT INTO task_results (task_id, scraper_name, supplier, part_number, success, message, time_taken, completed, results_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
-                (task_id, scraper_name, result["supplier"], result["part_number"], 
-                 result["success"], result["message"], result["time_taken"], 
-                 result["completed"], json.dumps(result.get("results", [])))
+                'INSERT INTO tasks (task_id, part_number, start_time, all_completed, completed_count, scrapers, version) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (task_id, task_data["part_number"], task_data["start_time"], 
+                 task_data["all_completed"], task_data["completed_count"], 
+                 json.dumps(task_data["scrapers"]), task_data["version"])
             )
-        
-        db.commit()
+            
+            # Insert initial results for each scraper
+            db.executemany(
+                'INSERT INTO task_results (task_id, scraper_name, supplier, part_number, success, message, time_taken, completed, result_count, summary) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(task_id, scraper_name, result["supplier"], result["part_number"], 
+                  result["success"], result["message"], result["time_taken"], 
+                  result["completed"], len(result.get("results", [])), summarize_result(result))
+                 for scraper_name, result in task_data["results"].items()]
+            )
+            
+            # Bulk insert any parts the initial results already carry
+            db.executemany(INSERT_PART_SQL, [
+                row
+                for scraper_name, result in task_data["results"].items()
+                for row in part_rows(task_id, scraper_name, result.get("results", []))
+            ])
     except Exception as e:
-        db.rollback()
         logger.error(f"Database error saving task: {str(e)}")
 
-def update_task_result_in_db(task_id, scraper_name, result):
-    """Update a specific scraper result in the database"""
-    db = get_db()
-    try:
-        db.execute(
-            'UPDATE task_results SET success = ?, message = ?, time_taken = ?, completed = ?, results_json = ? WHERE task_id = ? AND scraper_name = ?',
-            (result["success"], result["message"], result["time_taken"], 
-             result["completed"], json.dumps(result.get("results", [])), 
-             task_id, scraper_name)
-        )
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Database error updating task result: {str(e)}")
+def record_task_result_in_db(task_id, scraper_name, result, completed_count, all_completed, version):
+    """Queue a scraper result and the task's new completion status for the next group commit"""
+    db_writer.submit(task_id, [
+        ('UPDATE task_results SET success = ?, message = ?, time_taken = ?, completed = ?, result_count = ?, summary = ? WHERE task_id = ? AND scraper_name = ?',
+         (result["success"], result["message"], result["time_taken"], 
+          result["completed"], len(result.get("results", [])), summarize_result(result),
+          task_id, scraper_name)),
+        ('DELETE FROM parts WHERE task_id = ? AND supplier = ?', (task_id, scraper_name)),
+        (INSERT_PART_SQL, part_rows(task_id, scraper_name, result.get("results", []))),
+        ('UPDATE tasks SET completed_count = ?, all_completed = ?, version = ? WHERE task_id = ?',
+         (completed_count, all_completed, version, task_id)),
+    ])
 
-def update_task_completion_in_db(task_id, completed_count, all_completed):
-    """Update task completion status"""
-    db = get_db()
+def delete_task_from_db(task_id):
+    """Delete a task and its results from the database"""
     try:
-        db.execute(
-            'UPDATE tasks SET completed_count = ?, all_completed = ? WHERE task_id = ?',
-            (completed_count, all_completed, task_id)
-        )
-        db.commit()
+        with db_pool.transaction() as db:
+            # task_results rows go with it (ON DELETE CASCADE)
+            db.execute('DELETE FROM tasks WHERE task_id = ?', (task_id,))
     except Exception as e:
-        db.rollback()
-        logger.error(f"Database error updating task completion: {str(e)}")
+        logger.error(f"Database error deleting task: {str(e)}")
 
-def load_task_from_db(task_id):
-    """Load task data from database"""
-    db = get_db()
+def load_task_from_db(task_id, include_results=True):
+    """
+    Load task data from database
+    
+    Args:
+        task_id: Task to load
+        include_results: Also load each supplier's parts. Status reads
+            skip it and get a result_count per supplier instead.
+    """
     try:
-        # Get task basic info
-        task = db.execute('SELECT * FROM tasks WHERE task_id = ?', (task_id,)).fetchone()
-        
-        if not task:
-            return None
+        with db_pool.snapshot() as db:
+            # Get task basic info
+            task = db.execute(
+                'SELECT part_number, start_time, all_completed, completed_count, scrapers, version FROM tasks WHERE task_id = ?',
+                (task_id,)
+            ).fetchone()
+            
+            if not task:
+                return None
+            
+            # Get all results for this task, in the order the task listed its suppliers
+            results = db.execute(
+                'SELECT scraper_name, supplier, part_number, success, message, time_taken, completed, result_count, summary FROM task_results WHERE task_id = ? ORDER BY id',
+                (task_id,)
+            ).fetchall()
             
+            # Parts come back in the order the supplier returned them
+            parts = []
+            if include_results:
+                parts = db.execute(
+                    f'SELECT {SELECT_PART_COLUMNS} FROM parts WHERE task_id = ? ORDER BY supplier, position',
+                    (task_id,)
+                ).fetchall()
+        
         # Build task data structure
         task_data = {
             "part_number": task["part_number"],
@@ -499,22 +599,31 @@ def load_task_from_db(task_id):
             "all_completed": bool(task["all_completed"]),
             "completed_count": task["completed_count"],
             "scrapers": json.loads(task["scrapers"]),
+            "version": task["version"],
             "results": {}
         }
         
-        # Get all results for this task
-        results = db.execute('SELECT * FROM task_results WHERE task_id = ?', (task_id,)).fetchall()
-        
         for result in results:
-            task_data["results"][result["scraper_name"]] = {
+            task_result = {
                 "supplier": result["supplier"],
                 "part_number": result["part_number"],
                 "success": bool(result["success"]),
                 "message": result["message"],
                 "time_taken": result["time_taken"],
                 "completed": bool(result["completed"]),
-                "results": json.loads(result["results_json"])
             }
+            task_result.update(json.loads(result["summary"] or '{}'))
+            
+            if include_results:
+                task_result["results"] = []
+            else:
+                task_result["result_count"] = result["result_count"]
+            
+            task_data["results"][result["scraper_name"]] = task_result
+        
+        for part in parts:
+            if part["supplier"] in task_data["results"]:
+                task_data["results"][part["supplier"]]["results"].append(rebuild_part(part))
             
         return task_data
         
@@ -522,89 +631,151 @@ def load_task_from_db(task_id):
         logger.error(f"Database error loading task: {str(e)}")
         return None
 
-# Create a dictionary to store search results (in-memory cache)
-search_results = {}
+def load_latest_prices_from_db(part_number):
+    """Latest known price of a part at each supplier, across all stored tasks"""
+    try:
+        with db_pool.connection() as db:
+            rows = db.execute(
+                'SELECT p.supplier, p.part_number, p.price_cents, p.price_text, p.availability, p.stock, p.location, t.start_time '
+                'FROM parts p JOIN tasks t ON t.task_id = p.task_id '
+                'WHERE p.part_number = ? AND p.price_cents IS NOT NULL '
+                'ORDER BY t.start_time DESC',
+                (part_number,)
+            ).fetchall()
+    except Exception as e:
+        logger.error(f"Database error loading prices: {str(e)}")
+        return []
+    
+    # Rows are newest first, keep the first one seen for each supplier
+    latest = {}
+    for row in rows:
+        if row["supplier"] not in latest:
+            latest[row["supplier"]] = {
+                "supplier": row["supplier"],
+                "part_number": row["part_number"],
+                "price": row["price_text"],
+                "price_cents": row["price_cents"],
+                "availability": row["availability"] or row["stock"],
+                "location": row["location"],
+                "seen_at": row["start_time"],
+            }
+    return list(latest.values())
+
+# Task snapshots - tasks started here live in memory, other workers' tasks are reloaded when their version changes
+def load_task(task_id, include_results=True):
+    task_data = load_task_from_db(task_id, include_results)
+    if task_data:
+        task_expiry.track(task_id, task_data["start_time"])
+    return task_data
 
-# Function to run a scraper in a thread
-def run_scraper(scraper_class, scraper_name, part_number, task_id):
-    start_time = time.time()
-    logger.info(f"Starting {scraper_name} scraper for part: {part_number}")
+task_store = TaskStore(
+    db_pool,
+    load_task,
+    poll_interval=TASK_POLL_INTERVAL,
+    cache=TaskCache(max_entries=TASK_CACHE_ENTRIES, max_bytes=TASK_CACHE_BYTES)
+)
+
+# Serialized status payloads, keyed by task and version
+status_cache = TaskCache(max_entries=TASK_CACHE_ENTRIES, max_bytes=STATUS_CACHE_BYTES)
+
+# Supplier completions publish new task snapshots under a per-task lock stripe
+task_registry = TaskRegistry(task_store)
+
+# Expired tasks are dropped from memory and deleted from the database in batches
+task_expiry = TaskExpiry(db_pool, max_age=TASK_MAX_AGE, max_pause=CLEANUP_MAX_PAUSE)
+
+# Recent supplier results, shared by every task in this process
+result_cache = ResultCache(ttls=RESULT_CACHE_TTL, max_entries=RESULT_CACHE_SIZE)
+
+# Scrapes in flight in this process, so duplicate searches share one scrape
+single_flight = SingleFlight()
+
+# Request threads this process lets progress streams hold
+stream_slots = threading.BoundedSemaphore(STREAM_MAX_CONNECTIONS)
+
+
+# Run a blocking scraper and return its raw output
+def execute_scraper(scraper_class, scraper_name, part_number):
+    # For Pilkington and other request-based scrapers that accept part_number directly
+    if scraper_name in ["Pilkington", "Mygrant Glass", "PWG"]:
+        # These scrapers accept part_number directly
+        return scraper_class(part_number, logger)
     
+    # Class-based scrapers lease a logged-in session inside search()
+    scraper = scraper_class()
+    
+    # Search for the part
+    return scraper.search(part_number)
+
+# Build the stored search result from a scraper's raw output
+def format_search_result(scraper_name, part_number, raw_results, start_time):
+    # Class-based scrapers already return a result dictionary
+    if isinstance(raw_results, dict):
+        search_result = raw_results
+        
+        # Add supplier and part_number info to the result
+        search_result["supplier"] = scraper_name
+        search_result["part_number"] = part_number
+        search_result["completed"] = True
+        return search_result
+    
+    # Format the results
+    formatted_results = []
+    for part in raw_results:
+        formatted_results.append({
+            'part_number': part[0],
+            'stock': part[1] if scraper_name == "Mygrant Glass" else None,
+            'availability': part[1] if scraper_name != "Mygrant Glass" else None,
+            'price': part[2],
+            'location': part[3],
+            'description': part[4] if len(part) > 4 else 'N/A'
+        })
+        
+    # Create search_result in the expected format
+    return {
+        "supplier": scraper_name,
+        "part_number": part_number,
+        "success": len(raw_results) > 0,
+        "message": "Search completed successfully" if len(raw_results) > 0 else "No parts found",
+        "results": formatted_results,
+        "time_taken": time.time() - start_time,
+        "completed": True
+    }
+
+# Queue the database write for a new task snapshot
+def persist_task_result(task_id, scraper_name, task_data):
+    record_task_result_in_db(
+        task_id, 
+        scraper_name, 
+        task_data["results"][scraper_name],
+        task_data["completed_count"],
+        task_data["all_completed"],
+        task_data["version"]
+    )
+
+# Update the search results in memory and database, waking any open progress streams
+def record_scraper_result(task_id, scraper_name, search_result):
+    task_registry.record_result(task_id, scraper_name, search_result, persist=persist_task_result)
+
+# Hand a finished scrape's result to every task that attached to it
+def share_with_followers(scraper_name, part_number, search_result):
+    for follower_task_id, follower_part_number in single_flight.complete(scraper_name, part_number):
+        shared_result = copy.deepcopy(search_result)
+        shared_result["part_number"] = follower_part_number
+        shared_result["coalesced"] = True
+        record_scraper_result(follower_task_id, scraper_name, shared_result)
+
+# Record a finished scrape (or its error) against the task
+def finish_scrape(task_id, scraper_name, part_number, start_time, raw_results=None, error=None):
     try:
-        # For Pilkington and other request-based scrapers that accept part_number directly
-        if scraper_name in ["Pilkington", "Mygrant Glass", "PWG"]:
-            # These scrapers accept part_number directly
-            results = scraper_class(part_number, logger)
-            
-            # Format the results
-            formatted_results = []
-            for part in results:
-                formatted_results.append({
-                    'part_number': part[0],
-                    'stock': part[1] if scraper_name == "Mygrant Glass" else None,
-                    'availability': part[1] if scraper_name != "Mygrant Glass" else None,
-                    'price': part[2],
-                    'location': part[3],
-                    'description': part[4] if len(part) > 4 else 'N/A'
-                })
-                
-            # Create search_result in the expected format
-            search_result = {
-                "supplier": scraper_name,
-                "part_number": part_number,
-                "success": len(results) > 0,
-                "message": "Search completed successfully" if len(results) > 0 else "No parts found",
-                "results": formatted_results,
-                "time_taken": time.time() - start_time,
-                "completed": True
-            }
-        else:
-            # Class-based scrapers with separate login/search methods
-            # Create a new instance of the scraper
-            scraper = scraper_class()
-            
-            # Login
-            if scraper_name == "Import Glass Corp":
-                login_result = scraper.login()
-            else:
-                login_result = {"success": False, "message": "Unknown scraper"}
-            
-            # Check if login was successful
-            if not login_result.get("success", False):
-                search_result = {
-                    "supplier": scraper_name,
-                    "part_number": part_number,
-                    "success": False,
-                    "message": login_result.get("message", "Login failed"),
-                    "results": [],
-                    "time_taken": time.time() - start_time,
-                    "completed": True
-                }
-            else:
-                # Search for the part
-                search_result = scraper.search(part_number)
-                
-                # Add supplier and part_number info to the result
-                search_result["supplier"] = scraper_name
-                search_result["part_number"] = part_number
-                search_result["completed"] = True
+        if error is not None:
+            raise error
         
-        # Update the search results in memory and database
-        with threading.Lock():
-            if task_id in search_results:
-                search_results[task_id]["results"][scraper_name] = search_result
-                search_results[task_id]["completed_count"] += 1
-                all_completed = search_results[task_id]["completed_count"] >= len(search_results[task_id]["scrapers"])
-                search_results[task_id]["all_completed"] = all_completed
-                
-                # Update database
-                with app.app_context():
-                    update_task_result_in_db(task_id, scraper_name, search_result)
-                    update_task_completion_in_db(
-                        task_id, 
-                        search_results[task_id]["completed_count"],
-                        all_completed
-                    )
+        search_result = format_search_result(scraper_name, part_number, raw_results, start_time)
+        
+        # Only successful searches are worth serving again - not the placeholder parts a failed search returns
+        if search_result.get("success") and not is_default_parts(raw_results):
+            result_cache.put(scraper_name, part_number, search_result)
         
         # Log completion
         elapsed = time.time() - start_time
@@ -615,44 +786,68 @@ def run_scraper(scraper_class, scraper_name, part_number, task_id):
         logger.error(f"Error in {scraper_name} scraper: {str(e)}")
         
         # Update the search results with the error
-        with threading.Lock():
-            if task_id in search_results:
-                error_result = {
-                    "supplier": scraper_name,
-                    "part_number": part_number,
-                    "success": False,
-                    "message": f"Error: {str(e)}",
-                    "results": [],
-                    "time_taken": elapsed,
-                    "completed": True,
-                }
-                search_results[task_id]["results"][scraper_name] = error_result
-                search_results[task_id]["completed_count"] += 1
-                all_completed = search_results[task_id]["completed_count"] >= len(search_results[task_id]["scrapers"])
-                search_results[task_id]["all_completed"] = all_completed
-                
-                # Update database
-                with app.app_context():
-                    update_task_result_in_db(task_id, scraper_name, error_result)
-                    update_task_completion_in_db(
-                        task_id, 
-                        search_results[task_id]["completed_count"],
-                        all_completed
-                    )
+        search_result = {
+            "supplier": scraper_name,
+            "part_number": part_number,
+            "success": False,
+            "message": f"Error: {str(e)}",
+            "results": [],
+            "time_taken": elapsed,
+            "completed": True,
+        }
+    
+    record_scraper_result(task_id, scraper_name, search_result)
+    share_with_followers(scraper_name, part_number, search_result)
+
+# Function to run a scraper in a worker thread
+def run_scraper(scraper_class, scraper_name, part_number, task_id):
+    start_time = time.time()
+    logger.info(f"Starting {scraper_name} scraper for part: {part_number}")
+    
+    try:
+        raw_results = execute_scraper(scraper_class, scraper_name, part_number)
+    except Exception as e:
+        finish_scrape(task_id, scraper_name, part_number, start_time, error=e)
+    else:
+        finish_scrape(task_id, scraper_name, part_number, start_time, raw_results)
+
+# Worker pool entry point for a single scrape job
+def run_scrape_job(job):
+    run_scraper(SCRAPERS[job.supplier], job.supplier, job.part_number, job.task_id)
+
+# Shared scheduler - owns the scraper worker pool for this process
+scheduler = ScraperScheduler(
+    run_scrape_job,
+    workers=SCRAPER_WORKERS,
+    supplier_limits=SUPPLIER_CONCURRENCY,
+    max_queue=SCRAPER_QUEUE_LIMIT
+)
+
+# Blocking scrapers share keep-alive connection pools per supplier host
+transport.configure(pool_size=TRANSPORT_POOL_SIZE, idle_timeout=TRANSPORT_IDLE_TIMEOUT)
+
+# Blocking scrapers lease logged-in sessions, logins happen in the background
+session_broker.configure(size=SUPPLIER_SESSIONS, refresh_margin=SESSION_REFRESH_MARGIN)
+cookie_store.configure(directory=COOKIE_DIR, validation_window=COOKIE_VALIDATION_WINDOW)
+html_parser.configure(backend=HTML_PARSER)
+parse_executor.configure(workers=PARSE_WORKERS, inline_below=PARSE_INLINE_BYTES)
+response_decoder.configure(charsets=RESPONSE_CHARSETS)
+hedging.configure(deadlines=SEARCH_DEADLINES)
+strategy_stats.configure(path=STRATEGY_STATS_FILE, half_life=STRATEGY_HALF_LIFE)
+
+# Async engine - alternative to the worker pool, selected with SCRAPER_ENGINE=async
+async_engine = AsyncScrapingEngine(
+    ASYNC_FLOWS,
+    default_limit=ASYNC_SUPPLIER_CONCURRENCY,
+    max_pending=SCRAPER_QUEUE_LIMIT
+)
 
 # Update run_all_scrapers function
 def run_all_scrapers(part_number, selected_scrapers=None):
     task_id = str(uuid.uuid4())
     
-    # Define available scrapers
-    scrapers = {
-        "Import Glass Corp": IGCScraper,
-        "Mygrant Glass": MyGrantScraper,
-        "Pilkington": PilkingtonScraper,
-        "PWG": PWGScraper
-    }
-    
     # Filter scrapers if selected_scrapers is provided
+    scrapers = SCRAPERS
     if selected_scrapers and isinstance(selected_scrapers, list):
         scrapers = {k: v for k, v in scrapers.items() if k in selected_scrapers}
     
@@ -663,7 +858,8 @@ def run_all_scrapers(part_number, selected_scrapers=None):
         "results": {},
         "completed_count": 0,
         "all_completed": False,
-        "scrapers": list(scrapers.keys())
+        "scrapers": list(scrapers.keys()),
+        "version": 0
     }
     
     # Set initial results for each scraper
@@ -678,23 +874,63 @@ def run_all_scrapers(part_number, selected_scrapers=None):
             "completed": False,
         }
     
-    # Save to in-memory dictionary
-    search_results[task_id] = task_data
+    # Save to the task store
+    task_store.put(task_id, task_data)
+    task_expiry.track(task_id, task_data["start_time"])
     
     # Save to database
-    with app.app_context():
-        save_task_to_db(task_id, task_data)
-    
-    # Start a thread for each scraper
-    threads = []
-    for scraper_name, scraper_class in scrapers.items():
-        thread = threading.Thread(
-            target=run_scraper,
-            args=(scraper_class, scraper_name, part_number, task_id)
-        )
-        thread.daemon = True
-        thread.start()
-        threads.append(thread)
+    save_task_to_db(task_id, task_data)
+    
+    # Serve fresh cached results straight away, scrape the rest
+    to_scrape = []
+    for scraper_name in scrapers.keys():
+        lookup_start = time.time()
+        cached = result_cache.get(scraper_name, part_number)
+        if cached is None:
+            to_scrape.append(scraper_name)
+            continue
+        
+        search_result, age = cached
+        search_result["part_number"] = part_number
+        search_result["time_taken"] = time.time() - lookup_start
+        search_result["cached"] = True
+        search_result["cache_age"] = age
+        record_scraper_result(task_id, scraper_name, search_result)
+        logger.info(f"{scraper_name} served from cache ({age:.0f}s old) for part {part_number}")
+    
+    # Attach to scrapes already running for the same part, lead the rest
+    leaders = []
+    for scraper_name in to_scrape:
+        if single_flight.join(scraper_name, part_number, task_id):
+            leaders.append(scraper_name)
+        else:
+            logger.info(f"{scraper_name} search for part {part_number} attached to an in-flight scrape")
+    
+    try:
+        if leaders and SCRAPER_ENGINE == 'async':
+            # Run the whole fan-out on the async engine's event loop
+            async_engine.submit(task_id, part_number, leaders, finish_scrape)
+        elif leaders:
+            # Queue a job for each scraper on the shared worker pool
+            jobs = [ScrapeJob(task_id, scraper_name, part_number) for scraper_name in leaders]
+            scheduler.submit(jobs)
+    except SchedulerBusy as e:
+        # Roll back the task so it doesn't sit "in progress" forever
+        delete_task_from_db(task_id)
+        task_store.discard(task_id)
+        
+        # Anyone who attached in the meantime gets the busy error instead of waiting forever
+        for scraper_name in leaders:
+            share_with_followers(scraper_name, part_number, {
+                "supplier": scraper_name,
+                "part_number": part_number,
+                "success": False,
+                "message": f"Error: {str(e)}",
+                "results": [],
+                "time_taken": 0,
+                "completed": True,
+            })
+        raise
     
     # Return the task ID for status checking
     return task_id
@@ -717,57 +953,29 @@ def search():
         return redirect(url_for('index'))
     
     # Start the scraping process
-    task_id = run_all_scrapers(part_number, selected_scrapers)
+    try:
+        task_id = run_all_scrapers(part_number, selected_scrapers)
+    except SchedulerBusy:
+        flash('The search queue is busy right now, please try again in a moment', 'warning')
+        return redirect(url_for('index'))
     
     # Redirect to results page
     return redirect(url_for('results', task_id=task_id))
 
 @app.route('/results/<task_id>')
 def results(task_id):
-    # Try to load from memory or database
-    if task_id in search_results:
-        task_exists = True
-    else:
-        with app.app_context():
-            task_data = load_task_from_db(task_id)
-            if task_data:
-                search_results[task_id] = task_data
-                task_exists = True
-            else:
-                task_exists = False
-    
     # Check if task exists
-    if not task_exists:
+    if not task_store.get(task_id, full=False):
         flash('Invalid task ID', 'error')
         return redirect(url_for('index'))
     
     return render_template('results.html', task_id=task_id)
 
-@app.route('/api/status/<task_id>')
-def status(task_id):
-    # First check in-memory cache
-    if task_id in search_results:
-        task_data = search_results[task_id]
-    else:
-        # Try to load from database
-        with app.app_context():
-            task_data = load_task_from_db(task_id)
-        
-        # If found in database, cache it in memory
-        if task_data:
-            search_results[task_id] = task_data
-    
-    # Check if task exists
-    if not task_data:
-        return jsonify({"error": "Invalid task ID"}), 404
-    
-    # Calculate elapsed time
-    elapsed = time.time() - task_data["start_time"]
-    
+# Build the progress payload shared by /api/status and /api/stream (everything but elapsed)
+def build_status(task_data):
     # Prepare response
     response = {
         "part_number": task_data["part_number"],
-        "elapsed": elapsed,
         "all_completed": task_data["all_completed"],
         "completed_count": task_data["completed_count"],
         "total_count": len(task_data["scrapers"]),
@@ -781,21 +989,116 @@ def status(task_id):
             "success": result.get("success", False),
             "message": result.get("message", ""),
             "time_taken": result.get("time_taken", 0),
-            "result_count": len(result.get("results", []))
+            "result_count": result["result_count"] if "result_count" in result else len(result.get("results", [])),
+            "cached": result.get("cached", False)
         }
     
-    return jsonify(response)
+    return response
+
+# Serialized status payload, rebuilt only when the task's version changes
+def status_json(task_id, task_data):
+    version = task_data["version"]
+    cached = status_cache.get(task_id)
+    if cached is not None and cached[0] == version:
+        body = cached[1]
+    else:
+        body = json.dumps(build_status(task_data)).encode()
+        status_cache.put(task_id, (version, body), len(body))
+    
+    # Elapsed time is the only part that changes between versions
+    elapsed = time.time() - task_data["start_time"]
+    return b'{"elapsed": ' + str(elapsed).encode() + b', ' + body[1:]
+
+# Newest version of a task the client says it already has (from If-None-Match), or -1
+def client_version(task_id):
+    newest = -1
+    for tag in request.if_none_match.as_set(include_weak=True):
+        tag_task_id, _, version = tag.rpartition('-')
+        if tag_task_id == task_id and version.isdigit():
+            newest = max(newest, int(version))
+    return newest
+
+@app.route('/api/status/<task_id>')
+def status(task_id):
+    task_data = task_store.get(task_id, full=False)
+    
+    # Check if task exists
+    if not task_data:
+        return jsonify({"error": "Invalid task ID"}), 404
+    
+    # Weak ETag - responses for the same version only differ in elapsed time. The worker running
+    # the task is ahead of the committed version the other workers see, so a client that already
+    # has a newer version than this worker keeps it rather than stepping back.
+    version = task_data["version"]
+    known = client_version(task_id)
+    if known >= version:
+        version = known
+        response = Response(status=304)
+    else:
+        response = Response(status_json(task_id, task_data), mimetype='application/json')
+    
+    etag = f'{task_id}-{version}'
+    
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/stream/<task_id>')
+def stream(task_id):
+    # Check if task exists before opening the stream
+    if not task_store.get(task_id, full=False):
+        return jsonify({"error": "Invalid task ID"}), 404
+    
+    # Leave the request threads to status polls and page loads once enough streams are open -
+    # a refused stream closes the EventSource and the page falls back to polling
+    if not stream_slots.acquire(blocking=False):
+        return Response(status=503, headers={'Retry-After': '5'})
+    
+    # A reconnecting browser sends the version it last got - never send it an older one
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    seen_version = int(last_event_id) if last_event_id.isdigit() else -1
+    
+    def generate():
+        opened = time.time()
+        last_sent = opened
+        
+        # Tell the browser how soon to reconnect when we close the stream
+        yield "retry: 1000\n\n"
+        
+        while True:
+            task_data = task_store.get(task_id, full=False)
+            if not task_data:
+                return
+            version = task_data["version"]
+            
+            if version >= seen_version:
+                yield f"id: {version}\nevent: status\ndata: {status_json(task_id, task_data).decode()}\n\n"
+                last_sent = time.time()
+            
+            if task_data["all_completed"]:
+                yield "event: done\ndata: {}\n\n"
+                return
+            
+            # Sleep until a supplier finishes, sending keepalives so proxies don't drop us
+            while task_store.wait_for_change(task_id, version, STREAM_KEEPALIVE) == version:
+                if time.time() - opened > STREAM_MAX_DURATION:
+                    # Free the worker thread, the browser reconnects on its own
+                    return
+                if time.time() - last_sent >= STREAM_KEEPALIVE:
+                    yield ": keepalive\n\n"
+                    last_sent = time.time()
+    
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    
+    # Runs when the stream ends or the client goes away, even if generate() never started
+    response.call_on_close(stream_slots.release)
+    return response
 
 @app.route('/api/results/<task_id>')
 def api_results(task_id):
-    # Similar pattern to status route
-    if task_id in search_results:
-        task_data = search_results[task_id]
-    else:
-        with app.app_context():
-            task_data = load_task_from_db(task_id)
-        if task_data:
-            search_results[task_id] = task_data
+    task_data = task_store.get(task_id)
     
     # Check if task exists
     if not task_data:
@@ -805,6 +1108,10 @@ def api_results(task_id):
     if not task_data["all_completed"]:
         return jsonify({"error": "Task still in progress"}), 400
     
+    # Make sure the results are committed before handing them out
+    if not db_writer.flush(task_id):
+        logger.warning(f"Timed out waiting for task {task_id} results to be written")
+    
     # Prepare full results
     results = []
     for scraper_name, result in task_data["results"].items():
@@ -812,16 +1119,25 @@ def api_results(task_id):
     
     return jsonify(results)
 
+@app.route('/api/prices/<part_number>')
+def api_prices(part_number):
+    return jsonify(load_latest_prices_from_db(part_number.strip()))
+
+@app.route('/api/stats')
+def api_stats():
+    # Counters of the worker process serving the request - every gunicorn worker keeps its own
+    return jsonify({
+        "pid": os.getpid(),
+        "task_store": task_store.stats(),
+        "status_cache": status_cache.stats(),
+        "transport": transport.stats(),
+        "strategies": strategy_stats.stats(),
+    })
+
 @app.route('/download/<task_id>')
 def download(task_id):
     # Try to load from memory or database
-    if task_id in search_results:
-        task_data = search_results[task_id]
-    else:
-        with app.app_context():
-            task_data = load_task_from_db(task_id)
-        if task_data:
-            search_results[task_id] = task_data
+    task_data = task_store.get(task_id)
     
     # Check if task exists
     if not task_data:
@@ -846,64 +1162,39 @@ def download(task_id):
 # Cleanup old results periodically
 def cleanup_old_results():
     while True:
-        current_time = time.time()
-        # Keep results for 1 hour (3600 seconds)
-        to_delete = []
+        # Drop expired tasks held in memory
+        for task_id in task_expiry.pop_expired():
+            task_store.discard(task_id)
         
-        # Find old tasks in memory
-        for task_id, task in search_results.items():
-            if current_time - task["start_time"] > 3600:
-                to_delete.append(task_id)
-        
-        # Delete from memory and database
-        with app.app_context():
-            db = get_db()
-            for task_id in to_delete:
-                with threading.Lock():
-                    if task_id in search_results:
-                        del search_results[task_id]
-                
-                try:
-                    # Delete from database
-                    db.execute('DELETE FROM task_results WHERE task_id = ?', (task_id,))
-                    db.execute('DELETE FROM tasks WHERE task_id = ?', (task_id,))
-                    db.commit()
-                except Exception as e:
-                    db.rollback()
-                    logger.error(f"Error deleting old task {task_id}: {str(e)}")
-        
-        # Also clean up old records directly from database
-        with app.app_context():
-            try:
-                db = get_db()
-                cutoff_time = current_time - 3600
-                
-                # Get old task IDs
-                old_tasks = db.execute('SELECT task_id FROM tasks WHERE start_time < ?', 
-                                      (cutoff_time,)).fetchall()
-                
-                # Delete old records
-                for task in old_tasks:
-                    task_id = task['task_id']
-                    db.execute('DELETE FROM task_results WHERE task_id = ?', (task_id,))
-                    db.execute('DELETE FROM tasks WHERE task_id = ?', (task_id,))
-                
-                db.commit()
-            except Exception as e:
-                db.rollback()
-                logger.error(f"Error cleaning up old database records: {str(e)}")
+        # Delete expired tasks from the database in small batches
+        try:
+            report = task_expiry.purge()
+            for task_id in report["task_ids"]:
+                task_store.discard(task_id)
+            
+            if report["tasks"]:
+                logger.info(
+                    f"Cleanup removed {report['tasks']} tasks, {report['results']} results and {report['parts']} parts "
+                    f"in {report['batches']} batches ({report['seconds']:.2f}s), "
+                    f"reclaimed {report['bytes_reclaimed']} bytes"
+                )
+        except Exception as e:
+            logger.error(f"Error cleaning up old database records: {str(e)}")
         
         # Check every 5 minutes
-        time.sleep(300)
+        time.sleep(CLEANUP_INTERVAL)
 
-if __name__ == '__main__':
-    # Initialize database
+# Startup work, whether run directly or under gunicorn. Spawned parse workers re-import this
+# module as __mp_main__ to unpickle their jobs - they must not migrate or start threads.
+if __name__ != '__mp_main__':
+    # Apply pending migrations on startup
     initialize_db()
     
-    # Start cleanup thread
-    cleanup_thread = threading.Thread(target=cleanup_old_results)
+    # Start cleanup thread (every gunicorn worker runs its own, deletes are idempotent)
+    cleanup_thread = threading.Thread(target=cleanup_old_results, name="task-cleanup")
     cleanup_thread.daemon = True
     cleanup_thread.start()
-    
+
+if __name__ == '__main__':
     # Run the Flask app
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
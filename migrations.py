@@ -0,0 +1,200 @@
+# migrations.py
+# Versioned schema migrations for the task database, tracked with PRAGMA user_version
+
+import json
+import sqlite3
+import logging
+
+from parts import INSERT_PART_SQL, part_rows
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+def create_tables(db):
+    """Create the base tables (no-op on databases created by the old schema.sql)"""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            task_id TEXT PRIMARY KEY,
+            part_number TEXT NOT NULL,
+            start_time REAL NOT NULL,
+            all_completed BOOLEAN NOT NULL DEFAULT 0,
+            completed_count INTEGER NOT NULL DEFAULT 0,
+            scrapers TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS task_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id TEXT NOT NULL,
+            scraper_name TEXT NOT NULL,
+            supplier TEXT NOT NULL,
+            part_number TEXT NOT NULL,
+            success BOOLEAN NOT NULL DEFAULT 0,
+            message TEXT,
+            time_taken REAL DEFAULT 0,
+            completed BOOLEAN NOT NULL DEFAULT 0,
+            results_json TEXT,
+            FOREIGN KEY (task_id) REFERENCES tasks (task_id)
+        )
+    ''')
+
+    # Databases created before task versioning
+    if "version" not in table_columns(db, "tasks"):
+        db.execute('ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0')
+
+
+def cascade_task_results(db):
+    """Rebuild task_results with ON DELETE CASCADE and index it by task and scraper"""
+    db.execute('''
+        CREATE TABLE task_results_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id TEXT NOT NULL,
+            scraper_name TEXT NOT NULL,
+            supplier TEXT NOT NULL,
+            part_number TEXT NOT NULL,
+            success BOOLEAN NOT NULL DEFAULT 0,
+            message TEXT,
+            time_taken REAL DEFAULT 0,
+            completed BOOLEAN NOT NULL DEFAULT 0,
+            results_json TEXT,
+            FOREIGN KEY (task_id) REFERENCES tasks (task_id) ON DELETE CASCADE
+        )
+    ''')
+
+    # Orphaned rows from the old per-statement cleanup are dropped on the way over
+    db.execute('''
+        INSERT INTO task_results_new
+        SELECT id, task_id, scraper_name, supplier, part_number, success, message,
+               time_taken, completed, results_json
+        FROM task_results
+        WHERE task_id IN (SELECT task_id FROM tasks)
+    ''')
+    db.execute('DROP TABLE task_results')
+    db.execute('ALTER TABLE task_results_new RENAME TO task_results')
+
+    # Serves lookups by task_id as well as by (task_id, scraper_name)
+    db.execute('CREATE INDEX idx_task_results_task_scraper ON task_results (task_id, scraper_name)')
+
+
+def index_task_start_time(db):
+    """Index tasks by start_time for expiry"""
+    db.execute('CREATE INDEX IF NOT EXISTS idx_tasks_start_time ON tasks (start_time)')
+
+
+def add_result_summary(db):
+    """Store each result's part count and flags so status reads never parse results_json"""
+    db.execute('ALTER TABLE task_results ADD COLUMN result_count INTEGER NOT NULL DEFAULT 0')
+    db.execute('ALTER TABLE task_results ADD COLUMN summary TEXT')
+
+    try:
+        db.execute('UPDATE task_results SET result_count = json_array_length(results_json) WHERE results_json IS NOT NULL')
+    except sqlite3.OperationalError:
+        # SQLite built without JSON support
+        rows = db.execute('SELECT id, results_json FROM task_results WHERE results_json IS NOT NULL').fetchall()
+        db.executemany(
+            'UPDATE task_results SET result_count = ? WHERE id = ?',
+            [(len(json.loads(row[1])), row[0]) for row in rows]
+        )
+
+
+def create_parts(db):
+    """Move supplier results out of results_json blobs into the normalized parts table"""
+    db.execute('''
+        CREATE TABLE parts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id TEXT NOT NULL,
+            supplier TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            part_number TEXT,
+            availability TEXT,
+            stock TEXT,
+            price_cents INTEGER,
+            price_text TEXT,
+            location TEXT,
+            description TEXT,
+            fields TEXT,
+            extra TEXT,
+            FOREIGN KEY (task_id) REFERENCES tasks (task_id) ON DELETE CASCADE
+        )
+    ''')
+    db.execute('CREATE INDEX idx_parts_task_supplier ON parts (task_id, supplier, position)')
+    db.execute('CREATE INDEX idx_parts_part_number ON parts (part_number, supplier)')
+    db.execute('CREATE INDEX idx_parts_supplier ON parts (supplier)')
+
+    # Existing results move over, the blobs are no longer written or read
+    rows = db.execute('SELECT task_id, scraper_name, results_json FROM task_results WHERE results_json IS NOT NULL')
+    for task_id, scraper_name, results_json in rows.fetchall():
+        db.executemany(INSERT_PART_SQL, part_rows(task_id, scraper_name, json.loads(results_json)))
+    db.execute('UPDATE task_results SET results_json = NULL')
+
+
+# Applied in order, each step moves user_version to its number. Never edit a released step, add a new one.
+MIGRATIONS = [
+    (1, "create tasks and task_results", create_tables),
+    (2, "cascade deletes and index task_results", cascade_task_results),
+    (3, "index tasks by start_time", index_task_start_time),
+    (4, "add result_count and summary to task_results", add_result_summary),
+    (5, "create parts table", create_parts),
+]
+
+
+def table_columns(db, table):
+    """Return the column names of a table"""
+    return [row[1] for row in db.execute(f'PRAGMA table_info({table})')]
+
+
+def schema_version(db):
+    """Return the migration number the database is at"""
+    return db.execute('PRAGMA user_version').fetchone()[0]
+
+
+def enable_incremental_vacuum(pool):
+    """
+    Rebuild a database created before auto_vacuum=INCREMENTAL so expiry can return its free
+    pages to the filesystem. The setting only takes on an existing database through a full
+    VACUUM, which can't run inside a transaction, so this runs outside the numbered steps.
+
+    Returns:
+        True if the database was rebuilt
+    """
+    with pool.connection() as db:
+        if db.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+            return False
+
+        logger.info("Rebuilding the database with VACUUM to enable incremental auto_vacuum")
+        db.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        try:
+            db.execute('VACUUM')
+        except sqlite3.OperationalError as e:
+            # Another worker is rebuilding it (or holds the write lock) - the next start tries again
+            logger.warning(f"Could not VACUUM the database: {str(e)}")
+            return False
+    return True
+
+
+def migrate(pool):
+    """
+    Apply pending migrations. Safe to call from every worker at startup - each step
+    runs in its own write transaction and re-checks the version after taking the lock.
+
+    Args:
+        pool: Database ConnectionPool
+
+    Returns:
+        The schema version after migrating
+    """
+    for number, description, step in MIGRATIONS:
+        with pool.transaction() as db:
+            if schema_version(db) >= number:
+                continue
+
+            logger.info(f"Applying migration {number}: {description}")
+            step(db)
+            db.execute(f'PRAGMA user_version = {number}')
+
+    enable_incremental_vacuum(pool)
+
+    with pool.connection() as db:
+        return schema_version(db)
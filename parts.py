@@ -0,0 +1,103 @@
+# parts.py
+# Maps supplier result dictionaries to rows of the normalized parts table and back
+
+import re
+import json
+from decimal import Decimal, InvalidOperation
+
+# Result keys stored in their own columns, everything else goes to the extra column
+PART_COLUMNS = ("part_number", "availability", "stock", "price", "location", "description")
+
+PRICE_PATTERN = re.compile(r'-?\d[\d,]*(?:\.\d+)?')
+
+INSERT_PART_SQL = (
+    'INSERT INTO parts (task_id, supplier, position, part_number, availability, stock, '
+    'price_cents, price_text, location, description, fields, extra) '
+    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+)
+
+SELECT_PART_COLUMNS = (
+    'supplier, part_number, availability, stock, price_text, location, description, fields, extra'
+)
+
+
+def parse_price_cents(price):
+    """Parse a scraped price ("$1,234.50") into integer cents, None if it has no number"""
+    if price is None:
+        return None
+
+    match = PRICE_PATTERN.search(str(price))
+    if not match:
+        return None
+
+    try:
+        return int((Decimal(match.group().replace(',', '')) * 100).to_integral_value())
+    except InvalidOperation:
+        return None
+
+
+def part_rows(task_id, supplier, results):
+    """
+    Build parts rows for one supplier's result list
+
+    Args:
+        task_id: Task the results belong to
+        supplier: Supplier (scraper) name
+        results: List of result dictionaries as returned to the API
+
+    Returns:
+        List of parameter tuples for INSERT_PART_SQL
+    """
+    rows = []
+    for position, part in enumerate(results):
+        if not isinstance(part, dict):
+            # Anything that isn't a result dictionary is kept verbatim
+            rows.append((task_id, supplier, position, None, None, None, None, None, None, None, None, json.dumps(part)))
+            continue
+
+        # Text columns only hold text, a "supplier" key matching the row's supplier comes from the
+        # supplier column, anything else is kept as JSON
+        columns = {key: value for key, value in part.items() if key in PART_COLUMNS and (value is None or isinstance(value, str))}
+        extra = {
+            key: value for key, value in part.items()
+            if key not in columns and not (key == "supplier" and value == supplier)
+        }
+        price = columns.get("price")
+
+        rows.append((
+            task_id,
+            supplier,
+            position,
+            columns.get("part_number"),
+            columns.get("availability"),
+            columns.get("stock"),
+            parse_price_cents(part.get("price")),
+            price,
+            columns.get("location"),
+            columns.get("description"),
+            ",".join(part.keys()),
+            json.dumps(extra) if extra else None,
+        ))
+    return rows
+
+
+def rebuild_part(row):
+    """Turn a parts row back into the result dictionary the API has always returned"""
+    if row["fields"] is None:
+        return json.loads(row["extra"])
+
+    columns = {
+        "part_number": row["part_number"],
+        "availability": row["availability"],
+        "stock": row["stock"],
+        "price": row["price_text"],
+        "location": row["location"],
+        "description": row["description"],
+        "supplier": row["supplier"],
+    }
+    extra = json.loads(row["extra"]) if row["extra"] else {}
+
+    part = {}
+    for key in row["fields"].split(",") if row["fields"] else []:
+        part[key] = extra[key] if key in extra else columns.get(key)
+    return part
@@ -0,0 +1,104 @@
+# result_cache.py
+# TTL + LRU cache of supplier search results, keyed by supplier and normalized part number
+
+import re
+import copy
+import time
+import threading
+import logging
+from collections import OrderedDict
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+def normalize_part_number(part_number):
+    """Normalize a part number for cache lookups ("dw-2000 " -> "DW2000")"""
+    return re.sub(r'[\s\-]+', '', part_number or '').upper()
+
+
+class ResultCache:
+    def __init__(self, ttls=None, default_ttl=600, max_entries=500):
+        """
+        Initialize the cache
+
+        Args:
+            ttls: Dictionary of supplier name -> seconds a result stays fresh
+            default_ttl: TTL for suppliers not in ttls
+            max_entries: Maximum number of cached results before LRU eviction
+        """
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters for stats()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, supplier, part_number):
+        """
+        Look up a fresh result
+
+        Returns:
+            Tuple of (search_result, age_in_seconds), or None on a miss
+        """
+        key = (supplier, normalize_part_number(part_number))
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            fetched_at, search_result = entry
+            if now - fetched_at > self.ttls.get(supplier, self.default_ttl):
+                del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+        # Callers get their own copy so tasks never share result lists
+        return copy.deepcopy(search_result), now - fetched_at
+
+    def put(self, supplier, part_number, search_result):
+        """Store a result, evicting the least recently used entries over max_entries"""
+        key = (supplier, normalize_part_number(part_number))
+        entry = (time.time(), copy.deepcopy(search_result))
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, supplier=None, part_number=None):
+        """Drop cached results for a supplier, a part number, or both (everything if neither given)"""
+        normalized = normalize_part_number(part_number) if part_number else None
+
+        with self._lock:
+            for key in list(self._entries):
+                if supplier and key[0] != supplier:
+                    continue
+                if normalized and key[1] != normalized:
+                    continue
+                del self._entries[key]
+
+    def stats(self):
+        """Return hit/miss/eviction counters and current size"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
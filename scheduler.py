@@ -0,0 +1,166 @@
+# scheduler.py
+# Long-lived scraper scheduler - fixed worker pool with per-supplier concurrency limits
+
+import os
+import threading
+import logging
+from collections import deque, namedtuple
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# A single unit of work: scrape one supplier for one task
+ScrapeJob = namedtuple('ScrapeJob', ['task_id', 'supplier', 'part_number'])
+
+
+class SchedulerBusy(Exception):
+    """Raised when the job queue is full and new work cannot be accepted"""
+
+
+class ScraperScheduler:
+    def __init__(self, handler, workers=8, supplier_limits=None, default_limit=2, max_queue=200):
+        """
+        Initialize the scheduler
+
+        Args:
+            handler: Callable invoked with a ScrapeJob by a worker thread
+            workers: Number of worker threads in the pool
+            supplier_limits: Dictionary of supplier name -> max jobs in flight
+            default_limit: Max jobs in flight for suppliers not in supplier_limits
+            max_queue: Maximum number of pending (not yet started) jobs
+        """
+        self.handler = handler
+        self.workers = workers
+        self.supplier_limits = dict(supplier_limits or {})
+        self.default_limit = default_limit
+        self.max_queue = max_queue
+
+        # Pending jobs per supplier, served round-robin
+        self._pending = {}
+        self._suppliers = []
+        self._next_supplier = 0
+        self._queued = 0
+        self._in_flight = {}
+
+        self._condition = threading.Condition()
+        self._threads = []
+        self._pid = None
+        self._shutdown = False
+
+        # Counters for stats()
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, jobs):
+        """
+        Enqueue a group of jobs, all or nothing
+
+        Args:
+            jobs: List of ScrapeJob tuples
+
+        Raises:
+            SchedulerBusy: If the queue cannot take every job in the group
+        """
+        jobs = list(jobs)
+        with self._condition:
+            if self._shutdown:
+                raise SchedulerBusy("Scheduler is shutting down")
+
+            if self._queued + len(jobs) > self.max_queue:
+                self._rejected += len(jobs)
+                logger.warning(f"Scheduler queue full ({self._queued}/{self.max_queue}), rejecting {len(jobs)} jobs")
+                raise SchedulerBusy(f"Queue full ({self._queued} jobs pending)")
+
+            self._ensure_workers()
+
+            for job in jobs:
+                if job.supplier not in self._pending:
+                    self._pending[job.supplier] = deque()
+                    self._suppliers.append(job.supplier)
+                    self._in_flight.setdefault(job.supplier, 0)
+                self._pending[job.supplier].append(job)
+
+            self._queued += len(jobs)
+            self._submitted += len(jobs)
+            self._condition.notify_all()
+
+    def stats(self):
+        """Return a snapshot of queue depth and in-flight counts"""
+        with self._condition:
+            return {
+                "workers": len(self._threads),
+                "queued": self._queued,
+                "max_queue": self.max_queue,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "in_flight": dict(self._in_flight),
+                "pending": {supplier: len(queue) for supplier, queue in self._pending.items()},
+            }
+
+    def shutdown(self, wait=True):
+        """Stop accepting work and let workers exit once the queue drains"""
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+            threads = list(self._threads)
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _limit_for(self, supplier):
+        return self.supplier_limits.get(supplier, self.default_limit)
+
+    def _ensure_workers(self):
+        """Start the worker pool on first use (and again after a fork)"""
+        # Threads don't survive fork(), so a preloaded gunicorn worker needs its own pool
+        if self._pid == os.getpid() and self._threads:
+            return
+
+        self._pid = os.getpid()
+        self._threads = []
+        for idx in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"scraper-worker-{idx}")
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+        logger.info(f"Started scraper scheduler with {self.workers} workers")
+
+    def _next_job(self):
+        """Pick the next runnable job round-robin across suppliers. Caller holds the condition."""
+        count = len(self._suppliers)
+        for offset in range(count):
+            idx = (self._next_supplier + offset) % count
+            supplier = self._suppliers[idx]
+            queue = self._pending[supplier]
+
+            if queue and self._in_flight[supplier] < self._limit_for(supplier):
+                self._next_supplier = (idx + 1) % count
+                self._in_flight[supplier] += 1
+                self._queued -= 1
+                return queue.popleft()
+
+        return None
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    if self._shutdown and self._queued == 0:
+                        return
+                    self._condition.wait()
+                    job = self._next_job()
+
+            try:
+                self.handler(job)
+            except Exception as e:
+                logger.error(f"Unhandled error in {job.supplier} job for task {job.task_id}: {str(e)}")
+            finally:
+                with self._condition:
+                    self._in_flight[job.supplier] -= 1
+                    self._completed += 1
+                    self._condition.notify_all()
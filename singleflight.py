@@ -0,0 +1,64 @@
+# singleflight.py
+# Coalesces concurrent searches for the same supplier and part number into one scrape
+
+import threading
+import logging
+
+from result_cache import normalize_part_number
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    def __init__(self):
+        """Track in-flight scrapes and the tasks waiting on each one"""
+        # (supplier, normalized part number) -> list of (task_id, part_number) followers
+        self._flights = {}
+        self._lock = threading.Lock()
+
+        # Counters for stats()
+        self._leaders = 0
+        self._followers = 0
+
+    def join(self, supplier, part_number, task_id):
+        """
+        Attach a task to the scrape for (supplier, part_number)
+
+        Returns:
+            True if the caller is the leader and must run the scrape,
+            False if the task was attached to a scrape already in flight
+        """
+        key = (supplier, normalize_part_number(part_number))
+
+        with self._lock:
+            if key in self._flights:
+                self._flights[key].append((task_id, part_number))
+                self._followers += 1
+                return False
+
+            self._flights[key] = []
+            self._leaders += 1
+            return True
+
+    def complete(self, supplier, part_number):
+        """
+        Finish the scrape for (supplier, part_number)
+
+        Returns:
+            List of (task_id, part_number) followers that should receive the leader's result
+        """
+        key = (supplier, normalize_part_number(part_number))
+
+        with self._lock:
+            return self._flights.pop(key, [])
+
+    def stats(self):
+        """Return the number of scrapes in flight and how many searches were coalesced"""
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "waiting": sum(len(followers) for followers in self._flights.values()),
+                "leaders": self._leaders,
+                "coalesced": self._followers,
+            }
@@ -0,0 +1,127 @@
+# task_cache.py
+# Memory-bounded LRU of task snapshots - in-progress tasks are pinned and never evicted
+
+import json
+import threading
+import logging
+from collections import OrderedDict
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(task_data):
+    """Approximate resident size of a task snapshot in bytes (its JSON length)"""
+    try:
+        return len(json.dumps(task_data, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class TaskCache:
+    def __init__(self, max_entries=1000, max_bytes=64 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of tasks kept before LRU eviction
+            max_bytes: Maximum estimated bytes of task data kept before LRU eviction
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # task_id -> (value, size, pinned)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._pinned = 0
+        self._over_budget = False
+
+        # Counters for stats()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, task_id):
+        """
+        Return the cached value for a task, or None. Readers never wait on the lock -
+        the LRU position and counters are only updated when it is free.
+        """
+        entry = self._entries.get(task_id)
+
+        if self._lock.acquire(blocking=False):
+            try:
+                if entry is None:
+                    self._misses += 1
+                elif task_id in self._entries:
+                    self._entries.move_to_end(task_id)
+                    self._hits += 1
+            finally:
+                self._lock.release()
+
+        return entry[0] if entry is not None else None
+
+    def put(self, task_id, value, size, pinned=False):
+        """
+        Store a value, evicting least recently used unpinned tasks over budget
+
+        Args:
+            task_id: Task the value belongs to
+            value: Cached value
+            size: Estimated size of the value in bytes
+            pinned: Keep the task resident regardless of budget (tasks still being scraped)
+        """
+        with self._lock:
+            self._remove(task_id)
+            self._entries[task_id] = (value, size, pinned)
+            self._bytes += size
+            if pinned:
+                self._pinned += 1
+            self._evict()
+
+    def pop(self, task_id):
+        """Remove a task from the cache"""
+        with self._lock:
+            self._remove(task_id)
+
+    def stats(self):
+        """Return hit/miss/eviction counters and resident size"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "pinned": self._pinned,
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def _remove(self, task_id):
+        # Caller holds the lock
+        entry = self._entries.pop(task_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+            if entry[2]:
+                self._pinned -= 1
+
+    def _evict(self):
+        # Caller holds the lock. Walk from the least recently used end, skipping pinned tasks.
+        if len(self._entries) <= self.max_entries and self._bytes <= self.max_bytes:
+            self._over_budget = False
+            return
+
+        for task_id in list(self._entries):
+            if len(self._entries) <= self.max_entries and self._bytes <= self.max_bytes:
+                self._over_budget = False
+                return
+            if self._entries[task_id][2]:
+                continue
+            self._remove(task_id)
+            self._evictions += 1
+
+        # Only in-progress tasks left, warn once until the cache gets back under budget
+        if not self._over_budget and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._over_budget = True
+            logger.warning(f"Task cache over budget with only pinned tasks left ({self._pinned} pinned, {self._bytes} bytes)")
@@ -0,0 +1,38 @@
+# task_events.py
+# In-process change notification for tasks, used to push progress to open results pages
+
+import threading
+
+
+class TaskEvents:
+    def __init__(self):
+        """Per-task change counters with a condition to wait on"""
+        self._versions = {}
+        self._condition = threading.Condition()
+
+    def publish(self, task_id):
+        """Signal that a task changed (a supplier finished or a partial result landed)"""
+        with self._condition:
+            self._versions[task_id] = self._versions.get(task_id, 0) + 1
+            self._condition.notify_all()
+
+    def version(self, task_id):
+        """Current change counter for a task (0 if it never changed in this process)"""
+        with self._condition:
+            return self._versions.get(task_id, 0)
+
+    def wait(self, task_id, since_version, timeout):
+        """
+        Block until the task changes past since_version or the timeout expires
+
+        Returns:
+            The task's current change counter
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._versions.get(task_id, 0) > since_version, timeout)
+            return self._versions.get(task_id, 0)
+
+    def forget(self, task_id):
+        """Drop the counter for a task that has been cleaned up"""
+        with self._condition:
+            self._versions.pop(task_id, None)
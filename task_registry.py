@@ -0,0 +1,65 @@
+# task_registry.py
+# Lock-striped updates of task snapshots - each supplier completion publishes a new immutable snapshot
+
+import zlib
+import threading
+import logging
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+class TaskRegistry:
+    def __init__(self, store, stripes=64):
+        """
+        Initialize the registry
+
+        Args:
+            store: TaskStore holding the published snapshots
+            stripes: Number of locks shared out between tasks by hash
+        """
+        self.store = store
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def lock_for(self, task_id):
+        """Return the lock guarding a task's updates"""
+        return self._locks[zlib.crc32(task_id.encode()) % len(self._locks)]
+
+    def record_result(self, task_id, scraper_name, search_result, persist=None):
+        """
+        Record a supplier's result against a task and publish the new snapshot.
+        The previous snapshot is never modified, so readers holding it need no lock.
+
+        Args:
+            task_id: Task to update
+            scraper_name: Supplier the result belongs to
+            search_result: Finished search result for the supplier
+            persist: Optional callable(task_id, scraper_name, snapshot) run under the task's lock,
+                so writes for one task reach the database in version order
+
+        Returns:
+            The new snapshot, or None if this process doesn't own the task
+        """
+        with self.lock_for(task_id):
+            current = self.store.local(task_id)
+            if current is None:
+                return None
+
+            results = dict(current["results"])
+            already_completed = results.get(scraper_name, {}).get("completed", False)
+            results[scraper_name] = search_result
+
+            # A supplier only counts once, even if it reports twice
+            completed_count = current["completed_count"] + (0 if already_completed else 1)
+
+            snapshot = dict(current)
+            snapshot["results"] = results
+            snapshot["completed_count"] = completed_count
+            snapshot["all_completed"] = completed_count >= len(current["scrapers"])
+            snapshot["version"] = current["version"] + 1
+
+            if persist is not None:
+                persist(task_id, scraper_name, snapshot)
+            self.store.put(task_id, snapshot)
+
+        return snapshot
@@ -0,0 +1,143 @@
+# task_store.py
+# Versioned task snapshots shared by every gunicorn worker through the SQLite database
+
+import time
+import sqlite3
+import threading
+import logging
+
+from task_events import TaskEvents
+from task_cache import TaskCache, estimate_size
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+
+class TaskStore:
+    def __init__(self, pool, loader, poll_interval=0.5, cache=None):
+        """
+        Initialize the store
+
+        Args:
+            pool: Database ConnectionPool holding the tasks table
+            loader: Callable(task_id, include_results) returning the task data (with its version) or None
+            poll_interval: Seconds between version checks when waiting on a task owned by another worker
+            cache: TaskCache bounding the snapshots held in memory
+        """
+        self.pool = pool
+        self.loader = loader
+        self.poll_interval = poll_interval
+
+        # task_id -> (task_data, owned, full). Owned tasks are only ever written by this process.
+        # Snapshots that aren't full were loaded for status reads and carry result counts, not results.
+        self._snapshots = cache or TaskCache()
+        self._lock = threading.Lock()
+        self._events = TaskEvents()
+
+        # Counters for stats()
+        self._hits = 0
+        self._reloads = 0
+
+    def put(self, task_id, task_data, owned=True):
+        """Store the latest snapshot of a task and wake anything waiting on it"""
+        self._cache(task_id, task_data, owned, True)
+        self._events.publish(task_id)
+
+    def local(self, task_id):
+        """Return this process's copy of a task it owns, or None"""
+        entry = self._snapshots.get(task_id)
+        if entry is None or not entry[1]:
+            return None
+        return entry[0]
+
+    def get(self, task_id, full=True):
+        """
+        Look up a task, reloading it from the database only when another worker changed it
+
+        Args:
+            task_id: Task to look up
+            full: Whether each supplier's full result list is needed. Status reads pass False
+                so tasks from other workers are loaded without parsing their results.
+
+        Returns:
+            The task data, or None if the task doesn't exist
+        """
+        entry = self._snapshots.get(task_id)
+
+        # Tasks started here are always current in memory
+        if entry is not None and entry[1]:
+            with self._lock:
+                self._hits += 1
+            return entry[0]
+
+        # Everyone else's tasks are checked with a primary key lookup on the version
+        version = self.version(task_id)
+        if version is None:
+            self.discard(task_id)
+            return None
+
+        if entry is not None and entry[0].get("version", 0) == version and (entry[2] or not full):
+            with self._lock:
+                self._hits += 1
+            return entry[0]
+
+        task_data = self.loader(task_id, full)
+        with self._lock:
+            self._reloads += 1
+        if task_data is not None:
+            self._cache(task_id, task_data, False, full)
+        return task_data
+
+    def version(self, task_id):
+        """Return the committed version of a task, or None if it doesn't exist"""
+        try:
+            with self.pool.connection() as db:
+                row = db.execute('SELECT version FROM tasks WHERE task_id = ?', (task_id,)).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Database error reading task version: {str(e)}")
+            return None
+        return row[0] if row else None
+
+    def wait_for_change(self, task_id, since_version, timeout):
+        """
+        Block until the task's version moves past since_version or the timeout expires.
+        Changes made by this process wake waiters immediately, changes made by other
+        workers are picked up within poll_interval.
+
+        Returns:
+            The task's current version (None if it was deleted)
+        """
+        deadline = time.time() + timeout
+
+        while True:
+            # Read the local counter first so a publish between the two reads isn't missed
+            local_version = self._events.version(task_id)
+
+            task_data = self.get(task_id, full=False)
+            if task_data is None:
+                return None
+
+            version = task_data.get("version", 0)
+            remaining = deadline - time.time()
+            if version != since_version or remaining <= 0:
+                return version
+
+            self._events.wait(task_id, local_version, min(self.poll_interval, remaining))
+
+    def discard(self, task_id):
+        """Forget a task (it was deleted or expired)"""
+        self._snapshots.pop(task_id)
+        self._events.forget(task_id)
+
+    def stats(self):
+        """Return cache counters and how often reads were served without a reload"""
+        stats = self._snapshots.stats()
+        with self._lock:
+            stats["snapshot_hits"] = self._hits
+            stats["reloads"] = self._reloads
+        return stats
+
+    def _cache(self, task_id, task_data, owned, full):
+        # Tasks this process is still scraping can't be evicted, their only up-to-date copy is here
+        pinned = owned and not task_data.get("all_completed")
+        self._snapshots.put(task_id, (task_data, owned, full), estimate_size(task_data), pinned=pinned)
@@ -0,0 +1,26 @@
+# tests/conftest.py
+# The app's modules live at the repository root (and in Scrapers/), not in an installed package
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def main(tmp_path_factory):
+    """main.py, imported with its database, log and runtime files in a scratch directory"""
+    directory = tmp_path_factory.mktemp("app")
+    os.environ["DATABASE"] = str(directory / "glass_scraper.db")
+    os.environ["DATA_DIR"] = str(directory / "data")
+
+    # The log file is opened relative to the working directory at import
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        import main
+    finally:
+        os.chdir(cwd)
+    return main
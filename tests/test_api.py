@@ -0,0 +1,100 @@
+# tests/test_api.py
+# JSON endpoints, through Flask's test client
+
+import time
+import uuid
+
+
+def start_task(main, scrapers=("PWG", "Pilkington")):
+    """Task data as run_all_scrapers creates it, held by this process"""
+    task_id = str(uuid.uuid4())
+    task_data = {
+        "part_number": "DW2000",
+        "start_time": time.time(),
+        "results": {
+            scraper_name: {"supplier": scraper_name, "part_number": "DW2000", "success": False,
+                           "message": "Search in progress...", "results": [], "time_taken": 0, "completed": False}
+            for scraper_name in scrapers
+        },
+        "completed_count": 0,
+        "all_completed": False,
+        "scrapers": list(scrapers),
+        "version": 0,
+    }
+    main.task_store.put(task_id, task_data)
+    main.save_task_to_db(task_id, task_data)
+    return task_id
+
+
+def test_status_is_tagged_with_the_task_version(main):
+    client = main.app.test_client()
+    task_id = start_task(main)
+
+    response = client.get(f'/api/status/{task_id}')
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'W/"{task_id}-0"'
+    assert response.headers["Cache-Control"] == "no-cache"
+    status = response.get_json()
+    assert status["elapsed"] >= 0
+    assert (status["completed_count"], status["total_count"]) == (0, 2)
+    assert list(status["results"]) == ["PWG", "Pilkington"]
+
+    # Nothing changed - no body
+    response = client.get(f'/api/status/{task_id}', headers={"If-None-Match": f'W/"{task_id}-0"'})
+    assert response.status_code == 304
+    assert response.data == b''
+
+
+def test_new_version_is_sent_in_full(main):
+    client = main.app.test_client()
+    task_id = start_task(main)
+    main.finish_scrape(task_id, "PWG", "DW2000", time.time(), [("DW2000 GTY", "In Stock", "$123.45", "Dallas", "Windshield")])
+
+    response = client.get(f'/api/status/{task_id}', headers={"If-None-Match": f'W/"{task_id}-0"'})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'W/"{task_id}-1"'
+    status = response.get_json()
+    assert status["completed_count"] == 1
+    assert status["results"]["PWG"]["result_count"] == 1
+
+
+def test_client_ahead_of_this_worker_keeps_its_version(main):
+    client = main.app.test_client()
+    task_id = start_task(main)
+
+    # Seen on the worker running the task, which is ahead of what this one has
+    response = client.get(f'/api/status/{task_id}', headers={"If-None-Match": f'W/"{task_id}-3"'})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == f'W/"{task_id}-3"'
+
+    # Tags for other tasks don't count
+    response = client.get(f'/api/status/{task_id}', headers={"If-None-Match": 'W/"other-9"'})
+    assert response.status_code == 200
+
+
+def test_status_body_is_serialized_once_per_version(main):
+    task_id = start_task(main)
+    task_data = main.task_store.get(task_id, full=False)
+
+    main.status_json(task_id, task_data)
+    version, body = main.status_cache.get(task_id)
+    main.status_json(task_id, task_data)
+
+    assert version == 0
+    assert main.status_cache.get(task_id)[1] is body
+
+
+def test_unknown_task_status_is_404(main):
+    assert main.app.test_client().get('/api/status/no-such-task').status_code == 404
+
+
+def test_stats_report_this_worker(main):
+    response = main.app.test_client().get('/api/stats')
+
+    assert response.status_code == 200
+    stats = response.get_json()
+    assert stats["pid"] > 0
+    assert {"entries", "bytes", "max_bytes", "hits", "misses", "evictions", "snapshot_hits", "reloads"} <= set(stats["task_store"])
+    assert {"entries", "bytes", "max_bytes", "evictions"} <= set(stats["status_cache"])
+    assert {"pool_size", "idle_timeout", "hosts"} <= set(stats["transport"])
+    assert isinstance(stats["strategies"], dict)
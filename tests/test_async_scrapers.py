@@ -0,0 +1,80 @@
+# tests/test_async_scrapers.py
+# Async flows share the blocking scrapers' response decoding and stored logins
+
+import asyncio
+
+import aiohttp
+import pytest
+import requests
+from multidict import CIMultiDict
+from yarl import URL
+
+from Scrapers import async_scrapers
+from Scrapers.cookie_store import CookieStore
+from Scrapers.response import ResponseDecoder
+
+PAGE = "<html><body>Pare-brise teinté – 123,45 €</body></html>"
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = CookieStore(directory=str(tmp_path / "cookies"), validation_window=60)
+    monkeypatch.setattr(async_scrapers, "cookie_store", store)
+    return store
+
+
+def test_bodies_decode_like_wrapped_responses():
+    decoder = ResponseDecoder()
+    response = requests.Response()
+    response._content = PAGE.encode("utf-8")
+    response.headers["Content-Type"] = "text/html"
+    response.encoding = "ISO-8859-1"
+
+    headers = CIMultiDict({"content-type": "text/html"})
+    assert decoder.decode_body("PWG", headers, PAGE.encode("utf-8")) == decoder.wrap("PWG", response).text == response.text
+
+    headers = CIMultiDict({"Content-Type": "text/html; charset=utf-8"})
+    assert decoder.decode_body("PWG", headers, PAGE.encode("utf-8")) == PAGE
+
+
+def test_login_stored_by_the_blocking_scrapers_is_reused(store):
+    session = requests.Session()
+    session.cookies.set("ASPSESSIONID", "abc123", domain="buypgwautoglass.com", path="/")
+    session.cookies.set("auth", "token", domain=".buypgwautoglass.com", path="/", secure=True)
+    store.save("pgw_cookies", session)
+
+    async def restore():
+        async with aiohttp.ClientSession() as client_session:
+            assert await async_scrapers.restore_login(client_session, "pgw_cookies", 3600)
+            cookies = client_session.cookie_jar.filter_cookies(URL("https://buypgwautoglass.com/PartSearch/"))
+            return {name: morsel.value for name, morsel in cookies.items()}
+
+    assert asyncio.run(restore()) == {"ASPSESSIONID": "abc123", "auth": "token"}
+
+
+def test_unvalidated_login_is_not_reused(store):
+    session = requests.Session()
+    session.cookies.set("ASPSESSIONID", "abc123", domain="buypgwautoglass.com", path="/")
+    store.save("pgw_cookies", session, validated=False)
+
+    async def restore():
+        async with aiohttp.ClientSession() as client_session:
+            return await async_scrapers.restore_login(client_session, "pgw_cookies", 3600)
+
+    assert asyncio.run(restore()) is False
+
+
+def test_async_login_is_stored_for_the_blocking_scrapers(store):
+    async def login():
+        async with aiohttp.ClientSession() as client_session:
+            client_session.cookie_jar.update_cookies(
+                {"ASPSESSIONID": "abc123"}, response_url=URL("https://buypgwautoglass.com/")
+            )
+            await async_scrapers.store_login(client_session, "pgw_cookies")
+
+    asyncio.run(login())
+
+    session = requests.Session()
+    entry = store.apply("pgw_cookies", session)
+    assert store.is_validated(entry)
+    assert session.cookies.get("ASPSESSIONID", domain="buypgwautoglass.com") == "abc123"
@@ -0,0 +1,121 @@
+# tests/test_cookie_store.py
+# CookieStore - cookies shared through atomic JSON files, read-modify-write locked across processes
+
+import os
+import json
+import time
+import multiprocessing
+
+import pytest
+import requests
+
+from Scrapers.cookie_store import CookieStore, fcntl
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CookieStore(directory=str(tmp_path / "cookies"), validation_window=60)
+
+
+def logged_in_session():
+    session = requests.Session()
+    session.cookies.set("ASP.NET_SessionId", "abc123", domain="shop.example.com", path="/")
+    session.cookies.set("auth", "token", domain=".example.com", path="/account", secure=True)
+    return session
+
+
+def test_saved_cookies_apply_to_a_new_session(store):
+    store.save("test_cookies", logged_in_session())
+
+    session = requests.Session()
+    entry = store.apply("test_cookies", session)
+
+    assert store.is_validated(entry)
+    assert session.cookies.get("ASP.NET_SessionId", domain="shop.example.com") == "abc123"
+    cookie = next(cookie for cookie in session.cookies if cookie.name == "auth")
+    assert (cookie.domain, cookie.path, cookie.secure) == (".example.com", "/account", True)
+
+
+def test_missing_or_old_cookies_are_not_applied(store):
+    assert store.apply("test_cookies", requests.Session()) is None
+
+    store.save("test_cookies", logged_in_session())
+    time.sleep(0.05)
+    assert store.load("test_cookies", max_age=0.01) is None
+    assert store.load("test_cookies", max_age=60) is not None
+
+
+def test_validation_is_recorded_in_the_file(store):
+    store.save("test_cookies", logged_in_session(), validated=False)
+    assert not store.is_validated(store.load("test_cookies"))
+
+    store.mark_validated("test_cookies")
+    assert store.is_validated(store.load("test_cookies"))
+
+    # Another worker's store sees it too
+    other = CookieStore(directory=store.directory, validation_window=60)
+    other.invalidate("test_cookies")
+    assert not store.is_validated(store.load("test_cookies"))
+
+
+def test_file_is_read_again_only_after_it_changes(store):
+    store.save("test_cookies", logged_in_session())
+    for _ in range(5):
+        store.load("test_cookies")
+    assert store.stats()["disk_reads"] == 1
+
+    store.mark_validated("test_cookies")
+    store.load("test_cookies")
+    assert store.stats()["disk_reads"] == 2
+
+
+def hammer(directory, rounds):
+    store = CookieStore(directory=directory)
+    for idx in range(rounds):
+        if idx % 3 == 0:
+            store.save("test_cookies", logged_in_session(), validated=False)
+        elif idx % 3 == 1:
+            store.mark_validated("test_cookies")
+        else:
+            store.invalidate("test_cookies")
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs fcntl")
+def test_concurrent_writers_leave_a_whole_file(store):
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=hammer, args=(store.directory, 30)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+    with open(store.path("test_cookies")) as file:
+        entry = json.load(file)
+    assert {cookie["name"] for cookie in entry["cookies"]} == {"ASP.NET_SessionId", "auth"}
+
+    # Temporary files were all renamed into place
+    assert sorted(os.listdir(store.directory)) == ["test_cookies.json", "test_cookies.json.lock"]
+
+
+def hold_lock(directory, locked, release):
+    store = CookieStore(directory=directory)
+    with store._locked("test_cookies"):
+        locked.set()
+        release.wait(10)
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs fcntl")
+def test_lock_is_held_across_processes(store):
+    context = multiprocessing.get_context("fork")
+    locked, release = context.Event(), context.Event()
+    process = context.Process(target=hold_lock, args=(store.directory, locked, release))
+    process.start()
+    try:
+        assert locked.wait(10)
+        with open(store.path("test_cookies") + ".lock", "a") as lock_file:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    finally:
+        release.set()
+        process.join(timeout=10)
@@ -0,0 +1,111 @@
+# tests/test_db_writer.py
+# DBWriter - group commits, flush() waits for commits, one bad write doesn't sink a batch
+
+import threading
+
+import pytest
+
+from database import ConnectionPool
+from db_writer import DBWriter
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "test.db"), size=4)
+    with pool.transaction() as db:
+        db.execute("CREATE TABLE items (task_id TEXT, value INTEGER)")
+        db.execute("CREATE TABLE counters (task_id TEXT PRIMARY KEY, value INTEGER)")
+    yield pool
+    pool.close()
+
+
+def count(pool, task_id=None):
+    with pool.connection() as db:
+        if task_id is None:
+            return db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        return db.execute("SELECT COUNT(*) FROM items WHERE task_id = ?", (task_id,)).fetchone()[0]
+
+
+def insert(task_id, value):
+    return [("INSERT INTO items (task_id, value) VALUES (?, ?)", (task_id, value))]
+
+
+def test_flush_waits_until_writes_are_committed(pool):
+    writer = DBWriter(pool, flush_interval=0.05)
+    for value in range(20):
+        writer.submit("t1", insert("t1", value))
+
+    assert writer.flush(timeout=5)
+    assert count(pool) == 20
+    assert writer.stats()["queued"] == 0
+
+
+def test_flush_for_one_task(pool):
+    writer = DBWriter(pool, flush_interval=0.01)
+    writer.submit("t1", insert("t1", 1))
+    writer.submit("t2", insert("t2", 2))
+
+    assert writer.flush("t1", timeout=5)
+    assert count(pool, "t1") == 1
+
+    # A task without pending writes has nothing to wait for
+    assert writer.flush("unknown", timeout=0)
+
+
+def test_writes_are_batched(pool):
+    writer = DBWriter(pool, flush_interval=0.2)
+    for value in range(50):
+        writer.submit("t1", insert("t1", value))
+    writer.flush(timeout=5)
+
+    stats = writer.stats()
+    assert stats["committed"] == 50
+    assert stats["batches"] < 50
+    assert stats["largest_batch"] > 1
+
+
+def test_writes_for_a_task_apply_in_submit_order(pool):
+    writer = DBWriter(pool, flush_interval=0.01, max_batch=7)
+    for value in range(40):
+        writer.submit("t1", [("INSERT OR REPLACE INTO counters (task_id, value) VALUES (?, ?)", ("t1", value))])
+    writer.flush(timeout=5)
+
+    with pool.connection() as db:
+        assert db.execute("SELECT value FROM counters WHERE task_id = 't1'").fetchone()[0] == 39
+
+
+def test_executemany_statements(pool):
+    writer = DBWriter(pool)
+    writer.submit("t1", [("INSERT INTO items (task_id, value) VALUES (?, ?)", [("t1", 1), ("t1", 2), ("t1", 3)])])
+    writer.flush(timeout=5)
+
+    assert count(pool, "t1") == 3
+
+
+def test_a_failing_write_does_not_lose_the_rest_of_its_batch(pool):
+    writer = DBWriter(pool, flush_interval=0.2)
+    writer.submit("t1", insert("t1", 1))
+    writer.submit("bad", [("INSERT INTO missing_table VALUES (?)", (1,))])
+    writer.submit("t2", insert("t2", 2))
+
+    assert writer.flush(timeout=5)
+    assert count(pool, "t1") == 1
+    assert count(pool, "t2") == 1
+    assert writer.stats()["failed"] == 1
+
+
+def test_concurrent_submitters(pool):
+    writer = DBWriter(pool, flush_interval=0.005)
+
+    def submit(task_id):
+        for value in range(25):
+            writer.submit(task_id, insert(task_id, value))
+
+    threads = [threading.Thread(target=submit, args=(f"t{idx}",)) for idx in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert writer.flush(timeout=5)
+    assert count(pool) == 200
@@ -0,0 +1,117 @@
+# tests/test_expiry.py
+# TaskExpiry - expired tasks are deleted with their results and parts, and their pages go back to the filesystem
+
+import json
+import time
+import uuid
+
+import pytest
+
+from database import ConnectionPool
+from expiry import MAX_BATCH_SIZE, TaskExpiry
+from migrations import migrate
+from parts import INSERT_PART_SQL, part_rows
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "test.db"), size=2)
+    migrate(pool)
+    yield pool
+    pool.close()
+
+
+def add_tasks(pool, count, start_time, parts=0):
+    task_ids = [str(uuid.uuid4()) for _ in range(count)]
+    with pool.transaction() as db:
+        for task_id in task_ids:
+            db.execute(
+                'INSERT INTO tasks (task_id, part_number, start_time, scrapers) VALUES (?, ?, ?, ?)',
+                (task_id, "DW2000", start_time, json.dumps(["PWG"]))
+            )
+            db.execute(
+                'INSERT INTO task_results (task_id, scraper_name, supplier, part_number) VALUES (?, ?, ?, ?)',
+                (task_id, "PWG", "PWG", "DW2000")
+            )
+            results = [{"part_number": f"DW{idx}", "description": "x" * 500} for idx in range(parts)]
+            db.executemany(INSERT_PART_SQL, part_rows(task_id, "PWG", results))
+    return task_ids
+
+
+def pragma(pool, name):
+    with pool.connection() as db:
+        return db.execute(f'PRAGMA {name}').fetchone()[0]
+
+
+def test_existing_database_is_rebuilt_for_incremental_vacuum(tmp_path):
+    path = str(tmp_path / "old.db")
+    old = ConnectionPool(path, size=1, pragmas={"auto_vacuum": "NONE"})
+    with old.transaction() as db:
+        db.execute('CREATE TABLE tasks (task_id TEXT PRIMARY KEY, part_number TEXT NOT NULL, start_time REAL NOT NULL, '
+                   'all_completed BOOLEAN NOT NULL DEFAULT 0, completed_count INTEGER NOT NULL DEFAULT 0, scrapers TEXT NOT NULL)')
+    assert pragma(old, "auto_vacuum") == 0
+    old.close()
+
+    pool = ConnectionPool(path, size=2)
+    migrate(pool)
+    assert pragma(pool, "auto_vacuum") == 2
+    pool.close()
+
+
+def test_purge_returns_freed_pages(pool):
+    add_tasks(pool, 50, time.time() - 7200, parts=20)
+    expiry = TaskExpiry(pool, max_age=3600, vacuum_pages=100)
+
+    report = expiry.purge()
+
+    assert report["tasks"] == 50
+    assert report["bytes_reclaimed"] > 0
+    assert pragma(pool, "freelist_count") == 0
+
+
+def test_purge_deletes_only_expired_tasks_with_their_rows(pool):
+    now = time.time()
+    expired = add_tasks(pool, 30, now - 7200, parts=2)
+    fresh = add_tasks(pool, 5, now - 60, parts=2)
+    expiry = TaskExpiry(pool, max_age=3600, batch_size=8)
+
+    report = expiry.purge(now=now)
+
+    assert sorted(report["task_ids"]) == sorted(expired)
+    assert (report["tasks"], report["results"], report["parts"]) == (30, 30, 60)
+    assert report["batches"] > 1
+    with pool.connection() as db:
+        assert sorted(row[0] for row in db.execute('SELECT task_id FROM tasks')) == sorted(fresh)
+        assert db.execute('SELECT COUNT(*) FROM task_results').fetchone()[0] == 5
+        assert db.execute('SELECT COUNT(*) FROM parts').fetchone()[0] == 10
+
+
+def test_slow_batches_shrink_and_fast_ones_grow(pool):
+    expiry = TaskExpiry(pool, batch_size=100, max_pause=0.05)
+
+    expiry._adjust_batch_size(0.2)
+    assert expiry.batch_size == 50
+
+    expiry._adjust_batch_size(0.001)
+    assert expiry.batch_size == 75
+
+    expiry.batch_size = 10
+    expiry._adjust_batch_size(1)
+    assert expiry.batch_size == 10
+
+
+def test_batches_stay_under_the_parameter_limit(pool):
+    assert TaskExpiry(pool, batch_size=5000).batch_size == MAX_BATCH_SIZE
+
+
+def test_each_task_is_tracked_once_and_popped_oldest_first(pool):
+    expiry = TaskExpiry(pool, max_age=100)
+    expiry.track("t2", 20)
+    expiry.track("t1", 10)
+    expiry.track("t3", 500)
+    for _ in range(5):
+        expiry.track("t1", 10)
+
+    assert expiry.pop_expired(now=200) == ["t1", "t2"]
+    assert expiry.pop_expired(now=200) == []
+    assert expiry.pop_expired(now=1000) == ["t3"]
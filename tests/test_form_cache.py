@@ -0,0 +1,86 @@
+# tests/test_form_cache.py
+# FormCache - parsed PWG search forms reused per session until they expire or a POST fails
+
+import gc
+import time
+
+import requests
+
+from Scrapers.form_cache import FormCache
+from Scrapers.pwg_scraper import build_search_request, fill_search_form, parse_search_form
+
+SEARCH_PAGE = "https://buypgwautoglass.com/PartSearch/search.asp"
+
+FORM_PAGE = """
+<html><body>
+<form method="post" action="searchResults.asp">
+  <input type="hidden" name="__VIEWSTATE" value="dDwtMTA4">
+  <input type="hidden" name="Token" value="session-7">
+  <input type="text" name="PartNo">
+  <input type="submit" name="btnSearch" value="Search">
+</form>
+</body></html>
+"""
+
+
+def test_template_builds_the_same_post_as_the_form_page():
+    template = parse_search_form(FORM_PAGE, SEARCH_PAGE)
+
+    for part_number in ("DW2000", "FW1234"):
+        assert fill_search_form(template, part_number) == build_search_request(FORM_PAGE, SEARCH_PAGE, part_number)
+
+    search_url, data = fill_search_form(template, "DW2000")
+    assert search_url == "https://buypgwautoglass.com/PartSearch/searchResults.asp"
+    assert data == {"PartNo": "DW2000", "PartTypeA": "PartTypeA", "__VIEWSTATE": "dDwtMTA4",
+                    "Token": "session-7", "btnSearch": "Search"}
+
+
+def test_page_without_a_form_has_no_template():
+    assert parse_search_form("<html><body>Please log in</body></html>", SEARCH_PAGE) is None
+
+
+def test_templates_are_kept_per_session_and_url():
+    cache = FormCache()
+    session, other = requests.Session(), requests.Session()
+    template = parse_search_form(FORM_PAGE, SEARCH_PAGE)
+    cache.put(session, SEARCH_PAGE, template)
+
+    assert cache.get(session, SEARCH_PAGE) == template
+    assert cache.get(session, "https://buypgwautoglass.com/PartSearch/default.asp") is None
+    assert cache.get(other, SEARCH_PAGE) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_templates_expire():
+    cache = FormCache(ttl=0.05)
+    session = requests.Session()
+    cache.put(session, SEARCH_PAGE, ("url", {}))
+
+    time.sleep(0.1)
+    assert cache.get(session, SEARCH_PAGE) is None
+
+
+def test_invalidate_drops_every_template_of_a_session():
+    cache = FormCache()
+    session, other = requests.Session(), requests.Session()
+    cache.put(session, SEARCH_PAGE, ("a", {}))
+    cache.put(session, "https://buypgwautoglass.com/PartSearch/default.asp", ("b", {}))
+    cache.put(other, SEARCH_PAGE, ("c", {}))
+
+    cache.invalidate(session)
+    cache.invalidate(session)
+
+    assert cache.get(session, SEARCH_PAGE) is None
+    assert cache.get(other, SEARCH_PAGE) == ("c", {})
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_templates_go_with_their_session():
+    cache = FormCache()
+    session = requests.Session()
+    cache.put(session, SEARCH_PAGE, ("url", {}))
+    assert cache.stats()["sessions"] == 1
+
+    del session
+    gc.collect()
+    assert cache.stats()["sessions"] == 0
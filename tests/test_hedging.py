@@ -0,0 +1,91 @@
+# tests/test_hedging.py
+# HedgedRequests - primary at once, alternates when it is late or empty, first result wins, one deadline
+
+import time
+
+from Scrapers.hedging import MIN_SAMPLES, HedgedRequests
+
+
+def attempt(result, delay=0, calls=None):
+    def run(hedge):
+        if calls is not None:
+            calls.append(time.time())
+        deadline = time.time() + delay
+        while time.time() < deadline:
+            if hedge.cancelled.is_set():
+                return None
+            time.sleep(0.005)
+        return result
+    return run
+
+
+def failing(hedge):
+    raise RuntimeError("connection reset")
+
+
+def test_fast_primary_is_not_hedged():
+    hedger = HedgedRequests("Test", deadline=2, initial_delay=0.5)
+    calls = []
+
+    assert hedger.run([attempt(["P1"]), attempt(["P2"], calls=calls)]) == ["P1"]
+    assert calls == []
+    assert hedger.stats()["hedges"] == 0
+
+
+def test_late_primary_is_hedged_and_cancelled():
+    hedger = HedgedRequests("Test", deadline=2, initial_delay=0.05)
+    hedges = []
+
+    def slow(hedge):
+        hedges.append(hedge)
+        return attempt(["P1"], delay=1)(hedge)
+
+    started = time.time()
+    assert hedger.run([slow, attempt(["P2"])]) == ["P2"]
+    assert time.time() - started < 0.5
+    assert hedges[0].cancelled.is_set()
+    assert hedger.stats()["wins"] == {"attempt_2": 1}
+
+
+def test_empty_or_failed_attempt_starts_the_next_at_once():
+    hedger = HedgedRequests("Test", deadline=2, initial_delay=1)
+
+    started = time.time()
+    assert hedger.run([attempt([]), failing, attempt(["P3"])]) == ["P3"]
+    assert time.time() - started < 0.5
+    assert hedger.stats()["errors"] == 1
+
+
+def test_all_empty_returns_none():
+    hedger = HedgedRequests("Test", deadline=2, initial_delay=0.05)
+
+    assert hedger.run([attempt([]), attempt(None)]) is None
+    assert hedger.stats()["misses"] == 1
+
+
+def test_run_ends_at_the_deadline():
+    hedger = HedgedRequests("Test", deadline=0.2, initial_delay=0.05)
+
+    started = time.time()
+    assert hedger.run([attempt(["P1"], delay=2), attempt(["P2"], delay=2)]) is None
+    assert time.time() - started < 0.5
+
+    stats = hedger.stats()
+    assert stats["deadlines"] == 1
+    assert stats["abandoned"] == 2
+
+
+def test_delay_follows_primaries_that_returned_results():
+    hedger = HedgedRequests("Test", deadline=2, initial_delay=1, min_delay=0.01, max_delay=2)
+
+    # Fast failures and empty results don't count
+    for _ in range(MIN_SAMPLES):
+        hedger.run([failing])
+        hedger.run([attempt([])])
+    time.sleep(0.05)
+    assert hedger.delay() == 1
+
+    for _ in range(MIN_SAMPLES):
+        hedger.run([attempt(["P1"], delay=0.05)])
+    time.sleep(0.05)
+    assert 0.04 < hedger.delay() < 0.5
@@ -0,0 +1,132 @@
+# tests/test_migrations.py
+# Schema migrations - applied in order, once, on fresh and on pre-migration databases
+
+import json
+import sqlite3
+
+import pytest
+
+from database import ConnectionPool
+from migrations import MIGRATIONS, migrate, schema_version, table_columns
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "test.db"), size=2)
+    yield pool
+    pool.close()
+
+
+def test_migrations_are_numbered_in_order():
+    numbers = [number for number, _, _ in MIGRATIONS]
+    assert numbers == list(range(1, len(MIGRATIONS) + 1))
+
+
+def test_fresh_database_reaches_the_latest_version(pool):
+    assert migrate(pool) == len(MIGRATIONS)
+
+    with pool.connection() as db:
+        tables = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        indexes = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"tasks", "task_results", "parts"} <= tables
+        assert {"idx_task_results_task_scraper", "idx_tasks_start_time", "idx_parts_task_supplier"} <= indexes
+        assert {"result_count", "summary"} <= set(table_columns(db, "task_results"))
+
+
+def test_migrating_again_changes_nothing(pool, caplog):
+    migrate(pool)
+    with pool.connection() as db:
+        schema = [tuple(row) for row in db.execute("SELECT sql FROM sqlite_master ORDER BY name")]
+
+    caplog.set_level("INFO", logger="migrations")
+    assert migrate(pool) == len(MIGRATIONS)
+    assert not [record for record in caplog.records if "Applying migration" in record.message]
+
+    with pool.connection() as db:
+        assert [tuple(row) for row in db.execute("SELECT sql FROM sqlite_master ORDER BY name")] == schema
+
+
+def test_steps_run_in_order_and_stop_at_the_first_failure(pool, monkeypatch):
+    applied = []
+
+    def step(number):
+        def run(db):
+            applied.append(number)
+            if number == 3:
+                raise sqlite3.OperationalError("boom")
+        return run
+
+    monkeypatch.setattr("migrations.MIGRATIONS", [(number, f"step {number}", step(number)) for number in range(1, 5)])
+
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(pool)
+    assert applied == [1, 2, 3]
+
+    # The failed step rolled back, so it runs again (after the steps before it are skipped)
+    with pool.connection() as db:
+        assert schema_version(db) == 2
+
+
+def test_pre_migration_database_is_upgraded(tmp_path):
+    path = str(tmp_path / "legacy.db")
+
+    # The schema the app created before migrations: no version column, no cascade, results as JSON
+    legacy = sqlite3.connect(path)
+    legacy.executescript('''
+        CREATE TABLE tasks (
+            task_id TEXT PRIMARY KEY,
+            part_number TEXT NOT NULL,
+            start_time REAL NOT NULL,
+            all_completed BOOLEAN NOT NULL DEFAULT 0,
+            completed_count INTEGER NOT NULL DEFAULT 0,
+            scrapers TEXT NOT NULL
+        );
+        CREATE TABLE task_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id TEXT NOT NULL,
+            scraper_name TEXT NOT NULL,
+            supplier TEXT NOT NULL,
+            part_number TEXT NOT NULL,
+            success BOOLEAN NOT NULL DEFAULT 0,
+            message TEXT,
+            time_taken REAL DEFAULT 0,
+            completed BOOLEAN NOT NULL DEFAULT 0,
+            results_json TEXT,
+            FOREIGN KEY (task_id) REFERENCES tasks (task_id)
+        );
+    ''')
+    results = [{"part_number": "DW2000", "price": "$1,234.50", "location": "Miami"}, {"part_number": "DW2001"}]
+    legacy.execute("INSERT INTO tasks VALUES ('t1', 'DW2000', 1.0, 1, 1, '[\"PWG\"]')")
+    legacy.execute(
+        "INSERT INTO task_results (task_id, scraper_name, supplier, part_number, success, completed, results_json) "
+        "VALUES ('t1', 'PWG', 'PWG', 'DW2000', 1, 1, ?)", (json.dumps(results),)
+    )
+    legacy.execute(
+        "INSERT INTO task_results (task_id, scraper_name, supplier, part_number, results_json) "
+        "VALUES ('gone', 'PWG', 'PWG', 'DW2000', '[]')"
+    )
+    legacy.commit()
+    legacy.close()
+
+    pool = ConnectionPool(path, size=2)
+    try:
+        assert migrate(pool) == len(MIGRATIONS)
+
+        with pool.connection() as db:
+            assert "version" in table_columns(db, "tasks")
+
+            # The orphaned result was dropped, the other one lost its blob to the parts table
+            rows = db.execute("SELECT task_id, result_count, results_json FROM task_results").fetchall()
+            assert [tuple(row) for row in rows] == [("t1", 2, None)]
+
+            parts = db.execute(
+                "SELECT position, part_number, price_cents, location FROM parts WHERE task_id = 't1' ORDER BY position"
+            ).fetchall()
+            assert [tuple(part) for part in parts] == [(0, "DW2000", 123450, "Miami"), (1, "DW2001", None, None)]
+
+            # Deleting a task now takes its results and parts with it
+            db.execute("DELETE FROM tasks WHERE task_id = 't1'")
+            assert db.execute("SELECT COUNT(*) FROM task_results").fetchone()[0] == 0
+            assert db.execute("SELECT COUNT(*) FROM parts").fetchone()[0] == 0
+    finally:
+        pool.close()
@@ -0,0 +1,121 @@
+# tests/test_parts.py
+# Parts table - supplier results stored as rows and rebuilt exactly as the API returned them
+
+import time
+import uuid
+
+import pytest
+
+from database import ConnectionPool
+from migrations import migrate
+from parts import INSERT_PART_SQL, SELECT_PART_COLUMNS, parse_price_cents, part_rows, rebuild_part
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "test.db"), size=2)
+    migrate(pool)
+    yield pool
+    pool.close()
+
+
+def round_trip(pool, supplier, results):
+    task_id = str(uuid.uuid4())
+    with pool.transaction() as db:
+        db.execute(
+            'INSERT INTO tasks (task_id, part_number, start_time, scrapers) VALUES (?, ?, ?, ?)',
+            (task_id, "DW2000", time.time(), "[]")
+        )
+        db.executemany(INSERT_PART_SQL, part_rows(task_id, supplier, results))
+    with pool.connection() as db:
+        rows = db.execute(f'SELECT {SELECT_PART_COLUMNS} FROM parts WHERE task_id = ? ORDER BY position', (task_id,))
+        return [rebuild_part(row) for row in rows.fetchall()]
+
+
+def test_parse_price_cents():
+    assert parse_price_cents("$1,234.50") == 123450
+    assert parse_price_cents("12") == 1200
+    assert parse_price_cents(99.99) == 9999
+    assert parse_price_cents("Call for price") is None
+    assert parse_price_cents(None) is None
+
+
+def test_formatted_results_rebuild_unchanged(pool):
+    results = [
+        {'part_number': 'DW2000 GTY', 'stock': None, 'availability': 'In Stock', 'price': '$123.45', 'location': 'Dallas', 'description': 'Windshield'},
+        {'part_number': 'DW2000 GBY', 'stock': None, 'availability': 'Out of Stock', 'price': 'N/A', 'location': None, 'description': 'N/A'},
+    ]
+    assert round_trip(pool, "PWG", results) == results
+
+
+def test_key_order_and_uncommon_values_survive(pool):
+    results = [
+        # Key order differs from PART_COLUMNS, a price that isn't text, keys without a column
+        {'price': 42.5, 'part_number': 'FW1234', 'supplier': 'Import Glass Corp', 'stock': {'TX': 2}, 'features': ['heated', 'rain sensor']},
+        # A supplier key that doesn't match the row's supplier is kept as is
+        {'part_number': 'FW1234', 'supplier': 'Someone else'},
+        {},
+        "not a dictionary",
+    ]
+    rebuilt = round_trip(pool, "Import Glass Corp", results)
+
+    assert rebuilt == results
+    assert [list(part) for part in rebuilt[:3]] == [list(part) for part in results[:3]]
+
+
+def complete(task_data, scraper_name, result):
+    task_data["results"][scraper_name] = result
+    task_data["completed_count"] += 1
+    task_data["all_completed"] = task_data["completed_count"] == len(task_data["scrapers"])
+    task_data["version"] += 1
+
+
+def test_task_loaded_from_the_database_matches_memory(main):
+    task_id = str(uuid.uuid4())
+    start_time = time.time()
+    scrapers = list(main.SCRAPERS)
+    task_data = {
+        "part_number": "DW2000",
+        "start_time": start_time,
+        "results": {},
+        "completed_count": 0,
+        "all_completed": False,
+        "scrapers": scrapers,
+        "version": 0,
+    }
+    for scraper_name in scrapers:
+        task_data["results"][scraper_name] = {
+            "supplier": scraper_name,
+            "part_number": "DW2000",
+            "success": False,
+            "message": "Search in progress...",
+            "results": [],
+            "time_taken": 0,
+            "completed": False,
+        }
+    main.save_task_to_db(task_id, task_data)
+
+    # One result of each kind the scrapers produce: formatted tuples, a scraper's own dictionary,
+    # a cached result and a coalesced one - completed out of order
+    pwg = main.format_search_result("PWG", "DW2000", [("DW2000 GTY", "In Stock", "$123.45", "Dallas", "Windshield")], start_time)
+    mygrant = main.format_search_result("Mygrant Glass", "DW2000", [("DW2000 GTN", "5", "$98.00", "Denver")], start_time)
+    mygrant.update(cached=True, cache_age=12.5)
+    igc = main.format_search_result("Import Glass Corp", "DW2000", {
+        "success": True,
+        "message": "Found 1 part",
+        "results": [{"part_number": "DW2000", "price": 150.0, "availability": "2", "warehouse": "Miami"}],
+        "time_taken": 1.25,
+    }, start_time)
+    pilkington = main.format_search_result("Pilkington", "DW2000", [], start_time)
+    pilkington["coalesced"] = True
+
+    for scraper_name, result in [("PWG", pwg), ("Mygrant Glass", mygrant), ("Import Glass Corp", igc), ("Pilkington", pilkington)]:
+        complete(task_data, scraper_name, result)
+        main.persist_task_result(task_id, scraper_name, task_data)
+    assert main.db_writer.flush(timeout=5)
+
+    loaded = main.load_task_from_db(task_id)
+    assert list(loaded["results"]) == scrapers
+    for scraper_name in scrapers:
+        assert loaded["results"][scraper_name] == task_data["results"][scraper_name]
+    assert loaded == task_data
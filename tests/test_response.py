@@ -0,0 +1,82 @@
+# tests/test_response.py
+# ResponseDecoder - bodies decoded once, with the header, pinned, default or detected charset
+
+import requests
+from requests.utils import get_encoding_from_headers
+
+from Scrapers.response import MIN_DETECTION_BYTES, ResponseDecoder
+
+
+def make_response(content, content_type=None):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = "https://shop.example.com/search"
+    response._content = content
+    if content_type is not None:
+        response.headers["Content-Type"] = content_type
+    # As HTTPAdapter.build_response sets it
+    response.encoding = get_encoding_from_headers(response.headers)
+    return response
+
+
+PAGE = "<html><body>Pare-brise teinté – 123,45 €</body></html>"
+
+
+def test_header_charset_is_used():
+    decoder = ResponseDecoder(charsets={"PWG": "utf-8"})
+    response = make_response(PAGE.encode("cp1252"), "text/html; charset=windows-1252")
+
+    wrapped = decoder.wrap("PWG", response)
+    assert wrapped.charset == "cp1252"
+    assert wrapped.text == PAGE == response.text
+
+
+def test_charsetless_text_decodes_like_requests():
+    decoder = ResponseDecoder()
+    response = make_response(PAGE.encode("utf-8"), "text/html")
+
+    wrapped = decoder.wrap("PWG", response)
+    assert wrapped.charset == "iso8859-1"
+    assert wrapped.text == response.text
+
+
+def test_pinned_charset_replaces_the_default():
+    decoder = ResponseDecoder(charsets={"PWG": "utf-8", "Pilkington": "no-such-charset"})
+
+    assert decoder.wrap("PWG", make_response(PAGE.encode("utf-8"), "text/html")).text == PAGE
+    assert decoder.wrap("Pilkington", make_response(PAGE.encode("utf-8"), "text/html")).charset == "iso8859-1"
+
+
+def test_detection_runs_once_per_supplier():
+    decoder = ResponseDecoder()
+    body = (PAGE * (MIN_DETECTION_BYTES // len(PAGE) + 1)).encode("utf-8")
+
+    first = decoder.wrap("PWG", make_response(body, "application/octet-stream"))
+    second = decoder.wrap("PWG", make_response(body, "application/octet-stream"))
+    assert first.charset == second.charset == "utf-8"
+    assert first.text == second.text == body.decode("utf-8")
+
+    stats = decoder.stats()
+    assert stats["detections"] == 1
+    assert stats["charsets"] == {"PWG": "utf-8"}
+
+
+def test_short_or_ascii_bodies_are_not_cached_as_the_supplier_charset():
+    decoder = ResponseDecoder()
+
+    assert decoder.wrap("PWG", make_response(b"<html>plain</html>")).charset == "utf-8"
+    # Detected, but too short to be kept for the supplier
+    decoder.wrap("PWG", make_response(PAGE.encode("utf-8"))).charset
+
+    assert decoder.stats()["detections"] == 1
+    assert decoder.stats()["charsets"] == {}
+
+
+def test_body_is_decoded_once_and_the_rest_passes_through():
+    decoder = ResponseDecoder()
+    wrapped = decoder.wrap("PWG", make_response(PAGE.encode("utf-8"), "text/html; charset=utf-8"))
+
+    assert wrapped.text is wrapped.text
+    assert decoder.stats()["decodes"] == 1
+    assert (wrapped.status_code, wrapped.url) == (200, "https://shop.example.com/search")
+    assert wrapped.content == PAGE.encode("utf-8")
@@ -0,0 +1,107 @@
+# tests/test_result_cache.py
+# ResultCache - fresh results served by supplier and normalized part number, placeholder parts never cached
+
+import time
+import uuid
+
+from result_cache import ResultCache
+from Scrapers import pilkington_scraper, pwg_scraper
+
+
+def start_task(main, part_number, scrapers):
+    """Task data as run_all_scrapers creates it, held by this process"""
+    task_id = str(uuid.uuid4())
+    task_data = {
+        "part_number": part_number,
+        "start_time": time.time(),
+        "results": {
+            scraper_name: {"supplier": scraper_name, "part_number": part_number, "success": False,
+                           "message": "Search in progress...", "results": [], "time_taken": 0, "completed": False}
+            for scraper_name in scrapers
+        },
+        "completed_count": 0,
+        "all_completed": False,
+        "scrapers": list(scrapers),
+        "version": 0,
+    }
+    main.task_store.put(task_id, task_data)
+    main.save_task_to_db(task_id, task_data)
+    return task_id
+
+
+def test_found_parts_are_cached(main):
+    task_id = start_task(main, "CACHE1", ["PWG"])
+    main.finish_scrape(task_id, "PWG", "CACHE1", time.time(), [("DW1", "In Stock", "$10.00", "Miami, FL", "Windshield")])
+
+    cached, _ = main.result_cache.get("PWG", "cache-1")
+    assert cached["results"][0]["part_number"] == "DW1"
+
+
+def test_default_parts_are_shown_but_not_cached(main):
+    task_id = start_task(main, "CACHE2", ["Pilkington", "PWG"])
+    main.finish_scrape(task_id, "Pilkington", "CACHE2", time.time(), pilkington_scraper.build_default_parts("CACHE2"))
+    main.finish_scrape(task_id, "PWG", "CACHE2", time.time(), pwg_scraper.build_default_parts("CACHE2"))
+
+    assert main.result_cache.get("Pilkington", "CACHE2") is None
+    assert main.result_cache.get("PWG", "CACHE2") is None
+
+    # The task still gets them, as before
+    results = main.task_store.local(task_id)["results"]
+    assert len(results["Pilkington"]["results"]) == 3
+    assert len(results["PWG"]["results"]) == 4
+
+
+def test_hit_returns_a_copy_and_its_age():
+    cache = ResultCache()
+    result = {"success": True, "results": [{"part_number": "DW2000"}]}
+    cache.put("PWG", "DW2000", result)
+
+    cached, age = cache.get("PWG", "dw-2000")
+    assert cached == result
+    assert 0 <= age < 1
+
+    # Changing a returned result doesn't change the cached one
+    cached["results"].append({"part_number": "FW2000"})
+    assert cache.get("PWG", "DW2000")[0] == result
+
+
+def test_results_expire_after_their_supplier_ttl():
+    cache = ResultCache(ttls={"PWG": 0.05}, default_ttl=600)
+    cache.put("PWG", "DW2000", {"success": True})
+    cache.put("Pilkington", "DW2000", {"success": True})
+
+    time.sleep(0.1)
+    assert cache.get("PWG", "DW2000") is None
+    assert cache.get("Pilkington", "DW2000") is not None
+    assert cache.stats()["entries"] == 1
+
+
+def test_least_recently_used_result_is_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.put("PWG", "A", {"part": "A"})
+    cache.put("PWG", "B", {"part": "B"})
+    cache.get("PWG", "A")
+    cache.put("PWG", "C", {"part": "C"})
+
+    assert cache.get("PWG", "B") is None
+    assert cache.get("PWG", "A") is not None
+    assert cache.get("PWG", "C") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_by_supplier_or_part_number():
+    cache = ResultCache()
+    for supplier in ("PWG", "Pilkington"):
+        for part_number in ("A", "B"):
+            cache.put(supplier, part_number, {})
+
+    cache.invalidate(supplier="PWG", part_number="a")
+    assert cache.get("PWG", "A") is None
+    assert cache.get("PWG", "B") is not None
+
+    cache.invalidate(part_number="B")
+    assert cache.get("PWG", "B") is None and cache.get("Pilkington", "B") is None
+    assert cache.get("Pilkington", "A") is not None
+
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
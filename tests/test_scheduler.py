@@ -0,0 +1,92 @@
+# tests/test_scheduler.py
+# ScraperScheduler - per-supplier limits, round-robin order, all-or-nothing admission
+
+import time
+import threading
+
+import pytest
+
+from scheduler import ScraperScheduler, ScrapeJob, SchedulerBusy
+
+
+def jobs(supplier, count, task_id="t"):
+    return [ScrapeJob(task_id, supplier, f"P{idx}") for idx in range(count)]
+
+
+def test_runs_every_job():
+    done = []
+    scheduler = ScraperScheduler(done.append, workers=4, default_limit=4)
+    scheduler.submit(jobs("A", 5) + jobs("B", 5))
+    scheduler.shutdown(wait=True)
+
+    assert sorted(done) == sorted(jobs("A", 5) + jobs("B", 5))
+    assert scheduler.stats()["completed"] == 10
+
+
+def test_respects_supplier_limits():
+    lock = threading.Lock()
+    running = {"A": 0, "B": 0}
+    peak = {"A": 0, "B": 0}
+
+    def handler(job):
+        with lock:
+            running[job.supplier] += 1
+            peak[job.supplier] = max(peak[job.supplier], running[job.supplier])
+        time.sleep(0.02)
+        with lock:
+            running[job.supplier] -= 1
+
+    scheduler = ScraperScheduler(handler, workers=8, supplier_limits={"A": 1, "B": 3})
+    scheduler.submit(jobs("A", 6) + jobs("B", 12))
+    scheduler.shutdown(wait=True)
+
+    assert peak == {"A": 1, "B": 3}
+
+
+def test_serves_suppliers_round_robin():
+    order = []
+    scheduler = ScraperScheduler(lambda job: order.append(job.supplier), workers=1)
+    scheduler.submit(jobs("A", 3) + jobs("B", 1))
+    scheduler.shutdown(wait=True)
+
+    assert order == ["A", "B", "A", "A"]
+
+
+def test_rejects_a_group_that_does_not_fit():
+    release = threading.Event()
+    started = threading.Event()
+
+    def handler(job):
+        started.set()
+        release.wait(5)
+
+    scheduler = ScraperScheduler(handler, workers=1, default_limit=1, max_queue=3)
+    scheduler.submit(jobs("A", 1))
+    assert started.wait(5)
+
+    # One job is running, so the queue holds up to three more - a group of four is refused whole
+    with pytest.raises(SchedulerBusy):
+        scheduler.submit(jobs("A", 4, task_id="big"))
+    assert scheduler.stats()["queued"] == 0
+    assert scheduler.stats()["rejected"] == 4
+
+    scheduler.submit(jobs("A", 3))
+    release.set()
+    scheduler.shutdown(wait=True)
+    assert scheduler.stats()["completed"] == 4
+
+
+def test_handler_errors_do_not_stop_the_worker():
+    done = []
+
+    def handler(job):
+        if job.part_number == "P0":
+            raise RuntimeError("scraper blew up")
+        done.append(job)
+
+    scheduler = ScraperScheduler(handler, workers=1)
+    scheduler.submit(jobs("A", 3))
+    scheduler.shutdown(wait=True)
+
+    assert len(done) == 2
+    assert scheduler.stats()["in_flight"] == {"A": 0}
@@ -0,0 +1,138 @@
+# tests/test_session_broker.py
+# SessionBroker - leases hand sessions back, expired ones are replaced, released leases can't relogin
+
+import time
+import threading
+
+import pytest
+
+from Scrapers.session_broker import SessionBroker, LoginFailed
+
+
+class FakeSession:
+    def __init__(self):
+        self.logins = 0
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_broker(size=1, login_ok=True, **kwargs):
+    def login(session):
+        if not login_ok:
+            return False
+        session.logins += 1
+        return True
+    return SessionBroker("Test", login, FakeSession, size=size, **kwargs)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_lease_returns_the_session_to_the_pool():
+    broker = make_broker(size=1)
+
+    with broker.lease() as lease:
+        first = lease.session
+        assert first.logins == 1
+    assert broker.stats()["idle"] == 1
+
+    with broker.lease() as lease:
+        assert lease.session is first
+    assert first.logins == 1
+    assert broker.stats()["leases"] == 2
+
+
+def test_an_expired_session_is_replaced():
+    broker = make_broker(size=1)
+
+    with broker.lease() as lease:
+        expired = lease.session
+        lease.expired()
+    assert broker.stats()["expired"] == 1
+
+    # The refresh thread logs a replacement in
+    assert wait_for(lambda: broker.stats()["idle"] == 1)
+    with broker.lease() as lease:
+        assert lease.session is not expired
+
+
+def test_relogin_during_the_lease_keeps_the_session():
+    broker = make_broker(size=1)
+
+    with broker.lease() as lease:
+        assert lease.relogin()
+        session = lease.session
+    assert session.logins == 2
+    assert broker.stats()["relogins"] == 1
+
+    with broker.lease() as lease:
+        assert lease.session is session
+
+
+def test_relogin_is_refused_once_the_lease_is_released():
+    broker = make_broker(size=1)
+
+    with broker.lease() as lease:
+        session = lease.session
+    assert lease.released
+
+    assert lease.relogin() is False
+    assert session.logins == 1
+    assert broker.stats()["relogins"] == 0
+
+
+def test_busy_pool_without_overflow_raises():
+    broker = make_broker(size=1)
+
+    with broker.lease():
+        with pytest.raises(LoginFailed):
+            with broker.lease(timeout=0.05, overflow=False):
+                pass
+
+
+def test_busy_pool_logs_in_an_overflow_session_and_closes_it():
+    broker = make_broker(size=1)
+
+    with broker.lease() as pooled:
+        with broker.lease(timeout=0.05) as extra:
+            overflow = extra.session
+            assert overflow is not pooled.session
+    assert overflow.closed
+    assert broker.stats()["overflow"] == 1
+    assert broker.stats()["sessions"] == 1
+
+
+def test_a_waiting_lease_gets_the_released_session():
+    broker = make_broker(size=1)
+    got = []
+
+    def wait_for_lease():
+        with broker.lease(timeout=5) as lease:
+            got.append(lease.session)
+
+    with broker.lease() as lease:
+        session = lease.session
+        waiter = threading.Thread(target=wait_for_lease)
+        waiter.start()
+        time.sleep(0.05)
+    waiter.join(5)
+
+    assert got == [session]
+    assert broker.stats()["waits"] == 1
+
+
+def test_failed_login_raises():
+    broker = make_broker(size=1, login_ok=False)
+
+    with pytest.raises(LoginFailed):
+        with broker.lease(timeout=0):
+            pass
+    assert broker.stats()["login_failures"] >= 1
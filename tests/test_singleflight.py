@@ -0,0 +1,64 @@
+# tests/test_singleflight.py
+# SingleFlight - one leader per supplier and normalized part number, followers get its result
+
+import threading
+
+from singleflight import SingleFlight
+
+
+def test_first_search_leads_and_later_ones_follow():
+    flights = SingleFlight()
+
+    assert flights.join("PWG", "DW2000", "t1") is True
+    assert flights.join("PWG", "DW2000", "t2") is False
+    assert flights.join("PWG", "DW2000", "t3") is False
+
+    assert flights.complete("PWG", "DW2000") == [("t2", "DW2000"), ("t3", "DW2000")]
+    assert flights.stats() == {"in_flight": 0, "waiting": 0, "leaders": 1, "coalesced": 2}
+
+
+def test_part_numbers_are_normalized():
+    flights = SingleFlight()
+
+    assert flights.join("PWG", "dw-2000 ", "t1") is True
+    assert flights.join("PWG", "DW2000", "t2") is False
+
+    # Followers keep the part number they searched for
+    assert flights.complete("PWG", "DW 2000") == [("t2", "DW2000")]
+
+
+def test_suppliers_do_not_share_flights():
+    flights = SingleFlight()
+
+    assert flights.join("PWG", "DW2000", "t1") is True
+    assert flights.join("Pilkington", "DW2000", "t1") is True
+
+
+def test_a_completed_flight_is_not_joined_again():
+    flights = SingleFlight()
+
+    flights.join("PWG", "DW2000", "t1")
+    flights.complete("PWG", "DW2000")
+
+    assert flights.join("PWG", "DW2000", "t2") is True
+    assert flights.complete("PWG", "unknown") == []
+
+
+def test_one_leader_under_contention():
+    flights = SingleFlight()
+    barrier = threading.Barrier(16)
+    leaders = []
+
+    def search(idx):
+        barrier.wait()
+        if flights.join("PWG", "DW2000", f"t{idx}"):
+            leaders.append(idx)
+
+    threads = [threading.Thread(target=search, args=(idx,)) for idx in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(leaders) == 1
+    assert len(flights.complete("PWG", "DW2000")) == 15
@@ -0,0 +1,55 @@
+# tests/test_task_db.py
+# Tasks stored in and loaded back from the database, as another worker (or a reload after eviction) sees them
+
+import time
+import uuid
+
+
+def new_task(main, scrapers):
+    """Task data as run_all_scrapers creates it, saved to the database"""
+    task_id = str(uuid.uuid4())
+    task_data = {
+        "part_number": "DW2000",
+        "start_time": time.time(),
+        "results": {},
+        "completed_count": 0,
+        "all_completed": False,
+        "scrapers": list(scrapers),
+        "version": 0,
+    }
+    for scraper_name in scrapers:
+        task_data["results"][scraper_name] = {
+            "supplier": scraper_name,
+            "part_number": "DW2000",
+            "success": False,
+            "message": "Search in progress...",
+            "results": [],
+            "time_taken": 0,
+            "completed": False,
+        }
+    main.save_task_to_db(task_id, task_data)
+    return task_id, task_data
+
+
+def test_suppliers_load_in_the_order_the_task_lists_them(main):
+    # Not alphabetical - an index on (task_id, scraper_name) would return PWG before Pilkington
+    scrapers = list(main.SCRAPERS)
+    task_id, _ = new_task(main, scrapers)
+
+    assert list(main.load_task_from_db(task_id)["results"]) == scrapers
+    assert list(main.load_task_from_db(task_id, include_results=False)["results"]) == scrapers
+
+
+def test_order_survives_result_updates(main):
+    scrapers = ["PWG", "Pilkington", "Import Glass Corp", "Mygrant Glass"]
+    task_id, task_data = new_task(main, scrapers)
+
+    # Complete them in a different order than they were listed
+    for count, scraper_name in enumerate(reversed(scrapers), start=1):
+        result = dict(task_data["results"][scraper_name], success=True, message="Search completed successfully", completed=True)
+        main.record_task_result_in_db(task_id, scraper_name, result, count, count == len(scrapers), count)
+    assert main.db_writer.flush(timeout=5)
+
+    loaded = main.load_task_from_db(task_id)
+    assert list(loaded["results"]) == scrapers
+    assert loaded["all_completed"] is True